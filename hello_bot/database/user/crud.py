@@ -1,6 +1,7 @@
 from datetime import timedelta, datetime
 
-from sqlalchemy import select, insert, update, func, and_
+from sqlalchemy import select, insert, update, func, and_, any_, bindparam, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.dialects.postgresql import insert as p_insert
 
 from utils.database_mixin import DatabaseMixin
@@ -10,9 +11,22 @@ from hello_bot.database.user.model import User
 class UserCrud(DatabaseMixin):
     """CRUD операции для пользователей."""
 
-    async def get_dump_users(self):
-        """Получает дамп всех пользователей."""
-        return await self.fetch(select(User))
+    async def get_user_ids_page(self, after_id: int = 0, limit: int = 5000) -> list[int]:
+        """
+        Получает страницу ID пользователей (keyset-пагинация по ID).
+
+        Используется для потокового экспорта без загрузки всей таблицы.
+
+        Аргументы:
+            after_id (int): ID последнего пользователя предыдущей страницы.
+            limit (int): Размер страницы.
+
+        Возвращает:
+            list[int]: ID пользователей по возрастанию.
+        """
+        return await self.fetch(
+            select(User.id).where(User.id > after_id).order_by(User.id).limit(limit)
+        )
 
     async def get_users(self, chat_id: int):
         """
@@ -236,6 +250,23 @@ class UserCrud(DatabaseMixin):
 
         return await operation(stmt, **{"commit": return_obj} if return_obj else {})
 
+    async def mark_users_approved(self, user_ids: list[int], time_approved: int) -> None:
+        """
+        Помечает пользователей одобренными одним запросом.
+
+        Аргументы:
+            user_ids (list[int]): ID пользователей, чьи заявки приняты.
+            time_approved (int): Время одобрения (timestamp).
+        """
+        if not user_ids:
+            return
+
+        await self.execute(
+            update(User)
+            .where(User.id == any_(bindparam("ids", user_ids, type_=ARRAY(BigInteger))))
+            .values(is_approved=True, time_approved=time_approved)
+        )
+
     async def many_insert_user(self, users: list[dict], batch_size: int = 1000):
         """Массовая вставка пользователей (игнорирует дубликаты) с разбивкой на пакеты."""
         if not users:
@@ -32,11 +32,15 @@ from main_bot.database.db import db
 from main_bot.database.db_types import PaymentMethod, Service
 from main_bot.database.user_bot.model import UserBot
 from main_bot.handlers import dp, set_main_routers, set_scheduler
+from main_bot.handlers.admin.mailing import resume_broadcast
 from main_bot.utils.lang.language import text
 from main_bot.utils.bot_manager import BotManager
+from main_bot.utils.bulk_actions import resume_bulk_actions
+from main_bot.utils.http_client import close_http_session
+from main_bot.utils.payments.crypto_bot import crypto_bot
+from main_bot.utils.payments.platega import platega_api
 from main_bot.utils.logger import setup_logging
 from main_bot.utils.schedulers import update_exchange_rates_in_db
-from main_bot.utils.subscribe_service import grant_subscription
 
 # Настройка логирования при старте модуля
 
@@ -140,12 +144,31 @@ async def lifespan(_app: FastAPI):
         ],
     )
 
+    # Возобновляем рассылку администратора, прерванную перезапуском
+    try:
+        await resume_broadcast(bot)
+    except Exception as e:
+        logger.error(f"Ошибка при возобновлении рассылки: {e}")
+
+    # Возобновляем массовые одобрения/очистки ботов-помощников
+    try:
+        await resume_bulk_actions(bot)
+    except Exception as e:
+        logger.error(f"Ошибка при возобновлении массовых действий: {e}")
+
     # 3. Обновляем вебхуки для всех пользовательских ботов (фоновая задача)
     # Это форсирует обновление allowed_updates для всех существующих ботов
     asyncio.create_task(refresh_all_bot_webhooks())
 
     yield
 
+    # Закрытие общей HTTP-сессии (курсы валют и др. внешние API)
+    await close_http_session()
+
+    # Закрытие пулов соединений платежных провайдеров
+    await platega_api.close()
+    await crypto_bot.close()
+
     # Удаление вебхука и закрытие сессии основного бота
     logger.info("Закрытие сессии основного бота...")
     await bot.delete_webhook(drop_pending_updates=True)
@@ -255,10 +278,14 @@ async def platega_webhook(request: Request):
 
     if status.upper() in ["CONFIRMED", "SUCCESS"]:
         logger.info(f"Platega: Платеж {order_id} подтвержден. Начинаем начисление.")
-        await db.payment_link.update_payment_link_status(order_id, "PAID")
 
+        # Статус ссылки меняется в одной транзакции с начислением
         await process_successful_payment(
-            user_id=int(payment_link.user_id), payload=payment_link.payload
+            user_id=int(payment_link.user_id),
+            payload=payment_link.payload,
+            provider="platega",
+            event_id=str(order_id),
+            payment_link_id=order_id,
         )
     else:
         logger.warning(f"Platega: Получен статус {status} для заказа {order_id}, игнорируем.")
@@ -266,17 +293,37 @@ async def platega_webhook(request: Request):
     return {"status": "ok"}
 
 
-async def process_successful_payment(user_id: int, payload: dict, amount: float = None):
+async def process_successful_payment(
+    user_id: int,
+    payload: dict,
+    provider: str,
+    event_id: str,
+    amount: float = None,
+    payment_link_id: str = None,
+):
     """
     Общая логика обработки успешных платежей (Platega и CryptoBot).
 
+    Идемпотентна: событие (provider, event_id) регистрируется в
+    processed_payment_events в той же транзакции, что и начисление,
+    поэтому повторные и параллельные вебхуки ничего не начисляют повторно.
+
     Аргументы:
         user_id (int): Telegram ID пользователя.
         payload (dict): Данные платежа (тип, метод и т.д.).
+        provider (str): Платежная система (platega, crypto_bot).
+        event_id (str): ID платежа у провайдера.
         amount (float, optional): Сумма платежа. Если не передана, пытаемся взять из payload.
+        payment_link_id (str, optional): ID платежной ссылки (переводится в PAID).
     """
     payment_type = payload.get("type")
 
+    method_str = payload.get("method", "PLATEGA")
+    if method_str == "CRYPTO_BOT":
+        method = PaymentMethod.CRYPTO_BOT
+    else:
+        method = PaymentMethod.PLATEGA
+
     # Логика пополнения баланса
     if payment_type == "balance":
         if amount is None:
@@ -289,25 +336,28 @@ async def process_successful_payment(user_id: int, payload: dict, amount: float
         amount = float(amount)
         logger.info(f"Пополнение баланса {amount} для пользователя {user_id}")
 
-        user = await db.user.get_user(user_id=user_id)
-        if user:
-            await db.user.update_user(user_id=user.id, balance=user.balance + amount)
-
-            method_str = payload.get("method", "UNKNOWN")
-
-            if method_str == "CRYPTO_BOT":
-                method = PaymentMethod.CRYPTO_BOT
-            elif method_str == "PLATEGA":
-                method = PaymentMethod.PLATEGA
-            else:
-                method = PaymentMethod.PLATEGA
-
-            await db.payment.add_payment(user_id=user.id, amount=amount, method=method)
+        claimed, balance = await db.payment_event.credit_balance(
+            provider=provider,
+            event_id=event_id,
+            user_id=user_id,
+            amount=amount,
+            method=method,
+            payment_link_id=payment_link_id,
+        )
+        if not claimed:
+            logger.info(f"Платеж {provider}:{event_id} уже обработан, пропуск")
+            return
+        if balance is None:
+            logger.error(
+                f"Платеж {provider}:{event_id}: пользователь {user_id} не найден, "
+                f"баланс на {amount} не пополнен"
+            )
+            return
 
-            try:
-                await bot.send_message(user_id, text("success_payment").format(amount))
-            except Exception as e:
-                logger.error(f"Не удалось отправить сообщение об успехе {user_id}: {e}")
+        try:
+            await bot.send_message(user_id, text("success_payment").format(amount))
+        except Exception as e:
+            logger.error(f"Не удалось отправить сообщение об успехе {user_id}: {e}")
 
     # Логика подписки
     elif payment_type == "subscribe":
@@ -317,52 +367,41 @@ async def process_successful_payment(user_id: int, payload: dict, amount: float
         object_type = payload.get("object_type")
         total_price = payload.get("total_price")
 
-        logger.info(
-            f"Выдача подписки пользователю {user_id}: объектов={len(chosen) if chosen else 0}, тип={object_type}, дней={total_days}"
-        )
-
-        await grant_subscription(user_id, chosen, total_days, service_name, object_type)
-
-        # Реферальная логика
-        referral_id = payload.get("referral_id")
-
-        if referral_id:
-            ref_user = await db.user.get_user(referral_id)
-            if ref_user:
-                try:
-                    # Проверяем была ли покупка РАНЕЕ
-                    has_purchase = await db.purchase.has_purchase(user_id)
-                    percent = 15 if has_purchase else 60
-                    total_ref_earn = int(total_price / 100 * percent)
-
-                    logger.info(
-                        f"Реферальный бонус {total_ref_earn} для {referral_id} (percent={percent}%)"
-                    )
-
-                    await db.user.update_user(
-                        user_id=ref_user.id,
-                        balance=ref_user.balance + total_ref_earn,
-                        referral_earned=ref_user.referral_earned + total_ref_earn,
-                    )
-                except Exception as e:
-                    logger.error(f"Ошибка реферальной логики: {e}")
-
-        # Записываем покупку
-        method_str = payload.get("method", "PLATEGA")
-        if method_str == "CRYPTO_BOT":
-            method = PaymentMethod.CRYPTO_BOT
-        else:
-            method = PaymentMethod.PLATEGA
-
         service_enum = Service.POSTING
         if service_name == "stories":
             service_enum = Service.STORIES
         elif object_type == "bots":
             service_enum = Service.BOTS
 
-        await db.purchase.add_purchase(
-            user_id=user_id, amount=total_price, method=method, service=service_enum
+        object_ids = list({int(obj_id) for obj_id in chosen or []})
+        logger.info(
+            f"Выдача подписки пользователю {user_id}: объектов={len(object_ids)}, тип={object_type}, дней={total_days}"
+        )
+
+        # Покупка, продление подписки и реферальный бонус фиксируются
+        # одной транзакцией вместе с регистрацией события
+        granted = await db.payment_event.record_subscription_purchase(
+            provider=provider,
+            event_id=event_id,
+            user_id=user_id,
+            total_price=total_price,
+            method=method,
+            service=service_enum,
+            object_type=object_type,
+            object_ids=object_ids,
+            seconds=86400 * int(total_days),
+            referral_id=payload.get("referral_id"),
+            payment_link_id=payment_link_id,
         )
+        if granted is None:
+            logger.info(f"Платеж {provider}:{event_id} уже обработан, пропуск")
+            return
+
+        missing = sorted(set(object_ids) - set(granted))
+        if missing:
+            logger.warning(
+                f"Подписка не выдана: {object_type} не найдены: {missing} (user_id={user_id})"
+            )
 
         try:
             await bot.send_message(user_id, text("success_subscribe_pay"))
@@ -429,11 +468,18 @@ async def cryptobot_webhook(request: Request):
         logger.error("CryptoBot: Нет user_id в payload")
         return {"ok": True}
 
-    logger.info(f"CryptoBot: Инвойс оплачен. Обработка для пользователя {user_id}")
+    invoice_id = invoice.get("invoice_id")
+    if not invoice_id:
+        logger.error("CryptoBot: Нет invoice_id в инвойсе")
+        return {"ok": True}
+
+    logger.info(f"CryptoBot: Инвойс {invoice_id} оплачен. Обработка для пользователя {user_id}")
 
     await process_successful_payment(
         user_id=int(user_id),
         payload=custom_payload,
+        provider="crypto_bot",
+        event_id=str(invoice_id),
         amount=float(invoice.get("amount", 0)),
     )
 
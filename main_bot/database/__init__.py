@@ -11,19 +11,23 @@
 """
 
 import asyncio
+import json
 import logging
 import time
 import urllib.parse
 from contextlib import asynccontextmanager
 from typing import Any, AsyncGenerator, Sequence, TypeVar
 
+from sqlalchemy import BigInteger, any_, bindparam, func, select, text, tuple_, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.engine.result import Result
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import aliased, declarative_base
 from sqlalchemy.sql import Executable
 from tenacity import (
     retry,
@@ -66,6 +70,8 @@ T = TypeVar("T")
 # Константы для повторных попыток
 DB_TIMEOUT_SECONDS = Config.DB_TIMEOUT_SECONDS
 DB_MAX_RETRY_ATTEMPTS = Config.DB_MAX_RETRY_ATTEMPTS
+# Ниже этого числа строк (по статистике) считаем точный COUNT(*)
+COUNT_ESTIMATE_THRESHOLD = 10000
 
 
 @asynccontextmanager
@@ -150,12 +156,15 @@ class DatabaseMixin:
         wait=wait_exponential(multiplier=1, min=1, max=10),
         reraise=True,
     )
-    async def execute_many(list_sql: list[Executable]) -> None:
+    async def execute_many(
+        list_sql: list[Executable | tuple[Executable, list[dict]]],
+    ) -> None:
         """
         Выполняет список SQL-запросов в одной транзакции.
 
         Аргументы:
-            list_sql (list[Executable]): Список SQL-запросов.
+            list_sql (list): Список SQL-запросов. Элемент может быть парой
+                (запрос, список параметров) — запрос выполняется через executemany.
         """
         try:
             async with log_slow_query(f"Batch ({len(list_sql)})"):
@@ -166,7 +175,10 @@ class DatabaseMixin:
                             f"Выполнение {len(list_sql)} SQL запросов в транзакции"
                         )
                         for sql in list_sql:
-                            await session.execute(sql)
+                            if isinstance(sql, tuple):
+                                await session.execute(*sql)
+                            else:
+                                await session.execute(sql)
                         await session.commit()
                         logger.debug("Транзакция пакета зафиксирована")
         except asyncio.TimeoutError as e:
@@ -185,12 +197,13 @@ class DatabaseMixin:
         wait=wait_exponential(multiplier=1, min=1, max=10),
         reraise=True,
     )
-    async def fetch(sql: Executable) -> Sequence[Any]:
+    async def fetch(sql: Executable, commit: bool = False) -> Sequence[Any]:
         """
         Выполняет запрос и возвращает список скалярных значений.
 
         Аргументы:
             sql (Executable): SQL-запрос.
+            commit (bool): Выполнять ли commit (для INSERT/UPDATE ... RETURNING).
 
         Возвращает:
             Sequence[Any]: Список результатов (scalars().all()).
@@ -203,6 +216,9 @@ class DatabaseMixin:
                         logger.debug(f"Получение данных (fetch): {sql}")
                         res: Result = await session.execute(sql)
                         results = res.scalars().all()
+                        if commit:
+                            await session.commit()
+                            logger.debug("Транзакция зафиксирована")
                         logger.debug(f"Получено {len(results)} строк")
                         return results
         except asyncio.TimeoutError as e:
@@ -257,12 +273,13 @@ class DatabaseMixin:
         wait=wait_exponential(multiplier=1, min=1, max=10),
         reraise=True,
     )
-    async def fetchall(sql: Executable) -> Sequence[Any]:
+    async def fetchall(sql: Executable, commit: bool = False) -> Sequence[Any]:
         """
         Выполняет запрос и возвращает все строки (список кортежей).
 
         Аргументы:
             sql (Executable): SQL-запрос.
+            commit (bool): Выполнять ли commit (для INSERT/UPDATE ... RETURNING).
 
         Возвращает:
             Sequence[Any]: Список строк (Result.all()).
@@ -275,6 +292,9 @@ class DatabaseMixin:
                         logger.debug(f"Получение всех строк (fetchall): {sql}")
                         res: Result = await session.execute(sql)
                         results = res.all()
+                        if commit:
+                            await session.commit()
+                            logger.debug("Транзакция зафиксирована")
                         logger.debug(f"Получено {len(results)} строк")
                         return results
         except asyncio.TimeoutError as e:
@@ -357,3 +377,115 @@ class DatabaseMixin:
         except Exception as e:
             logger.error(f"Ошибка БД в add(): {e}", exc_info=True)
             raise
+
+    @staticmethod
+    def extend_subscriptions_stmt(
+        model: Any, key: Any, object_ids: list[int], seconds: int
+    ) -> Any:
+        """
+        Строит UPDATE продления подписки набора объектов (каналов или ботов).
+
+        Новое значение считается от текущей даты окончания (или от текущего
+        времени, если подписка истекла) по заблокированной строке, поэтому
+        параллельные продления одного объекта суммируются.
+
+        Аргументы:
+            model (Any): Модель с колонкой subscribe.
+            key (Any): Колонка, по которой ищутся объекты.
+            object_ids (list[int]): Значения key.
+            seconds (int): Срок продления в секундах.
+
+        Возвращает:
+            Any: UPDATE ... RETURNING key (колонка object_id).
+        """
+        now = int(time.time())
+        return (
+            update(model)
+            .where(key == any_(bindparam("object_ids", object_ids, type_=ARRAY(BigInteger))))
+            .values(subscribe=func.greatest(func.coalesce(model.subscribe, 0), now) + seconds)
+            .returning(key.label("object_id"))
+        )
+
+    @classmethod
+    async def estimate_count(cls, model: Any, stmt: Any = None) -> int:
+        """
+        Оценивает количество строк таблицы или выборки без полного сканирования.
+
+        Для всей таблицы берет оценку планировщика (pg_class.reltuples), для
+        выборки с условиями — оценку строк из EXPLAIN; при небольших
+        значениях и без статистики выполняет точный COUNT(*).
+
+        Аргументы:
+            model (Any): Модель SQLAlchemy.
+            stmt (Any): SELECT с условиями списка или None (вся таблица).
+
+        Возвращает:
+            int: Оценка количества строк.
+        """
+        if stmt is None:
+            estimate = await cls.fetchrow(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"
+                ).bindparams(name=model.__tablename__)
+            )
+            count_stmt = select(func.count()).select_from(model)
+        else:
+            compiled = stmt.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            plan = await cls.fetchrow(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+            count_stmt = select(func.count()).select_from(stmt.subquery())
+
+        if estimate is None or estimate < COUNT_ESTIMATE_THRESHOLD:
+            return await cls.fetchrow(count_stmt) or 0
+        return estimate
+
+    @staticmethod
+    def keyset_page(
+        stmt: Any,
+        model: Any,
+        sort_keys: list,
+        cursor_id: int | None,
+        backward: bool,
+        limit: int,
+        descending: bool = False,
+    ) -> Any:
+        """
+        Добавляет к запросу keyset-пагинацию по (sort_keys..., id).
+
+        Курсор — ID строки на границе страницы: значения ключей сортировки
+        берутся из нее подзапросом, поэтому в callback_data хватает одного ID.
+        Стоимость страницы не зависит от ее номера (нет OFFSET).
+
+        Аргументы:
+            stmt (Any): Исходный SELECT.
+            model (Any): Модель с первичным ключом id.
+            sort_keys (list): Колонки сортировки (без id).
+            cursor_id (int | None): ID граничной строки или None (первая страница).
+            backward (bool): Листать назад (строки перед курсором).
+            limit (int): Размер страницы.
+            descending (bool): Основной порядок сортировки по убыванию.
+
+        Возвращает:
+            Any: Запрос; при backward=True строки идут в обратном порядке.
+        """
+        keys = [*sort_keys, model.id]
+
+        if cursor_id is not None:
+            cursor_row = aliased(model)
+            cursor = (
+                select(*(getattr(cursor_row, key.key) for key in keys))
+                .where(cursor_row.id == cursor_id)
+                .scalar_subquery()
+            )
+            if descending != backward:
+                stmt = stmt.where(tuple_(*keys) < cursor)
+            else:
+                stmt = stmt.where(tuple_(*keys) > cursor)
+
+        order = [key.desc() if descending != backward else key.asc() for key in keys]
+        return stmt.order_by(*order).limit(limit)
+
@@ -51,6 +51,26 @@ class AdCreativeCrud(DatabaseMixin):
         query = select(AdCreative).where(AdCreative.id == creative_id)
         return await self.fetchrow(query)
 
+    async def get_creative_names(self, creative_ids: list[int]) -> dict[int, str]:
+        """
+        Получает названия креативов одним запросом (без загрузки сообщений).
+
+        Аргументы:
+            creative_ids (list[int]): ID креативов.
+
+        Возвращает:
+            dict[int, str]: {ID креатива: название}.
+        """
+        if not creative_ids:
+            return {}
+
+        rows = await self.fetchall(
+            select(AdCreative.id, AdCreative.name).where(
+                AdCreative.id.in_(set(creative_ids))
+            )
+        )
+        return {row.id: row.name for row in rows}
+
     async def get_user_creatives(self, owner_id: int) -> list[AdCreative]:
         """
         Получает список активных рекламных креативов пользователя.
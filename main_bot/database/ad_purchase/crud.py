@@ -5,10 +5,35 @@
 маппингом ссылок, лидами и подписками.
 """
 
+import time
+
 from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from main_bot.database import DatabaseMixin
-from main_bot.database.ad_purchase.model import AdPurchase, AdPurchaseLinkMapping
+from main_bot.database.ad_purchase.model import (
+    AdLead,
+    AdPurchase,
+    AdPurchaseLinkMapping,
+    AdSubscription,
+)
+
+# Кэш привязок по пригласительной ссылке: {invite_link: (время, привязка | None)}
+MAPPING_CACHE_TTL = 300
+_mapping_cache: dict[str, tuple[float, AdPurchaseLinkMapping | None]] = {}
+
+
+def invalidate_mapping_cache(invite_link: str | None = None) -> None:
+    """
+    Сбрасывает кэш привязок (для одной ссылки или целиком).
+
+    Аргументы:
+        invite_link (str | None): Ссылка; None — очистить весь кэш.
+    """
+    if invite_link is None:
+        _mapping_cache.clear()
+    else:
+        _mapping_cache.pop(invite_link, None)
 
 
 class AdPurchaseCrud(DatabaseMixin):
@@ -87,6 +112,11 @@ class AdPurchaseCrud(DatabaseMixin):
             )
         await self.execute(query)
 
+        if existing and existing.invite_link:
+            invalidate_mapping_cache(existing.invite_link)
+        if kwargs.get("invite_link"):
+            invalidate_mapping_cache(kwargs["invite_link"])
+
     async def get_link_mappings(
         self, ad_purchase_id: int
     ) -> list[AdPurchaseLinkMapping]:
@@ -167,6 +197,7 @@ class AdPurchaseCrud(DatabaseMixin):
 
                     # Обновляем локальный объект
                     m.invite_link = invite.invite_link
+                    invalidate_mapping_cache(invite.invite_link)
                     logger.info(
                         f"Создана ссылка для закупки {ad_purchase_id}, "
                         f"слот {m.slot_id}, канал {m.target_channel_id}: {invite.invite_link}"
@@ -188,7 +219,8 @@ class AdPurchaseCrud(DatabaseMixin):
         """
         Регистрирует новый лид (переход по ссылке).
 
-        Если лид уже существует, возвращает False.
+        Если лид уже существует, возвращает False. Дубликаты отсекает
+        уникальный индекс (user_id, ad_purchase_id) через ON CONFLICT.
 
         Аргументы:
             user_id (int): ID пользователя.
@@ -199,26 +231,18 @@ class AdPurchaseCrud(DatabaseMixin):
         Возвращает:
             bool: True, если лид успешно создан.
         """
-        from main_bot.database.ad_purchase.model import AdLead
-
-        # Проверка дубликатов
-        query = select(AdLead).where(
-            AdLead.user_id == user_id, AdLead.ad_purchase_id == ad_purchase_id
-        )
-        existing = await self.fetchrow(query)
-
-        if existing:
-            return False
-
-        # Создание нового лида
-        query = insert(AdLead).values(
-            user_id=user_id,
-            ad_purchase_id=ad_purchase_id,
-            slot_id=slot_id,
-            ref_param=ref_param,
+        query = (
+            pg_insert(AdLead)
+            .values(
+                user_id=user_id,
+                ad_purchase_id=ad_purchase_id,
+                slot_id=slot_id,
+                ref_param=ref_param,
+            )
+            .on_conflict_do_nothing(constraint="uq_ad_lead_user_purchase")
+            .returning(AdLead.id)
         )
-        await self.execute(query)
-        return True
+        return await self.fetchrow(query, commit=True) is not None
 
     async def get_leads_count(self, ad_purchase_id: int) -> int:
         """
@@ -262,39 +286,42 @@ class AdPurchaseCrud(DatabaseMixin):
             bool: True, если подписка добавлена или активирована.
         """
 
-        from main_bot.database.ad_purchase.model import AdSubscription
-
-        # Проверка существования
-        query = select(AdSubscription).where(
-            AdSubscription.user_id == user_id,
-            AdSubscription.channel_id == channel_id,
-            AdSubscription.ad_purchase_id == ad_purchase_id,
+        query = self._subscription_upsert(
+            user_id, channel_id, ad_purchase_id, slot_id, invite_link
         )
-        existing = await self.fetchrow(query)
-
-        if existing:
-            if existing.status != "active":
-                # Реактивация
-                query = (
-                    update(AdSubscription)
-                    .where(AdSubscription.id == existing.id)
-                    .values(status="active", left_timestamp=None)
-                )
-                await self.execute(query)
-                return True
-            return False
+        return await self.fetchrow(query, commit=True) is not None
 
-        # Создание новой
-        query = insert(AdSubscription).values(
-            user_id=user_id,
-            channel_id=channel_id,
-            ad_purchase_id=ad_purchase_id,
-            slot_id=slot_id,
-            invite_link=invite_link,
-            status="active",
+    @staticmethod
+    def _subscription_upsert(
+        user_id: int,
+        channel_id: int,
+        ad_purchase_id: int,
+        slot_id: int,
+        invite_link: str,
+    ):
+        """
+        INSERT подписки с реактивацией существующей (ON CONFLICT DO UPDATE).
+
+        RETURNING возвращает строку только при вставке или реактивации.
+        """
+        return (
+            pg_insert(AdSubscription)
+            .values(
+                user_id=user_id,
+                channel_id=channel_id,
+                ad_purchase_id=ad_purchase_id,
+                slot_id=slot_id,
+                invite_link=invite_link,
+                status="active",
+                created_timestamp=int(time.time()),
+            )
+            .on_conflict_do_update(
+                constraint="uq_ad_subscription_user_channel_purchase",
+                set_={"status": "active", "left_timestamp": None},
+                where=AdSubscription.status != "active",
+            )
+            .returning(AdSubscription.id)
         )
-        await self.execute(query)
-        return True
 
     async def update_subscription_status(
         self, user_id: int, channel_id: int, status: str
@@ -398,32 +425,56 @@ class AdPurchaseCrud(DatabaseMixin):
         Обрабатывает событие вступления и создает подписку, если ссылка соответствует закупке.
         Возвращает True, если подписка создана.
         """
-        # Поиск маппинга по ссылке приглашения
-        query = select(AdPurchaseLinkMapping).where(
-            AdPurchaseLinkMapping.invite_link == invite_link
-        )
-        mapping = await self.fetchrow(query)
-
+        mapping = await self.get_mapping_by_invite_link(invite_link)
         if not mapping:
             return False
 
-        # Убеждаемся, что лид существует (на случай, если ChatJoinRequest не сработал или был пропущен)
-        # Мы регистрируем лид, так как вступление подразумевает намерение (и успех).
-        await self.add_lead(
-            user_id=user_id,
-            ad_purchase_id=mapping.ad_purchase_id,
-            slot_id=mapping.slot_id,
-            ref_param=f"auto_{mapping.ad_purchase_id}_{mapping.slot_id}",  # Синтетический параметр для прямых вступлений
+        # Лид и подписка - одним запросом (CTE): лид регистрируется на случай,
+        # если ChatJoinRequest не сработал или был пропущен
+        lead = (
+            pg_insert(AdLead)
+            .values(
+                user_id=user_id,
+                ad_purchase_id=mapping.ad_purchase_id,
+                slot_id=mapping.slot_id,
+                ref_param=f"auto_{mapping.ad_purchase_id}_{mapping.slot_id}",  # Синтетический параметр для прямых вступлений
+                created_timestamp=int(time.time()),
+            )
+            .on_conflict_do_nothing(constraint="uq_ad_lead_user_purchase")
+            .cte("new_lead")
         )
-
-        # Добавление подписки
-        return await self.add_subscription(
+        query = self._subscription_upsert(
             user_id=user_id,
             channel_id=channel_id,
             ad_purchase_id=mapping.ad_purchase_id,
             slot_id=mapping.slot_id,
             invite_link=invite_link,
+        ).add_cte(lead)
+
+        return await self.fetchrow(query, commit=True) is not None
+
+    async def get_mapping_by_invite_link(
+        self, invite_link: str
+    ) -> AdPurchaseLinkMapping | None:
+        """
+        Получает привязку по пригласительной ссылке с кэшированием в памяти.
+
+        Кэшируются и промахи: большинство вступлений идут не по рекламным ссылкам.
+
+        Аргументы:
+            invite_link (str): Пригласительная ссылка.
+        """
+        cached = _mapping_cache.get(invite_link)
+        if cached and time.monotonic() - cached[0] < MAPPING_CACHE_TTL:
+            return cached[1]
+
+        mapping = await self.fetchrow(
+            select(AdPurchaseLinkMapping).where(
+                AdPurchaseLinkMapping.invite_link == invite_link
+            )
         )
+        _mapping_cache[invite_link] = (time.monotonic(), mapping)
+        return mapping
 
     async def get_global_stats(self, from_ts: int = None, to_ts: int = None) -> dict:
         """
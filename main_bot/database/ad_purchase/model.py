@@ -10,7 +10,7 @@
 
 import time
 
-from sqlalchemy import BigInteger
+from sqlalchemy import BigInteger, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from main_bot.database import Base
@@ -94,6 +94,9 @@ class AdLead(Base):
     """
 
     __tablename__ = "ad_leads"
+    __table_args__ = (
+        UniqueConstraint("user_id", "ad_purchase_id", name="uq_ad_lead_user_purchase"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, index=True)
     ad_purchase_id: Mapped[int] = mapped_column(index=True)
@@ -121,6 +124,14 @@ class AdSubscription(Base):
     """
 
     __tablename__ = "ad_subscriptions"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "channel_id",
+            "ad_purchase_id",
+            name="uq_ad_subscription_user_channel_purchase",
+        ),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, index=True)
     channel_id: Mapped[int] = mapped_column(BigInteger, index=True)
@@ -127,6 +127,26 @@ class BotPostCrud(DatabaseMixin):
             )
         )
 
+    async def mark_bot_posts_cleared(self, post_ids: List[int]) -> None:
+        """
+        Помечает посты удаленными и очищает списки ID сообщений одним запросом.
+
+        Аргументы:
+            post_ids (List[int]): ID постов, сообщения которых удалены.
+        """
+        if not post_ids:
+            return
+
+        await self.execute(
+            update(BotPost)
+            .where(BotPost.id.in_(post_ids))
+            .values(
+                deleted_at=int(time.time()),
+                status=Status.DELETED,
+                message_ids=None,
+            )
+        )
+
     async def clear_empty_bot_posts(self):
         """
         Удаляет пустые посты (без получателей) старше недели.
@@ -3,9 +3,10 @@
 """
 
 import logging
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Tuple
 
-from sqlalchemy import desc, select, update, or_, func
+from sqlalchemy import desc, exists, select, update, or_, func
+from sqlalchemy.orm import aliased
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from config import Config
@@ -122,6 +123,35 @@ class ChannelCrud(DatabaseMixin):
         )
         return await self.fetchrow(stmt)
 
+    async def get_channels_by_chat_ids(self, chat_ids: List[int]) -> Dict[int, Channel]:
+        """
+        Получает каналы по списку chat_id одним запросом.
+
+        Для каждого chat_id выбирается та же запись, что и в
+        get_channel_by_chat_id.
+
+        Аргументы:
+            chat_ids (List[int]): ID каналов в Telegram.
+
+        Возвращает:
+            Dict[int, Channel]: Словарь chat_id -> канал (отсутствующие не включаются).
+        """
+        if not chat_ids:
+            return {}
+
+        stmt = (
+            select(Channel)
+            .where(Channel.chat_id.in_(set(chat_ids)))
+            .distinct(Channel.chat_id)
+            .order_by(
+                Channel.chat_id,
+                desc(Channel.last_client_id.is_not(None)),
+                desc(Channel.subscribe),
+                desc(Channel.id),
+            )
+        )
+        return {channel.chat_id: channel for channel in await self.fetch(stmt)}
+
     async def get_channel_by_title(self, title: str) -> Optional[Channel]:
         """Получить канал пользователя по названию (title)."""
         stmt = (
@@ -144,6 +174,27 @@ class ChannelCrud(DatabaseMixin):
             update(Channel).where(Channel.chat_id == chat_id).values(**kwargs)
         )
 
+    async def extend_subscriptions(self, chat_ids: List[int], seconds: int) -> List[int]:
+        """
+        Продлевает подписку каналов одним запросом.
+
+        Отсчет идет от текущей даты окончания (или от текущего времени, если
+        подписка истекла). Значение читается под блокировкой строки, поэтому
+        параллельные продления одного канала суммируются.
+
+        Аргументы:
+            chat_ids (List[int]): ID каналов в Telegram.
+            seconds (int): Срок продления в секундах.
+
+        Возвращает:
+            List[int]: chat_id каналов, которые были найдены и продлены.
+        """
+        if not chat_ids:
+            return []
+
+        stmt = self.extend_subscriptions_stmt(Channel, Channel.chat_id, chat_ids, seconds)
+        return list(set(await self.fetch(stmt, commit=True)))
+
     async def update_channel_by_id(self, channel_id: int, **kwargs) -> None:
         """
         Обновляет данные канала по ID (Primary Key).
@@ -338,6 +389,68 @@ class ChannelCrud(DatabaseMixin):
         )
         return await self.fetch(stmt)
 
+    @staticmethod
+    def _admin_list_filters() -> list:
+        """
+        Условия списка каналов админ-панели: без мягко удаленных и по одной
+        (последней) записи на chat_id — как в get_all_channels, но без DISTINCT ON
+        по всей таблице, чтобы работал keyset по индексу (title, id).
+        """
+        newer = aliased(Channel)
+        return [
+            or_(
+                Channel.subscribe != Config.SOFT_DELETE_TIMESTAMP,
+                Channel.subscribe.is_(None),
+            ),
+            ~exists().where(
+                newer.chat_id == Channel.chat_id,
+                newer.id > Channel.id,
+                or_(
+                    newer.subscribe != Config.SOFT_DELETE_TIMESTAMP,
+                    newer.subscribe.is_(None),
+                ),
+            ),
+        ]
+
+    async def get_channels_page(
+        self, cursor_id: Optional[int], backward: bool, limit: int
+    ) -> Tuple[List[Channel], int]:
+        """
+        Страница списка каналов (keyset по названию) для админ-панели.
+
+        Аргументы:
+            cursor_id (int | None): ID граничного канала или None (первая страница).
+            backward (bool): Листать назад.
+            limit (int): Размер страницы.
+
+        Возвращает:
+            Tuple[List[Channel], int]: Каналы страницы (при backward — в обратном
+            порядке) и оценка общего количества.
+        """
+        channels = select(Channel).where(*self._admin_list_filters())
+        stmt = self.keyset_page(channels, Channel, [Channel.title], cursor_id, backward, limit)
+        # Оценка по тем же условиям: без мягко удаленных и дублей chat_id
+        return list(await self.fetch(stmt)), await self.estimate_count(Channel, channels)
+
+    async def search_channels(self, query: str, limit: int = 50) -> List[Channel]:
+        """
+        Поиск каналов по подстроке в названии (использует GIN-индекс pg_trgm).
+
+        Аргументы:
+            query (str): Поисковая строка.
+            limit (int): Максимум результатов.
+        """
+        pattern = "%{}%".format(
+            query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        )
+        stmt = (
+            select(Channel)
+            .where(Channel.title.ilike(pattern), *self._admin_list_filters())
+            .order_by(Channel.title.asc(), Channel.id.asc())
+            .limit(limit)
+        )
+        return await self.fetch(stmt)
+
     async def get_channels(self) -> List[Channel]:
         """Alias for get_all_channels"""
         return await self.get_all_channels()
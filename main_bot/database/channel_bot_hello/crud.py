@@ -4,7 +4,7 @@
 
 import logging
 
-from sqlalchemy import asc, delete, func, insert, select, update
+from sqlalchemy import asc, delete, insert, select, update
 
 from main_bot.database import DatabaseMixin
 from main_bot.database.channel_bot_hello.model import ChannelHelloMessage
@@ -17,28 +17,24 @@ class ChannelHelloMessageCrud(DatabaseMixin):
     Класс для управления приветственными сообщениями канала.
     """
 
-    async def get_next_id_hello_message(self) -> int:
-        """
-        Получает следующий доступный ID для сообщения (autoincrement emulation).
-
-        Возвращает:
-            int: Следующий ID (max + 1).
-        """
-        max_id = await self.fetchrow(select(func.max(ChannelHelloMessage.id)))
-
-        if not max_id:
-            max_id = 0
-
-        return max_id + 1
-
-    async def add_channel_hello_message(self, **kwargs) -> None:
+    async def add_channel_hello_message(self, **kwargs) -> int:
         """
         Добавляет новое приветственное сообщение.
 
+        ID выдается последовательностью таблицы.
+
         Аргументы:
             **kwargs: Поля модели ChannelHelloMessage.
+
+        Возвращает:
+            int: ID созданного сообщения.
         """
-        await self.execute(insert(ChannelHelloMessage).values(**kwargs))
+        return await self.fetchrow(
+            insert(ChannelHelloMessage)
+            .values(**kwargs)
+            .returning(ChannelHelloMessage.id),
+            commit=True,
+        )
 
     async def get_hello_messages(self, chat_id: int, active: bool = False) -> list:
         """
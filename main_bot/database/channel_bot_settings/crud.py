@@ -4,9 +4,11 @@
 
 import logging
 
-from sqlalchemy import insert, select, update
+from sqlalchemy import delete, insert, select, update
 
 from main_bot.database import DatabaseMixin
+from main_bot.database.channel_bot_captcha.model import ChannelCaptcha
+from main_bot.database.channel_bot_hello.model import ChannelHelloMessage
 from main_bot.database.channel_bot_settings.model import ChannelBotSetting
 from main_bot.database.channel.model import Channel
 
@@ -84,3 +86,121 @@ class ChannelBotSettingCrud(DatabaseMixin):
             )
 
         return await self.fetch(stmt)
+
+    async def clone_channel_settings(
+        self,
+        source: ChannelBotSetting,
+        target_ids: list[int],
+        application: bool = False,
+        captcha: bool = False,
+        hello: bool = False,
+        bye: bool = False,
+    ) -> None:
+        """
+        Клонирует настройки канала в целевые каналы одной транзакцией.
+
+        Капча и приветствия копируются запросами INSERT ... SELECT сразу во все
+        каналы, ID новых записей выдают последовательности таблиц. При ошибке
+        ни один целевой канал не изменяется.
+
+        Аргументы:
+            source (ChannelBotSetting): Настройки исходного канала.
+            target_ids (list[int]): ID целевых каналов.
+            application (bool): Копировать автоприем и задержку.
+            captcha (bool): Копировать капчу (с активной капчей).
+            hello (bool): Копировать приветственные сообщения.
+            bye (bool): Копировать прощание.
+        """
+        if not target_ids:
+            return
+
+        targets = select(ChannelBotSetting.id.label("chat_id")).where(
+            ChannelBotSetting.id.in_(target_ids)
+        ).subquery()
+        statements = []
+
+        values = {}
+        if application:
+            values["auto_approve"] = source.auto_approve
+            values["delay_approve"] = source.delay_approve
+        if bye:
+            values["bye"] = source.bye
+        if values:
+            statements.append(
+                update(ChannelBotSetting)
+                .where(ChannelBotSetting.id.in_(target_ids))
+                .values(**values)
+            )
+
+        if captcha:
+            captcha_columns = ["channel_id", "message", "delay", "start_delay"]
+            source_captcha = [
+                targets.c.chat_id,
+                ChannelCaptcha.message,
+                ChannelCaptcha.delay,
+                ChannelCaptcha.start_delay,
+            ]
+
+            statements.append(
+                delete(ChannelCaptcha).where(ChannelCaptcha.channel_id.in_(target_ids))
+            )
+            statements.append(
+                update(ChannelBotSetting)
+                .where(ChannelBotSetting.id.in_(target_ids))
+                .values(active_captcha_id=None)
+            )
+            # Неактивные капчи - одним INSERT ... SELECT во все каналы
+            statements.append(
+                insert(ChannelCaptcha).from_select(
+                    captcha_columns,
+                    select(*source_captcha)
+                    .select_from(targets)
+                    .join(ChannelCaptcha, ChannelCaptcha.channel_id == source.id)
+                    .where(ChannelCaptcha.id.is_distinct_from(source.active_captcha_id))
+                    .order_by(targets.c.chat_id, ChannelCaptcha.id),
+                )
+            )
+            # Активная капча: RETURNING новых ID сразу проставляется в настройки
+            if source.active_captcha_id:
+                new_active = (
+                    insert(ChannelCaptcha)
+                    .from_select(
+                        captcha_columns,
+                        select(*source_captcha)
+                        .select_from(targets)
+                        .join(ChannelCaptcha, ChannelCaptcha.channel_id == source.id)
+                        .where(ChannelCaptcha.id == source.active_captcha_id),
+                    )
+                    .returning(ChannelCaptcha.id, ChannelCaptcha.channel_id)
+                    .cte("new_active_captcha")
+                )
+                statements.append(
+                    update(ChannelBotSetting)
+                    .where(ChannelBotSetting.id == new_active.c.channel_id)
+                    .values(active_captcha_id=new_active.c.id)
+                )
+
+        if hello:
+            statements.append(
+                delete(ChannelHelloMessage).where(
+                    ChannelHelloMessage.channel_id.in_(target_ids)
+                )
+            )
+            statements.append(
+                insert(ChannelHelloMessage).from_select(
+                    ["channel_id", "message", "delay", "text_with_name", "is_active"],
+                    select(
+                        targets.c.chat_id,
+                        ChannelHelloMessage.message,
+                        ChannelHelloMessage.delay,
+                        ChannelHelloMessage.text_with_name,
+                        ChannelHelloMessage.is_active,
+                    )
+                    .select_from(targets)
+                    .join(ChannelHelloMessage, ChannelHelloMessage.channel_id == source.id)
+                    .order_by(targets.c.chat_id, ChannelHelloMessage.id),
+                )
+            )
+
+        if statements:
+            await self.execute_many(statements)
@@ -18,12 +18,14 @@ from main_bot.database.channel_bot_captcha.crud import ChannelCaptchaMessageCrud
 from main_bot.database.channel_bot_hello.crud import ChannelHelloMessageCrud
 from main_bot.database.channel_bot_settings.crud import ChannelBotSettingCrud
 from main_bot.database.exchange_rate.crud import ExchangeRateCrud
+from main_bot.database.media_blob.crud import MediaBlobCrud
 from main_bot.database.mt_client.crud import MtClientCrud
 from main_bot.database.mt_client_channel.crud import MtClientChannelCrud
 from main_bot.database.novastat.crud import NovaStatCrud
 from main_bot.database.novastat.external_channel_crud import ExternalChannelCrud
 from main_bot.database.novastat_cache.crud import NovaStatCacheCrud
 from main_bot.database.payment.crud import PaymentCrud
+from main_bot.database.payment_event.crud import PaymentEventCrud
 from main_bot.database.payment_link.crud import PaymentLinkCrud
 from main_bot.database.post.crud import PostCrud
 from main_bot.database.promo.crud import PromoCrud
@@ -61,12 +63,14 @@ class Database(DatabaseMixin):
         self.channel_bot_hello: ChannelHelloMessageCrud = ChannelHelloMessageCrud()
         self.channel_bot_settings: ChannelBotSettingCrud = ChannelBotSettingCrud()
         self.exchange_rate: ExchangeRateCrud = ExchangeRateCrud()
+        self.media_blob: MediaBlobCrud = MediaBlobCrud()
         self.mt_client: MtClientCrud = MtClientCrud()
         self.mt_client_channel: MtClientChannelCrud = MtClientChannelCrud()
         self.novastat: NovaStatCrud = NovaStatCrud()
         self.external_channel: ExternalChannelCrud = ExternalChannelCrud()
         self.novastat_cache: NovaStatCacheCrud = NovaStatCacheCrud()
         self.payment: PaymentCrud = PaymentCrud()
+        self.payment_event: PaymentEventCrud = PaymentEventCrud()
         self.payment_link: PaymentLinkCrud = PaymentLinkCrud()
         self.post: PostCrud = PostCrud()
         self.promo: PromoCrud = PromoCrud()
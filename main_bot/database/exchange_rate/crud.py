@@ -3,14 +3,33 @@
 """
 
 import logging
+import time
+from typing import Dict, List
 
-from sqlalchemy import insert, select, update
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from main_bot.database import DatabaseMixin
 from main_bot.database.exchange_rate.model import ExchangeRate
 
 logger = logging.getLogger(__name__)
 
+# Курсы меняются только планировщиком, поэтому держим их в памяти
+# Структура: {"rates": {id: ExchangeRate}, "expires_at": monotonic}
+RATES_CACHE_TTL = 600  # секунд
+_rates_cache: Dict = {"rates": {}, "expires_at": 0.0}
+
+
+def _set_rates_cache(rates: List[ExchangeRate]) -> None:
+    """Заменяет содержимое кэша курсов."""
+    _rates_cache["rates"] = {er.id: er for er in rates}
+    _rates_cache["expires_at"] = time.monotonic() + RATES_CACHE_TTL
+
+
+def _invalidate_rates_cache() -> None:
+    """Сбрасывает кэш курсов."""
+    _rates_cache["expires_at"] = 0.0
+
 
 class ExchangeRateCrud(DatabaseMixin):
     """
@@ -19,17 +38,24 @@ class ExchangeRateCrud(DatabaseMixin):
 
     async def get_all_exchange_rate(self) -> list:
         """
-        Получает все курсы валют.
+        Получает все курсы валют (из кэша, если он свежий).
         """
-        return await self.fetch(select(ExchangeRate))
+        if _rates_cache["rates"] and _rates_cache["expires_at"] > time.monotonic():
+            return list(_rates_cache["rates"].values())
+
+        rates = await self.fetch(select(ExchangeRate).order_by(ExchangeRate.id))
+        _set_rates_cache(rates)
+        return rates
 
     async def get_exchange_rate(self, exchange_rate_id: int) -> ExchangeRate | None:
         """
         Получает курс валюты по ID.
+
+        Все курсы загружаются одним запросом и кэшируются, поэтому
+        повторные вызовы не обращаются к БД.
         """
-        return await self.fetchrow(
-            select(ExchangeRate).where(ExchangeRate.id == exchange_rate_id)
-        )
+        await self.get_all_exchange_rate()
+        return _rates_cache["rates"].get(exchange_rate_id)
 
     async def add_exchange_rate(self, **kwargs) -> None:
         """
@@ -39,6 +65,39 @@ class ExchangeRateCrud(DatabaseMixin):
             **kwargs: Поля модели ExchangeRate.
         """
         await self.execute(insert(ExchangeRate).values(**kwargs))
+        _invalidate_rates_cache()
+
+    async def upsert_exchange_rates(self, rates: List[Dict]) -> List[ExchangeRate]:
+        """
+        Вставляет или обновляет все курсы одним запросом.
+
+        Нулевой курс (источник недоступен) не затирает сохраненное значение.
+
+        Аргументы:
+            rates (List[Dict]): Записи с полями id, name, rate, last_update.
+
+        Возвращает:
+            List[ExchangeRate]: Актуальные курсы после обновления.
+        """
+        if not rates:
+            return []
+
+        stmt = pg_insert(ExchangeRate).values(rates)
+        has_rate = stmt.excluded.rate > 0
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ExchangeRate.id],
+            set_={
+                "rate": case((has_rate, stmt.excluded.rate), else_=ExchangeRate.rate),
+                "last_update": case(
+                    (has_rate, stmt.excluded.last_update),
+                    else_=ExchangeRate.last_update,
+                ),
+            },
+        ).returning(ExchangeRate)
+
+        result = await self.fetch(stmt, commit=True)
+        _set_rates_cache(result)
+        return result
 
     async def update_exchange_rate(
         self, exchange_rate_id: int, return_obj: bool = False, **kwargs
@@ -62,4 +121,6 @@ class ExchangeRateCrud(DatabaseMixin):
             stmt = stmt.returning(ExchangeRate)
         else:
             operation = self.execute
-        return await operation(stmt, **{"commit": return_obj} if return_obj else {})
+        result = await operation(stmt, **{"commit": return_obj} if return_obj else {})
+        _invalidate_rates_cache()
+        return result
@@ -0,0 +1,118 @@
+"""
+Модуль операций базы данных для локальных медиафайлов.
+"""
+
+import logging
+import time
+from typing import List, Optional
+
+from sqlalchemy import delete, exists, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from main_bot.database import DatabaseMixin
+from main_bot.database.media_blob.model import MediaBlob, MediaBlobRef
+from main_bot.database.post.model import Post
+from main_bot.database.published_post.model import PublishedPost
+
+logger = logging.getLogger(__name__)
+
+
+class MediaBlobCrud(DatabaseMixin):
+    """
+    Класс для управления медиафайлами (MediaBlob) и ссылками постов на них.
+    """
+
+    async def touch_blob(self, blob_hash: str, ext: str, size: int) -> None:
+        """
+        Регистрирует медиафайл или обновляет время его последней загрузки.
+
+        Вызывается до записи файла на диск: свежий last_seen_timestamp
+        защищает файл от сборщика мусора.
+
+        Аргументы:
+            blob_hash (str): SHA-256 содержимого.
+            ext (str): Расширение файла.
+            size (int): Размер в байтах.
+        """
+        now = int(time.time())
+        stmt = pg_insert(MediaBlob).values(
+            hash=blob_hash,
+            ext=ext,
+            size=size,
+            created_timestamp=now,
+            last_seen_timestamp=now,
+        )
+        await self.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[MediaBlob.hash],
+                set_={"last_seen_timestamp": now},
+            )
+        )
+
+    async def blob_exists(self, blob_hash: str) -> bool:
+        """
+        Проверяет, зарегистрирован ли медиафайл.
+
+        Аргументы:
+            blob_hash (str): SHA-256 содержимого.
+        """
+        return bool(
+            await self.fetchrow(select(MediaBlob.hash).where(MediaBlob.hash == blob_hash))
+        )
+
+    async def set_post_media(self, post_id: int, blob_hash: Optional[str]) -> None:
+        """
+        Заменяет ссылку поста на медиафайл.
+
+        Аргументы:
+            post_id (int): ID поста.
+            blob_hash (str | None): Хэш медиафайла или None, если пост
+                не использует локальное медиа.
+        """
+        queries = [delete(MediaBlobRef).where(MediaBlobRef.post_id == post_id)]
+        if blob_hash:
+            queries.append(
+                pg_insert(MediaBlobRef)
+                .values(post_id=post_id, blob_hash=blob_hash)
+                .on_conflict_do_nothing()
+            )
+        await self.execute_many(queries)
+
+    async def delete_stale_refs(self) -> None:
+        """
+        Удаляет ссылки постов, которых больше нет ни в posts, ни в published_posts.
+        """
+        post_alive = or_(
+            exists().where(Post.id == MediaBlobRef.post_id),
+            exists().where(PublishedPost.post_id == MediaBlobRef.post_id),
+        )
+        await self.execute(delete(MediaBlobRef).where(~post_alive))
+
+    async def delete_unreferenced_blobs(
+        self, seen_before: int, limit: int
+    ) -> List[MediaBlob]:
+        """
+        Удаляет записи медиафайлов без ссылок, не загружавшихся с seen_before.
+
+        Условие проверяется в самом DELETE, поэтому файл, загруженный или
+        привязанный к посту параллельно, не будет удален.
+
+        Аргументы:
+            seen_before (int): Граница last_seen_timestamp (now - grace period).
+            limit (int): Максимум записей за вызов.
+
+        Возвращает:
+            List[MediaBlob]: Удаленные записи (для удаления файлов с диска).
+        """
+        unreferenced = [
+            MediaBlob.last_seen_timestamp < seen_before,
+            ~exists().where(MediaBlobRef.blob_hash == MediaBlob.hash),
+        ]
+        candidates = select(MediaBlob.hash).where(*unreferenced).limit(limit)
+
+        return await self.fetch(
+            delete(MediaBlob)
+            .where(MediaBlob.hash.in_(candidates), *unreferenced)
+            .returning(MediaBlob),
+            commit=True,
+        )
@@ -0,0 +1,58 @@
+"""
+Модели данных локальных медиафайлов (content-addressed хранилище).
+"""
+
+import time
+
+from sqlalchemy import BigInteger, ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from main_bot.database import Base
+
+
+class MediaBlob(Base):
+    """
+    Модель медиафайла, сохраненного в публичной папке.
+
+    Файл адресуется SHA-256 своего содержимого, поэтому одно и то же медиа
+    хранится один раз независимо от количества постов.
+
+    Атрибуты:
+        hash (str): SHA-256 содержимого (hex).
+        ext (str): Расширение файла (например, .jpg).
+        size (int): Размер файла в байтах.
+        created_timestamp (int): Время первого сохранения.
+        last_seen_timestamp (int): Время последней загрузки этого содержимого.
+    """
+
+    __tablename__ = "media_blobs"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    ext: Mapped[str] = mapped_column(String(16))
+    size: Mapped[int] = mapped_column(BigInteger)
+    created_timestamp: Mapped[int] = mapped_column(default=lambda: int(time.time()))
+    last_seen_timestamp: Mapped[int] = mapped_column(
+        default=lambda: int(time.time()), index=True
+    )
+
+
+class MediaBlobRef(Base):
+    """
+    Модель ссылки поста на медиафайл.
+
+    Атрибуты:
+        id (int): Уникальный ID.
+        post_id (int): ID поста (Post.id, он же PublishedPost.post_id).
+        blob_hash (str): Хэш медиафайла (MediaBlob.hash).
+    """
+
+    __tablename__ = "media_blob_refs"
+    __table_args__ = (
+        UniqueConstraint("post_id", "blob_hash", name="uq_media_blob_ref_post_blob"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    post_id: Mapped[int] = mapped_column(BigInteger, index=True)
+    blob_hash: Mapped[str] = mapped_column(
+        String(64), ForeignKey("media_blobs.hash"), index=True
+    )
@@ -0,0 +1,24 @@
+-- Миграция: Уникальность лидов и подписок рекламных закупок
+-- Дата: 2026-10-19
+-- Цель: идемпотентная обработка вступлений (INSERT ... ON CONFLICT)
+
+-- Удаляем дубликаты, оставляя самую раннюю запись
+DELETE FROM ad_leads a
+USING ad_leads b
+WHERE a.user_id = b.user_id
+  AND a.ad_purchase_id = b.ad_purchase_id
+  AND a.id > b.id;
+
+DELETE FROM ad_subscriptions a
+USING ad_subscriptions b
+WHERE a.user_id = b.user_id
+  AND a.channel_id = b.channel_id
+  AND a.ad_purchase_id = b.ad_purchase_id
+  AND a.id > b.id;
+
+ALTER TABLE ad_leads
+    ADD CONSTRAINT uq_ad_lead_user_purchase UNIQUE (user_id, ad_purchase_id);
+
+ALTER TABLE ad_subscriptions
+    ADD CONSTRAINT uq_ad_subscription_user_channel_purchase
+    UNIQUE (user_id, channel_id, ad_purchase_id);
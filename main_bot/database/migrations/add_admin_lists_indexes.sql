@@ -0,0 +1,15 @@
+-- Миграция: индексы для админских списков и поиска каналов
+-- Дата: 2026-10-19
+-- Цель: keyset-пагинация списков каналов/ботов/пользователей и поиск каналов по подстроке названия
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Поиск каналов по названию (ILIKE '%...%')
+CREATE INDEX IF NOT EXISTS idx_channels_title_trgm
+    ON channels USING gin (title gin_trgm_ops);
+
+-- Keyset-пагинация
+CREATE INDEX IF NOT EXISTS idx_channels_title_id ON channels (title, id);
+CREATE INDEX IF NOT EXISTS idx_channels_chat_id_id ON channels (chat_id, id);
+CREATE INDEX IF NOT EXISTS idx_user_bots_title_id ON user_bots (title, id);
+CREATE INDEX IF NOT EXISTS idx_users_created_timestamp_id ON users (created_timestamp, id);
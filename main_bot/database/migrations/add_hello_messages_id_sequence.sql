@@ -0,0 +1,16 @@
+-- Миграция: ID приветственных сообщений из последовательности
+-- Дата: 2026-10-19
+-- Цель: убрать выдачу ID через max(id) + 1 (гонки при клонировании настроек)
+
+CREATE SEQUENCE IF NOT EXISTS channel_hello_messages_id_seq
+    OWNED BY channel_hello_messages.id;
+
+ALTER TABLE channel_hello_messages
+    ALTER COLUMN id SET DEFAULT nextval('channel_hello_messages_id_seq');
+
+-- Продолжаем нумерацию после уже выданных ID
+SELECT setval(
+    'channel_hello_messages_id_seq',
+    COALESCE((SELECT MAX(id) FROM channel_hello_messages), 0) + 1,
+    false
+);
@@ -0,0 +1,26 @@
+-- Миграция: content-addressed хранилище медиафайлов
+-- Дата: 2026-10-19
+-- Цель: дедупликация файлов в public/images и сборка мусора по ссылкам постов
+
+CREATE TABLE IF NOT EXISTS media_blobs (
+    hash VARCHAR(64) PRIMARY KEY,
+    ext VARCHAR(16) NOT NULL,
+    size BIGINT NOT NULL,
+    created_timestamp INTEGER NOT NULL,
+    last_seen_timestamp INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_media_blobs_last_seen_timestamp
+    ON media_blobs (last_seen_timestamp);
+
+CREATE TABLE IF NOT EXISTS media_blob_refs (
+    id SERIAL PRIMARY KEY,
+    post_id BIGINT NOT NULL,
+    blob_hash VARCHAR(64) NOT NULL REFERENCES media_blobs (hash),
+    CONSTRAINT uq_media_blob_ref_post_blob UNIQUE (post_id, blob_hash)
+);
+
+CREATE INDEX IF NOT EXISTS ix_media_blob_refs_post_id ON media_blob_refs (post_id);
+CREATE INDEX IF NOT EXISTS ix_media_blob_refs_blob_hash ON media_blob_refs (blob_hash);
+
+-- Существующие файлы с UUID-именами не регистрируются и GC не затрагиваются
@@ -0,0 +1,21 @@
+-- Миграция: счетчик нагрузки MTProto клиентов
+-- Дата: 2026-10-19
+-- Цель: атомарный выбор наименее загруженного internal клиента без агрегации mt_client_channels
+
+ALTER TABLE mt_clients
+    ADD COLUMN IF NOT EXISTS assigned_channels INTEGER NOT NULL DEFAULT 0;
+
+-- Заполнение счетчика по существующим связям
+UPDATE mt_clients AS c
+SET assigned_channels = s.cnt
+FROM (
+    SELECT client_id, count(*) AS cnt
+    FROM mt_client_channels
+    GROUP BY client_id
+) AS s
+WHERE c.id = s.client_id;
+
+-- Выбор клиента: ORDER BY assigned_channels, id среди активных internal
+CREATE INDEX IF NOT EXISTS idx_mt_clients_internal_load
+    ON mt_clients (assigned_channels, id)
+    WHERE pool_type = 'internal' AND is_active AND status = 'ACTIVE';
@@ -0,0 +1,6 @@
+-- Миграция: время последнего резерва MTProto клиента
+-- Дата: 2026-10-19
+-- Цель: сверка assigned_channels с mt_client_channels для клиентов без активных резервов
+
+ALTER TABLE mt_clients
+    ADD COLUMN IF NOT EXISTS last_reserved_at BIGINT;
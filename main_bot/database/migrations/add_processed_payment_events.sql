@@ -0,0 +1,20 @@
+-- Миграция: реестр обработанных платежных событий
+-- Дата: 2026-10-19
+-- Цель: идемпотентное начисление по вебхукам Platega и CryptoBot
+
+CREATE TABLE IF NOT EXISTS processed_payment_events (
+    id SERIAL PRIMARY KEY,
+    provider VARCHAR(32) NOT NULL,
+    event_id VARCHAR NOT NULL,
+    user_id BIGINT NOT NULL,
+    amount DOUBLE PRECISION NOT NULL,
+    created_timestamp INTEGER NOT NULL,
+    CONSTRAINT uq_payment_event_provider_event UNIQUE (provider, event_id)
+);
+
+-- Уже оплаченные ссылки Platega считаем обработанными
+INSERT INTO processed_payment_events (provider, event_id, user_id, amount, created_timestamp)
+SELECT 'platega', id, user_id, amount, created_timestamp
+FROM payment_links
+WHERE status = 'PAID'
+ON CONFLICT (provider, event_id) DO NOTHING;
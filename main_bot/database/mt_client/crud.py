@@ -2,17 +2,26 @@
 Модуль операций базы данных для MTProto клиентов.
 """
 
+import asyncio
 import logging
 import time
 from typing import List, Optional
 
-from sqlalchemy import insert, select, update
+from sqlalchemy import func, insert, or_, select, update
 
 from main_bot.database import DatabaseMixin
 from main_bot.database.mt_client.model import MtClient
+from main_bot.database.mt_client_channel.model import MtClientChannel
 
 logger = logging.getLogger(__name__)
 
+# Резерв старше этого срока считается потерянным (процесс упал до release)
+RESERVATION_TTL = 15 * 60
+
+# Повторы выбора клиента, когда все строки заблокированы параллельными резервами
+RESERVE_ATTEMPTS = 50
+RESERVE_RETRY_DELAY = 0.02
+
 
 class MtClientCrud(DatabaseMixin):
     """
@@ -32,6 +41,22 @@ class MtClientCrud(DatabaseMixin):
         stmt = insert(MtClient).values(**kwargs).returning(MtClient)
         return await self.fetchrow(stmt, commit=True)
 
+    async def create_mt_clients(self, rows: List[dict]) -> List[MtClient]:
+        """
+        Создает нескольких MTProto клиентов одним запросом.
+
+        Аргументы:
+            rows (List[dict]): Поля моделей MtClient (одинаковый набор ключей).
+
+        Возвращает:
+            List[MtClient]: Созданные клиенты.
+        """
+        if not rows:
+            return []
+
+        stmt = insert(MtClient).values(rows).returning(MtClient)
+        return await self.fetch(stmt, commit=True)
+
     async def get_mt_client(self, client_id: int) -> Optional[MtClient]:
         """
         Получает клиента по ID.
@@ -63,38 +88,103 @@ class MtClientCrud(DatabaseMixin):
             update(MtClient).where(MtClient.id == client_id).values(**kwargs)
         )
 
-    async def get_next_internal_client(self, chat_id: int) -> Optional[MtClient]:
+    async def reserve_internal_client(self) -> Optional[MtClient]:
         """
-        Получает наименее загруженного (Least Used) internal клиента для канала.
-
-        Вместо round-robin (который вызывал перегрузку первого клиента),
-        теперь выбирается клиент с наименьшим количеством назначенных каналов.
-
-        Аргументы:
-            chat_id (int): Telegram ID канала (не используется в выборке, но оставлен для совместимости).
+        Атомарно резервирует наименее загруженного internal клиента.
+
+        Счетчик assigned_channels увеличивается в том же запросе, поэтому
+        одновременные назначения видят резервы друг друга. Строки, занятые
+        параллельными транзакциями, пропускаются (SKIP LOCKED) — запрос
+        берет следующего по нагрузке клиента вместо ожидания блокировки.
+        Если на мгновение заняты все клиенты, выбор повторяется после паузы
+        (ожидание блокировки привязало бы все назначения к одному клиенту).
+        Резерв снимается через release_internal_client после завершения
+        назначения (связь с каналом учитывается в счетчике отдельно).
+        Резервы, не снятые из-за падения процесса, исправляет
+        reconcile_assigned_channels.
 
         Возвращает:
-            MtClient | None: Internal клиент с наименьшей нагрузкой.
+            MtClient | None: Зарезервированный клиент или None, если нет активных.
         """
-        from sqlalchemy import func
-        from main_bot.database.mt_client_channel.model import MtClientChannel
-
-        # Выбираем клиента с наименьшим количеством записей в mt_client_channels
-        stmt = (
-            select(MtClient)
-            .outerjoin(MtClientChannel, MtClientChannel.client_id == MtClient.id)
+        candidate = (
+            select(MtClient.id)
             .where(
                 MtClient.pool_type == "internal",
                 MtClient.is_active,
                 MtClient.status == "ACTIVE",
             )
-            .group_by(MtClient.id)
-            # Сортируем по количеству каналов (возрастание) и ID (для стабильности)
-            .order_by(func.count(MtClientChannel.id).asc(), MtClient.id.asc())
+            .order_by(MtClient.assigned_channels.asc(), MtClient.id.asc())
             .limit(1)
         )
+        stmt = (
+            update(MtClient)
+            .where(MtClient.id == candidate.with_for_update(skip_locked=True).scalar_subquery())
+            .values(
+                assigned_channels=MtClient.assigned_channels + 1,
+                last_reserved_at=int(time.time()),
+            )
+            .returning(MtClient)
+        )
+
+        for _ in range(RESERVE_ATTEMPTS):
+            client = await self.fetchrow(stmt, commit=True)
+            if client is not None:
+                return client
+            # Пустой результат: либо все клиенты заняты, либо активных нет
+            if await self.fetchrow(candidate) is None:
+                return None
+            await asyncio.sleep(RESERVE_RETRY_DELAY)
 
-        return await self.fetchrow(stmt)
+        logger.warning("Не удалось зарезервировать internal клиента: все строки заняты")
+        return None
+
+    async def release_internal_client(self, client_id: int) -> None:
+        """
+        Снимает резерв, созданный reserve_internal_client.
+
+        Аргументы:
+            client_id (int): ID клиента.
+        """
+        await self.execute(
+            update(MtClient)
+            .where(MtClient.id == client_id)
+            .values(assigned_channels=func.greatest(MtClient.assigned_channels - 1, 0))
+        )
+
+    async def reconcile_assigned_channels(
+        self, stale_after: int = RESERVATION_TTL
+    ) -> List[int]:
+        """
+        Сверяет счетчик assigned_channels с фактическими связями mt_client_channels.
+
+        Затрагивает только клиентов без свежих резервов: у них счетчик должен
+        совпадать с числом связей, а расхождение означает резерв, который не
+        был снят (процесс завершился между reserve и release).
+
+        Аргументы:
+            stale_after (int): Возраст резерва в секундах, после которого он считается потерянным.
+
+        Возвращает:
+            List[int]: ID клиентов, у которых счетчик был исправлен.
+        """
+        links = (
+            select(func.count(MtClientChannel.id))
+            .where(MtClientChannel.client_id == MtClient.id)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(MtClient)
+            .where(
+                or_(
+                    MtClient.last_reserved_at.is_(None),
+                    MtClient.last_reserved_at < int(time.time()) - stale_after,
+                ),
+                MtClient.assigned_channels != links,
+            )
+            .values(assigned_channels=links)
+            .returning(MtClient.id)
+        )
+        return await self.fetch(stmt, commit=True)
 
     async def get_next_external_client(self) -> Optional[MtClient]:
         """
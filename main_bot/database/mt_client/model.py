@@ -4,7 +4,7 @@
 
 import time
 
-from sqlalchemy import BigInteger, Boolean, String
+from sqlalchemy import BigInteger, Boolean, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from main_bot.database import Base
@@ -30,6 +30,8 @@ class MtClient(Base):
         flood_wait_until (int | None): Метка времени до окончания FloodWait.
         usage_count (int): Счетчик использований.
         last_used_at (int): Время последнего использования.
+        assigned_channels (int): Каналы клиента (связи + активные резервы).
+        last_reserved_at (int | None): Время последнего резерва клиента.
     """
 
     __tablename__ = "mt_clients"
@@ -53,3 +55,9 @@ class MtClient(Base):
     # Поля для Round-robin распределения
     usage_count: Mapped[int] = mapped_column(BigInteger, default=0)
     last_used_at: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    # Счетчик нагрузки для выбора internal клиента (см. MtClientCrud)
+    assigned_channels: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    last_reserved_at: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
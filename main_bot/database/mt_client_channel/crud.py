@@ -5,9 +5,10 @@
 import logging
 from typing import List, Optional
 
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import delete, func, insert, select, update
 
 from main_bot.database import DatabaseMixin
+from main_bot.database.mt_client.model import MtClient
 from main_bot.database.mt_client_channel.model import MtClientChannel
 
 logger = logging.getLogger(__name__)
@@ -38,9 +39,28 @@ class MtClientChannelCrud(DatabaseMixin):
         obj = await self.fetchrow(stmt)
 
         if not obj:
+            # Новая связь увеличивает нагрузку клиента в той же транзакции
+            bump = (
+                update(MtClient)
+                .where(MtClient.id == client_id)
+                .values(assigned_channels=MtClient.assigned_channels + 1)
+                .returning(MtClient.id)
+                .cte("bump")
+            )
+            # DML внутри CTE сбрасывает Python-default'ы вставки: флаги задаются явно
             stmt = (
                 insert(MtClientChannel)
-                .values(client_id=client_id, channel_id=channel_id)
+                .values(
+                    client_id=client_id,
+                    channel_id=channel_id,
+                    is_member=False,
+                    is_admin=False,
+                    can_post_messages=False,
+                    can_post_stories=False,
+                    preferred_for_stats=False,
+                    preferred_for_stories=False,
+                )
+                .add_cte(bump)
                 .returning(MtClientChannel)
             )
             obj = await self.fetchrow(stmt, commit=True)
@@ -147,9 +167,20 @@ class MtClientChannelCrud(DatabaseMixin):
 
     async def delete_channels_by_client(self, client_id: int) -> None:
         """
-        Удаляет все связи клиента с каналами.
+        Удаляет все связи клиента с каналами и уменьшает его счетчик нагрузки.
         """
+        deleted = (
+            delete(MtClientChannel)
+            .where(MtClientChannel.client_id == client_id)
+            .returning(MtClientChannel.id)
+            .cte("deleted")
+        )
+        removed = select(func.count()).select_from(deleted).scalar_subquery()
 
         await self.execute(
-            delete(MtClientChannel).where(MtClientChannel.client_id == client_id)
+            update(MtClient)
+            .where(MtClient.id == client_id)
+            .values(
+                assigned_channels=func.greatest(MtClient.assigned_channels - removed, 0)
+            )
         )
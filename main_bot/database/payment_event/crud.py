@@ -0,0 +1,264 @@
+"""
+Модуль операций базы данных для обработанных платежных событий.
+
+Начисления по вебхукам выполняются одним SQL-запросом (цепочка CTE):
+событие регистрируется через INSERT ... ON CONFLICT DO NOTHING, а остальные
+изменения (статус ссылки, баланс, платеж, покупка, реферальный бонус,
+продление подписки) выполняются только если регистрация прошла в этом же запросе.
+"""
+
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from sqlalchemy import (
+    BigInteger,
+    case,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from main_bot.database import DatabaseMixin
+from main_bot.database.channel.model import Channel
+from main_bot.database.db_types import PaymentMethod, Service
+from main_bot.database.payment.model import Payment
+from main_bot.database.payment_event.model import PaymentEvent
+from main_bot.database.payment_link.model import PaymentLink
+from main_bot.database.purchase.model import Purchase
+from main_bot.database.user.crud import invalidate_user_cache
+from main_bot.database.user.model import User
+from main_bot.database.user_bot.model import UserBot
+
+logger = logging.getLogger(__name__)
+
+# Доля реферального бонуса (%) за первую и повторные покупки
+REFERRAL_FIRST_PERCENT = 60
+REFERRAL_REPEAT_PERCENT = 15
+
+
+class PaymentEventCrud(DatabaseMixin):
+    """
+    Класс для идемпотентной обработки успешных платежей.
+    """
+
+    @staticmethod
+    def _claim_cte(
+        provider: str, event_id: str, user_id: int, amount: float, now: int
+    ):
+        """CTE регистрации события: возвращает строку, только если событие новое."""
+        return (
+            pg_insert(PaymentEvent)
+            .values(
+                provider=provider,
+                event_id=event_id,
+                user_id=user_id,
+                amount=amount,
+                created_timestamp=now,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[PaymentEvent.provider, PaymentEvent.event_id]
+            )
+            .returning(PaymentEvent.user_id)
+            .cte("claim")
+        )
+
+    @staticmethod
+    def _mark_link_paid_cte(claim, payment_link_id: Optional[str]):
+        """CTE перевода платежной ссылки в статус PAID."""
+        if not payment_link_id:
+            return None
+
+        return (
+            update(PaymentLink)
+            .where(PaymentLink.id == payment_link_id, exists(select(claim.c.user_id)))
+            .values(status="PAID")
+            .returning(PaymentLink.id)
+            .cte("link_paid")
+        )
+
+    def _extend_subscriptions_cte(
+        self, claim, object_type: str, object_ids: List[int], seconds: int
+    ):
+        """CTE продления подписки каналов или ботов, возвращает ID продленных объектов."""
+        if object_type == "channels":
+            model, key = Channel, Channel.chat_id
+        else:  # bots
+            model, key = UserBot, UserBot.id
+
+        return (
+            self.extend_subscriptions_stmt(model, key, object_ids, seconds)
+            .where(exists(select(claim.c.user_id)))
+            .cte("granted")
+        )
+
+    async def credit_balance(
+        self,
+        provider: str,
+        event_id: str,
+        user_id: int,
+        amount: float,
+        method: PaymentMethod,
+        payment_link_id: Optional[str] = None,
+    ) -> Tuple[bool, Optional[float]]:
+        """
+        Идемпотентно пополняет баланс пользователя.
+
+        Событие регистрируется, даже если пользователя нет в базе (платеж
+        получен, ссылка оплачена) — такой случай возвращается отдельно.
+
+        Аргументы:
+            provider (str): Платежная система.
+            event_id (str): ID платежа у провайдера.
+            user_id (int): ID пользователя.
+            amount (float): Сумма пополнения.
+            method (PaymentMethod): Метод оплаты.
+            payment_link_id (str | None): ID платежной ссылки (Platega).
+
+        Возвращает:
+            Tuple[bool, float | None]: Зарегистрировано ли событие этим вызовом
+            и новый баланс (None, если пользователь не найден).
+        """
+        now = int(time.time())
+        claim = self._claim_cte(provider, event_id, user_id, amount, now)
+        link_paid = self._mark_link_paid_cte(claim, payment_link_id)
+
+        credited = (
+            update(User)
+            .where(User.id.in_(select(claim.c.user_id)))
+            .values(balance=User.balance + amount)
+            .returning(User.id, User.balance)
+            .cte("credited")
+        )
+        payment = (
+            insert(Payment)
+            .from_select(
+                ["user_id", "amount", "method", "created_timestamp"],
+                select(
+                    credited.c.id,
+                    literal(int(amount), Payment.amount.type),
+                    literal(method, Payment.method.type),
+                    literal(now, Payment.created_timestamp.type),
+                ),
+            )
+            .cte("payment")
+        )
+
+        stmt = (
+            select(claim.c.user_id, credited.c.balance)
+            .select_from(claim.outerjoin(credited, true()))
+            .add_cte(payment)
+        )
+        if link_paid is not None:
+            stmt = stmt.add_cte(link_paid)
+
+        rows = await self.fetchall(stmt, commit=True)
+        if not rows:
+            return False, None
+
+        balance = rows[0].balance
+        if balance is not None:
+            invalidate_user_cache(user_id)
+        return True, balance
+
+    async def record_subscription_purchase(
+        self,
+        provider: str,
+        event_id: str,
+        user_id: int,
+        total_price: int,
+        method: PaymentMethod,
+        service: Service,
+        object_type: str,
+        object_ids: List[int],
+        seconds: int,
+        referral_id: Optional[int] = None,
+        payment_link_id: Optional[str] = None,
+    ) -> Optional[List[int]]:
+        """
+        Идемпотентно записывает покупку подписки, продлевает подписку
+        выбранных объектов и начисляет реферальный бонус.
+
+        Все изменения фиксируются одной транзакцией вместе с регистрацией
+        события, поэтому оплаченный заказ не может остаться без подписки.
+        Бонус зависит от того, были ли у пользователя покупки до этой
+        (проверка видит состояние до вставки новой покупки).
+
+        Аргументы:
+            provider (str): Платежная система.
+            event_id (str): ID платежа у провайдера.
+            user_id (int): ID пользователя.
+            total_price (int): Сумма покупки.
+            method (PaymentMethod): Метод оплаты.
+            service (Service): Оплаченная услуга.
+            object_type (str): Тип объектов ('channels' или 'bots').
+            object_ids (List[int]): chat_id каналов или ID ботов.
+            seconds (int): Срок продления в секундах.
+            referral_id (int | None): ID пригласившего пользователя.
+            payment_link_id (str | None): ID платежной ссылки (Platega).
+
+        Возвращает:
+            List[int] | None: ID продленных объектов или None, если событие
+            уже обработано.
+        """
+        now = int(time.time())
+        claim = self._claim_cte(provider, event_id, user_id, total_price, now)
+        link_paid = self._mark_link_paid_cte(claim, payment_link_id)
+
+        purchase = (
+            insert(Purchase)
+            .from_select(
+                ["user_id", "amount", "method", "service", "created_timestamp"],
+                select(
+                    claim.c.user_id,
+                    literal(total_price, Purchase.amount.type),
+                    literal(method, Purchase.method.type),
+                    literal(service, Purchase.service.type),
+                    literal(now, Purchase.created_timestamp.type),
+                ),
+            )
+            .cte("purchase")
+        )
+        granted = self._extend_subscriptions_cte(claim, object_type, object_ids, seconds)
+        granted_ids = select(
+            func.coalesce(
+                func.array_agg(granted.c.object_id),
+                literal([], ARRAY(BigInteger)),
+            )
+        ).scalar_subquery()
+        # Строка есть только при новом событии; массив может быть пустым
+        stmt = select(granted_ids).select_from(claim).add_cte(purchase)
+
+        if referral_id:
+            bonus = case(
+                (
+                    exists().where(Purchase.user_id == user_id),
+                    int(total_price / 100 * REFERRAL_REPEAT_PERCENT),
+                ),
+                else_=int(total_price / 100 * REFERRAL_FIRST_PERCENT),
+            )
+            referral = (
+                update(User)
+                .where(User.id == referral_id, exists(select(claim.c.user_id)))
+                .values(
+                    balance=User.balance + bonus,
+                    referral_earned=User.referral_earned + bonus,
+                )
+                .returning(User.id)
+                .cte("referral")
+            )
+            stmt = stmt.add_cte(referral)
+
+        if link_paid is not None:
+            stmt = stmt.add_cte(link_paid)
+
+        granted_ids = await self.fetchrow(stmt, commit=True)
+        if granted_ids is not None and referral_id:
+            invalidate_user_cache(referral_id)
+        return None if granted_ids is None else list(set(granted_ids))
@@ -0,0 +1,39 @@
+"""
+Модель данных обработанного платежного события (идемпотентность вебхуков).
+"""
+
+import time
+
+from sqlalchemy import BigInteger, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from main_bot.database import Base
+
+
+class PaymentEvent(Base):
+    """
+    Модель обработанного события платежной системы.
+
+    Уникальность (provider, event_id) гарантирует, что повторный или
+    параллельный вебхук по тому же платежу не начислит средства дважды.
+
+    Атрибуты:
+        id (int): Уникальный ID записи.
+        provider (str): Платежная система (platega, crypto_bot).
+        event_id (str): ID платежа у провайдера (order_id, invoice_id).
+        user_id (int): ID пользователя.
+        amount (float): Сумма платежа.
+        created_timestamp (int): Время обработки.
+    """
+
+    __tablename__ = "processed_payment_events"
+    __table_args__ = (
+        UniqueConstraint("provider", "event_id", name="uq_payment_event_provider_event"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    provider: Mapped[str] = mapped_column(String(32))
+    event_id: Mapped[str] = mapped_column(String)
+    user_id: Mapped[int] = mapped_column(BigInteger)
+    amount: Mapped[float] = mapped_column()
+    created_timestamp: Mapped[int] = mapped_column(default=lambda: int(time.time()))
@@ -6,7 +6,7 @@ import logging
 import time
 from typing import List
 
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import bindparam, delete, insert, select, update
 
 from main_bot.database import DatabaseMixin
 from main_bot.database.published_post.model import PublishedPost
@@ -173,6 +173,11 @@ class PublishedPostCrud(DatabaseMixin):
         """
         Массовое обновление опубликованных постов (bulk update).
 
+        Строки группируются по набору обновляемых полей; каждая группа
+        записывается одним подготовленным UPDATE через executemany. Типы
+        параметров берутся из колонок, поэтому NULL не теряет тип. Все
+        группы — в одной транзакции.
+
         Аргументы:
             updates (List[dict]): Список словарей, каждый из которых содержит 'id'
                                   и поля для обновления.
@@ -180,13 +185,25 @@ class PublishedPostCrud(DatabaseMixin):
         if not updates:
             return
 
-        stmts = [
-            update(PublishedPost)
-            .where(PublishedPost.id == u["id"])
-            .values(**{k: v for k, v in u.items() if k != "id"})
-            for u in updates
-        ]
+        groups: dict[tuple, list[dict]] = {}
+        for u in updates:
+            keys = tuple(sorted(k for k in u if k != "id"))
+            if keys:
+                groups.setdefault(keys, []).append(u)
+
+        table = PublishedPost.__table__
+        stmts = []
+        for keys, rows in groups.items():
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values({k: bindparam(k) for k in keys})
+            )
+            params = [{"row_id": u["id"], **{k: u[k] for k in keys}} for u in rows]
+            stmts.append((stmt, params))
+
         await self.execute_many(stmts)
+
     async def count_user_published(self, user_id: int) -> int:
         """
         Подсчитывает количество опубликованных постов пользователя.
@@ -2,16 +2,23 @@ import logging
 import time
 from typing import Dict, Any
 
-from sqlalchemy import func, select, insert
+from sqlalchemy import and_, func, select, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from config import Config
 from main_bot.database import DatabaseMixin
+from main_bot.database.channel.model import Channel
 from main_bot.database.payment.model import Payment
 from main_bot.database.purchase.model import Purchase
 from main_bot.database.user.model import User
-from main_bot.database.stats.model import Stats
+from main_bot.database.stats.model import Stats, StatsRollup
 
 logger = logging.getLogger(__name__)
 
+# Параметры сводки аналитики (stats_rollup)
+ROLLUP_CHURN_DAYS = 30
+ROLLUP_TOP_LIMIT = 5
+
 
 class StatsCrud(DatabaseMixin):
     """
@@ -31,6 +38,9 @@ class StatsCrud(DatabaseMixin):
         """
         Собирает агрегированную статистику по пользователям и финансам.
 
+        Все метрики считаются одним запросом: по одной строке условной
+        агрегации (FILTER) на каждую таблицу, объединенных в одну выборку.
+
         Возвращает:
             Dict[str, Any]: Словарь с метриками за разные периоды.
         """
@@ -39,75 +49,170 @@ class StatsCrud(DatabaseMixin):
         week = 7 * day
         month = 30 * day
 
-        stats = {}
+        users = select(
+            func.count(User.id).label("users_total"),
+            func.count(User.id)
+            .filter(User.created_timestamp > now - day)
+            .label("users_24h"),
+            func.count(User.id)
+            .filter(User.created_timestamp > now - week)
+            .label("users_7d"),
+            func.count(User.id)
+            .filter(User.created_timestamp > now - month)
+            .label("users_30d"),
+        ).subquery()
 
-        # 1. Счётчики пользователей
-        stats["users_total"] = await self.fetchrow(select(func.count(User.id))) or 0
-        stats["users_24h"] = (
-            await self.fetchrow(
-                select(func.count(User.id)).where(User.created_timestamp > now - day)
-            )
-            or 0
-        )
-        stats["users_7d"] = (
-            await self.fetchrow(
-                select(func.count(User.id)).where(User.created_timestamp > now - week)
-            )
-            or 0
-        )
-        stats["users_30d"] = (
-            await self.fetchrow(
-                select(func.count(User.id)).where(User.created_timestamp > now - month)
-            )
-            or 0
-        )
+        payments = select(
+            func.coalesce(func.sum(Payment.amount), 0).label("payments_total_sum"),
+            func.count(Payment.id).label("payments_total_count"),
+            func.coalesce(
+                func.sum(Payment.amount).filter(Payment.created_timestamp > now - day),
+                0,
+            ).label("payments_24h_sum"),
+            func.coalesce(
+                func.sum(Payment.amount).filter(
+                    Payment.created_timestamp > now - week
+                ),
+                0,
+            ).label("payments_7d_sum"),
+        ).subquery()
 
-        # 2. Финансы (Пополнения - Payments)
-        stats["payments_total_sum"] = (
-            await self.fetchrow(select(func.sum(Payment.amount))) or 0
-        )
-        stats["payments_total_count"] = (
-            await self.fetchrow(select(func.count(Payment.id))) or 0
-        )
-        stats["payments_24h_sum"] = (
-            await self.fetchrow(
-                select(func.sum(Payment.amount)).where(
-                    Payment.created_timestamp > now - day
-                )
-            )
-            or 0
+        purchases = select(
+            func.coalesce(func.sum(Purchase.amount), 0).label("purchases_total_sum"),
+            func.count(Purchase.id).label("purchases_total_count"),
+            func.coalesce(
+                func.sum(Purchase.amount).filter(
+                    Purchase.created_timestamp > now - day
+                ),
+                0,
+            ).label("purchases_24h_sum"),
+            func.coalesce(
+                func.sum(Purchase.amount).filter(
+                    Purchase.created_timestamp > now - week
+                ),
+                0,
+            ).label("purchases_7d_sum"),
+        ).subquery()
+
+        row = await self.fetchone(select(users, payments, purchases))
+        return {key: value or 0 for key, value in row._mapping.items()}
+
+    async def get_analytics_summary(self) -> Dict[str, int]:
+        """
+        Собирает KPI для сводки админ-аналитики одним запросом.
+
+        Возвращает:
+            Dict[str, int]: total_users, users_with_channels, users_with_sub,
+            active_subs, total_revenue.
+        """
+        now = int(time.time())
+        not_deleted = Channel.subscribe != Config.SOFT_DELETE_TIMESTAMP
+        active = and_(
+            Channel.subscribe.is_not(None), Channel.subscribe > now, not_deleted
         )
-        stats["payments_7d_sum"] = (
-            await self.fetchrow(
-                select(func.sum(Payment.amount)).where(
-                    Payment.created_timestamp > now - week
+
+        users = select(func.count(User.id).label("total_users")).subquery()
+        channels = select(
+            func.count(func.distinct(Channel.admin_id))
+            .filter(not_deleted)
+            .label("users_with_channels"),
+            func.count(func.distinct(Channel.admin_id))
+            .filter(active)
+            .label("users_with_sub"),
+            func.count(func.distinct(Channel.chat_id))
+            .filter(active)
+            .label("active_subs"),
+        ).subquery()
+        payments = select(
+            func.coalesce(func.sum(Payment.amount), 0).label("total_revenue")
+        ).subquery()
+
+        row = await self.fetchone(select(users, channels, payments))
+        return {key: int(value or 0) for key, value in row._mapping.items()}
+
+    async def refresh_rollup(self) -> StatsRollup | None:
+        """
+        Пересчитывает тяжелые метрики аналитики и сохраняет их в stats_rollup.
+
+        Вызывается планировщиком, поэтому админ-панель читает готовую строку
+        вместо агрегации по всей таблице каналов и платежей.
+
+        Возвращает:
+            StatsRollup | None: Обновленная запись.
+        """
+        now = int(time.time())
+        start = now - ROLLUP_CHURN_DAYS * 86400
+        not_deleted = Channel.subscribe != Config.SOFT_DELETE_TIMESTAMP
+        has_subscribe = and_(Channel.subscribe.is_not(None), not_deleted)
+
+        churn = await self.fetchone(
+            select(
+                func.count(func.distinct(Channel.chat_id))
+                .filter(has_subscribe, Channel.subscribe > now)
+                .label("active"),
+                func.count(func.distinct(Channel.chat_id))
+                .filter(
+                    has_subscribe,
+                    Channel.subscribe >= start,
+                    Channel.subscribe < now,
                 )
+                .label("expired"),
+                func.avg((Channel.subscribe - Channel.created_timestamp) / 86400)
+                .filter(has_subscribe)
+                .label("avg_duration"),
             )
-            or 0
         )
 
-        # 3. Финансы (Покупки - Purchases)
-        stats["purchases_total_sum"] = (
-            await self.fetchrow(select(func.sum(Purchase.amount))) or 0
-        )
-        stats["purchases_total_count"] = (
-            await self.fetchrow(select(func.count(Purchase.id))) or 0
-        )
-        stats["purchases_24h_sum"] = (
-            await self.fetchrow(
-                select(func.sum(Purchase.amount)).where(
-                    Purchase.created_timestamp > now - day
-                )
-            )
-            or 0
+        channels_count = func.count(func.distinct(Channel.chat_id))
+        top_channels = await self.fetchall(
+            select(Channel.admin_id, channels_count.label("channels_count"))
+            .where(not_deleted)
+            .group_by(Channel.admin_id)
+            .order_by(channels_count.desc())
+            .limit(ROLLUP_TOP_LIMIT)
         )
-        stats["purchases_7d_sum"] = (
-            await self.fetchrow(
-                select(func.sum(Purchase.amount)).where(
-                    Purchase.created_timestamp > now - week
-                )
-            )
-            or 0
+
+        total_paid = func.sum(Payment.amount)
+        top_payments = await self.fetchall(
+            select(Payment.user_id, total_paid.label("total_paid"))
+            .group_by(Payment.user_id)
+            .order_by(total_paid.desc())
+            .limit(ROLLUP_TOP_LIMIT)
         )
 
-        return stats
+        total = churn.active + churn.expired
+        values = {
+            "active_subscriptions": churn.active,
+            "expired_30d": churn.expired,
+            "churn_rate": round(churn.expired / total * 100, 2) if total else 0.0,
+            "avg_subscription_days": (
+                round(float(churn.avg_duration), 1) if churn.avg_duration else 0.0
+            ),
+            "top_channels": [
+                {"user_id": row.admin_id, "channels_count": row.channels_count}
+                for row in top_channels
+            ],
+            "top_payments": [
+                {"user_id": row.user_id, "total_paid": int(row.total_paid)}
+                for row in top_payments
+            ],
+            "updated_timestamp": now,
+        }
+
+        stmt = pg_insert(StatsRollup).values(id=1, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=["id"], set_=values)
+        return await self.fetchrow(stmt.returning(StatsRollup), commit=True)
+
+    async def get_rollup(self) -> StatsRollup | None:
+        """
+        Возвращает последнюю сводку аналитики.
+
+        Если планировщик еще не успел её посчитать — пересчитывает на месте.
+
+        Возвращает:
+            StatsRollup | None: Запись сводки.
+        """
+        rollup = await self.fetchrow(select(StatsRollup).where(StatsRollup.id == 1))
+        if rollup is None:
+            rollup = await self.refresh_rollup()
+        return rollup
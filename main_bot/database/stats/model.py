@@ -2,6 +2,9 @@
 Модель данных глобальной статистики.
 """
 
+import time
+
+from sqlalchemy import JSON
 from sqlalchemy.orm import Mapped, mapped_column
 
 from main_bot.database import Base
@@ -23,3 +26,36 @@ class Stats(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     bot_count: Mapped[int] = mapped_column(default=0)
     channel_count: Mapped[int] = mapped_column(default=0)
+
+
+class StatsRollup(Base):
+    """
+    Периодически пересчитываемая сводка для админ-аналитики.
+
+    Хранит тяжелые метрики (отток, длительность подписок, топы), которые
+    дорого считать на каждое открытие админ-панели. Таблица содержит одну
+    строку (id=1), обновляемую планировщиком.
+
+    Атрибуты:
+        id (int): ID записи (всегда 1).
+        active_subscriptions (int): Каналов с активной подпиской.
+        expired_30d (int): Подписок, истекших за 30 дней.
+        churn_rate (float): Отток за 30 дней, %.
+        avg_subscription_days (float): Средняя длительность подписки, дней.
+        top_channels (list): Топ пользователей по количеству каналов.
+        top_payments (list): Топ пользователей по сумме платежей.
+        updated_timestamp (int): Время последнего пересчета.
+    """
+
+    __tablename__ = "stats_rollup"
+
+    id: Mapped[int] = mapped_column(primary_key=True, default=1)
+    active_subscriptions: Mapped[int] = mapped_column(default=0)
+    expired_30d: Mapped[int] = mapped_column(default=0)
+    churn_rate: Mapped[float] = mapped_column(default=0.0)
+    avg_subscription_days: Mapped[float] = mapped_column(default=0.0)
+    top_channels: Mapped[list] = mapped_column(JSON, default=list)
+    top_payments: Mapped[list] = mapped_column(JSON, default=list)
+    updated_timestamp: Mapped[int] = mapped_column(
+        default=lambda: int(time.time())
+    )
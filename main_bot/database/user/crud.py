@@ -3,7 +3,8 @@
 """
 
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import func, insert, select, update
 
@@ -12,6 +13,35 @@ from main_bot.database.user.model import User
 
 logger = logging.getLogger(__name__)
 
+# Короткоживущий кэш пользователей (write-through)
+# Структура: {user_id: (expires_at, User)}
+USER_CACHE_TTL = 30  # секунд
+_user_cache: dict[int, tuple[float, User]] = {}
+
+
+def _cache_get(user_id: int) -> User | None:
+    """Возвращает пользователя из кэша, если запись еще свежая."""
+    entry = _user_cache.get(user_id)
+    if not entry:
+        return None
+    expires_at, user = entry
+    if expires_at < time.monotonic():
+        _user_cache.pop(user_id, None)
+        return None
+    return user
+
+
+def _cache_set(user: User | None) -> None:
+    """Сохраняет пользователя в кэш (None игнорируется)."""
+    if user is None:
+        return
+    _user_cache[user.id] = (time.monotonic() + USER_CACHE_TTL, user)
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """Удаляет пользователя из кэша после изменения данных."""
+    _user_cache.pop(user_id, None)
+
 
 class UserCrud(DatabaseMixin):
     """
@@ -21,6 +51,32 @@ class UserCrud(DatabaseMixin):
     async def get_users(self) -> List[User]:
         return await self.fetch(select(User).order_by(User.created_timestamp.desc()))
 
+    async def get_users_page(
+        self, cursor_id: Optional[int], backward: bool, limit: int
+    ) -> Tuple[List[User], int]:
+        """
+        Страница списка пользователей (новые первыми) для админ-панели.
+
+        Аргументы:
+            cursor_id (int | None): ID граничного пользователя или None.
+            backward (bool): Листать назад.
+            limit (int): Размер страницы.
+
+        Возвращает:
+            Tuple[List[User], int]: Пользователи страницы (при backward — в
+            обратном порядке) и оценка общего количества.
+        """
+        stmt = self.keyset_page(
+            select(User),
+            User,
+            [User.created_timestamp],
+            cursor_id,
+            backward,
+            limit,
+            descending=True,
+        )
+        return list(await self.fetch(stmt)), await self.estimate_count(User)
+
     async def get_all_user_ids(self) -> List[int]:
         """
         Получает список всех Telegram ID зарегистрированных пользователей.
@@ -28,17 +84,76 @@ class UserCrud(DatabaseMixin):
         res = await self.fetchall(select(User.id))
         return [row[0] for row in res]
 
-    async def get_user(self, user_id: int) -> User | None:
+    async def get_active_user_ids_page(
+        self, after_id: int = 0, limit: int = 1000
+    ) -> List[int]:
+        """
+        Возвращает страницу ID активных пользователей (keyset-пагинация).
+
+        Аргументы:
+            after_id (int): ID, после которого начинается страница.
+            limit (int): Размер страницы.
+
+        Возвращает:
+            List[int]: ID пользователей по возрастанию.
+        """
+        res = await self.fetchall(
+            select(User.id)
+            .where(User.is_active.is_(True), User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+        return [row[0] for row in res]
+
+    async def get_active_users_count(self) -> int:
+        """
+        Считает активных пользователей (получателей рассылки).
+
+        Возвращает:
+            int: Количество активных пользователей.
+        """
+        result = await self.fetchrow(
+            select(func.count(User.id)).where(User.is_active.is_(True))
+        )
+        return result if result else 0
+
+    async def deactivate_users(self, user_ids: List[int]) -> None:
+        """
+        Помечает пользователей неактивными одним запросом.
+
+        Аргументы:
+            user_ids (List[int]): ID пользователей (например, заблокировавших бота).
+        """
+        if not user_ids:
+            return
+
+        await self.execute(
+            update(User).where(User.id.in_(user_ids)).values(is_active=False)
+        )
+        for user_id in user_ids:
+            invalidate_user_cache(user_id)
+
+    async def get_user(self, user_id: int, use_cache: bool = True) -> User | None:
         """
         Получает пользователя по ID.
 
+        Сначала проверяет короткоживущий кэш, при промахе идет в БД.
+
         Аргументы:
             user_id (int): Telegram ID пользователя.
+            use_cache (bool): Разрешить ли чтение из кэша.
 
         Возвращает:
             User | None: Объект User или None.
         """
-        return await self.fetchrow(select(User).where(User.id == user_id))
+        if use_cache:
+            cached = _cache_get(user_id)
+            if cached is not None:
+                return cached
+
+        user = await self.fetchrow(select(User).where(User.id == user_id))
+        _cache_set(user)
+        return user
 
     async def get_count_user_referral(self, user_id: int) -> int:
         """
@@ -55,14 +170,21 @@ class UserCrud(DatabaseMixin):
         )
         return res if res else 0
 
-    async def add_user(self, **kwargs) -> None:
+    async def add_user(self, **kwargs) -> User | None:
         """
         Добавляет нового пользователя.
 
         Аргументы:
             **kwargs: Поля модели User.
+
+        Возвращает:
+            User | None: Созданный пользователь.
         """
-        await self.execute(insert(User).values(**kwargs))
+        user = await self.fetchrow(
+            insert(User).values(**kwargs).returning(User), commit=True
+        )
+        _cache_set(user)
+        return user
 
     async def update_user(
         self, user_id: int, return_obj: bool = False, **kwargs
@@ -87,7 +209,14 @@ class UserCrud(DatabaseMixin):
             operation = self.execute
             stmt = stmt.execution_options(synchronize_session=None)
 
-        return await operation(stmt, **{"commit": True} if return_obj else {})
+        result = await operation(stmt, **{"commit": True} if return_obj else {})
+
+        if return_obj:
+            _cache_set(result)
+        else:
+            invalidate_user_cache(user_id)
+
+        return result
 
     async def increment_balance(self, user_id: int, amount: int) -> None:
         """
@@ -100,6 +229,7 @@ class UserCrud(DatabaseMixin):
             .values(balance=User.balance + amount)
         )
         await self.execute(stmt, commit=True)
+        invalidate_user_cache(user_id)
 
     async def add_referral_reward(self, user_id: int, amount: int) -> None:
         """
@@ -114,6 +244,7 @@ class UserCrud(DatabaseMixin):
             )
         )
         await self.execute(stmt, commit=True)
+        invalidate_user_cache(user_id)
 
     async def toggle_signature_active(
         self, user_id: int, setting_type: str
@@ -147,7 +278,9 @@ class UserCrud(DatabaseMixin):
             .returning(User)
         )
 
-        return await self.fetchrow(stmt, commit=True)
+        user = await self.fetchrow(stmt, commit=True)
+        _cache_set(user)
+        return user
 
     # === МЕТОДЫ АНАЛИТИКИ ===
 
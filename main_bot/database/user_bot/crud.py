@@ -3,7 +3,7 @@
 """
 
 import logging
-from typing import List
+from typing import List, Optional, Tuple
 
 from sqlalchemy import delete, desc, insert, select, update, or_
 
@@ -109,6 +109,26 @@ class UserBotCrud(DatabaseMixin):
         """
         await self.execute(delete(UserBot).where(UserBot.id == row_id))
 
+    async def extend_subscriptions(self, bot_ids: List[int], seconds: int) -> List[int]:
+        """
+        Продлевает подписку ботов одним запросом.
+
+        Отсчет идет от текущей даты окончания (или от текущего времени, если
+        подписка истекла). Параллельные продления одного бота суммируются.
+
+        Аргументы:
+            bot_ids (List[int]): ID ботов.
+            seconds (int): Срок продления в секундах.
+
+        Возвращает:
+            List[int]: ID ботов, которые были найдены и продлены.
+        """
+        if not bot_ids:
+            return []
+
+        stmt = self.extend_subscriptions_stmt(UserBot, UserBot.id, bot_ids, seconds)
+        return list(await self.fetch(stmt, commit=True))
+
     async def update_bot_by_id(
         self, row_id: int, return_obj: bool = False, **kwargs
     ) -> UserBot | None:
@@ -132,6 +152,27 @@ class UserBotCrud(DatabaseMixin):
             operation = self.execute
 
         return await operation(stmt, **{"commit": return_obj} if return_obj else {})
+
+    async def get_bots_page(
+        self, cursor_id: Optional[int], backward: bool, limit: int
+    ) -> Tuple[List[UserBot], int]:
+        """
+        Страница списка ботов (keyset по названию) для админ-панели.
+
+        Аргументы:
+            cursor_id (int | None): ID граничного бота или None.
+            backward (bool): Листать назад.
+            limit (int): Размер страницы.
+
+        Возвращает:
+            Tuple[List[UserBot], int]: Боты страницы (при backward — в обратном
+            порядке) и оценка общего количества.
+        """
+        stmt = self.keyset_page(
+            select(UserBot), UserBot, [UserBot.title], cursor_id, backward, limit
+        )
+        return list(await self.fetch(stmt)), await self.estimate_count(UserBot)
+
     async def get_all_bots(self) -> List[UserBot]:
         """
         Получает список всех ботов в системе.
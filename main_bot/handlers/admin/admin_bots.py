@@ -8,6 +8,7 @@ import time
 from aiogram import Router, F, types
 from main_bot.database.db import db
 from main_bot.keyboards import keyboards
+from main_bot.utils.pagination import FIRST_PAGE_CURSOR, parse_cursor, split_page
 from utils.error_handler import safe_handler
 
 logger = logging.getLogger(__name__)
@@ -17,19 +18,27 @@ router = Router()
 BOTS_PER_PAGE = 10
 
 @safe_handler("Админ: Боты — список")
-async def show_bots_list(call: types.CallbackQuery, offset: int = 0) -> None:
-    """Отображает список всех ботов системы."""
-    all_bots = await db.user_bot.get_all_bots()
-    total = len(all_bots)
-    bots = all_bots[offset : offset + BOTS_PER_PAGE]
+async def show_bots_list(
+    call: types.CallbackQuery, cursor: str = FIRST_PAGE_CURSOR, page: int = 1
+) -> None:
+    """Отображает список всех ботов системы (keyset-пагинация)."""
+    cursor_id, backward = parse_cursor(cursor)
+    rows, total = await db.user_bot.get_bots_page(
+        cursor_id=cursor_id, backward=backward, limit=BOTS_PER_PAGE + 1
+    )
+    if not rows and cursor_id is not None:
+        # Граничная строка удалена (подзапрос курсора дает NULL) или за ней
+        # ничего не осталось — открываем первую страницу
+        return await show_bots_list(call)
+    bots, prev_cursor, next_cursor = split_page(rows, BOTS_PER_PAGE, cursor_id, backward)
 
-    text = f"🤖 <b>Все боты системы</b>\n\nВсего ботов: {total}\n"
+    text = f"🤖 <b>Все боты системы</b>\n\nВсего ботов: ~{total}\nСтраница: {page}\n"
     if not bots:
         text += "Боты не найдены."
 
     await call.message.edit_text(
         text,
-        reply_markup=keyboards.admin_bots_list(bots, offset, total),
+        reply_markup=keyboards.admin_bots_list(bots, page, prev_cursor, next_cursor),
         parse_mode="HTML"
     )
     await call.answer()
@@ -59,8 +68,12 @@ async def view_bot_details(call: types.CallbackQuery) -> None:
 
     if channels_settings:
         msg += "📺 <b>Привязан к каналам:</b>\n"
+        # Все каналы одним запросом
+        channels = await db.channel.get_channels_by_chat_ids(
+            [setting.id for setting in channels_settings]
+        )
         for setting in channels_settings:
-            channel = await db.channel.get_channel_by_chat_id(setting.id)
+            channel = channels.get(setting.id)
             title = channel.title if channel else f"ID: {setting.id}"
             msg += f"• {title}\n"
     else:
@@ -80,8 +93,9 @@ async def bots_callback_handler(call: types.CallbackQuery) -> None:
     action = data[1]
     
     if action == "list":
-        offset = int(data[2])
-        await show_bots_list(call, offset)
+        cursor = data[2] if len(data) > 2 else FIRST_PAGE_CURSOR
+        page = int(data[3]) if len(data) > 3 else 1
+        await show_bots_list(call, cursor, page)
     elif action == "view":
         await view_bot_details(call)
 
@@ -11,6 +11,7 @@ from aiogram.fsm.context import FSMContext
 from main_bot.database.db import db
 from main_bot.keyboards import keyboards
 from main_bot.states.admin import AdminStates
+from main_bot.utils.pagination import FIRST_PAGE_CURSOR, parse_cursor, split_page
 from utils.error_handler import safe_handler
 
 logger = logging.getLogger(__name__)
@@ -21,20 +22,29 @@ USERS_PER_PAGE = 10
 
 
 @safe_handler("Админ: Пользователи — список")
-async def show_users_list(call: types.CallbackQuery, offset: int = 0) -> None:
-    """Отображает список всех пользователей системы."""
-    # TODO: Добавить пагинацию в БД для оптимизации на больших объемах
-    all_users = await db.user.get_users()
-    total = len(all_users)
-    users = all_users[offset : offset + USERS_PER_PAGE]
-
-    text_msg = f"👥 <b>Пользователи системы</b>\n\nВсего: {total}\n"
+async def show_users_list(
+    call: types.CallbackQuery, cursor: str = FIRST_PAGE_CURSOR, page: int = 1
+) -> None:
+    """Отображает список всех пользователей системы (keyset-пагинация)."""
+    cursor_id, backward = parse_cursor(cursor)
+    rows, total = await db.user.get_users_page(
+        cursor_id=cursor_id, backward=backward, limit=USERS_PER_PAGE + 1
+    )
+    if not rows and cursor_id is not None:
+        # Граничная строка удалена (подзапрос курсора дает NULL) или за ней
+        # ничего не осталось — открываем первую страницу
+        return await show_users_list(call)
+    users, prev_cursor, next_cursor = split_page(
+        rows, USERS_PER_PAGE, cursor_id, backward
+    )
+
+    text_msg = f"👥 <b>Пользователи системы</b>\n\nВсего: ~{total}\nСтраница: {page}\n"
     if not users:
         text_msg += "Пользователи не найдены."
 
     await call.message.edit_text(
         text_msg,
-        reply_markup=keyboards.admin_users_list(users, offset, total),
+        reply_markup=keyboards.admin_users_list(users, page, prev_cursor, next_cursor),
         parse_mode="HTML",
     )
     await call.answer()
@@ -203,9 +213,9 @@ async def users_callback_handler(call: types.CallbackQuery, state: FSMContext) -
     action = data[1]
 
     if action == "list":
-        # Если передан page, используем его, иначе offset
-        offset = int(data[2])
-        await show_users_list(call, offset)
+        cursor = data[2] if len(data) > 2 else FIRST_PAGE_CURSOR
+        page = int(data[3]) if len(data) > 3 else 1
+        await show_users_list(call, cursor, page)
     elif action == "view":
         await view_user_details(call)
     elif action == "menu":
@@ -3,6 +3,7 @@
 """
 
 import logging
+from datetime import datetime
 
 from aiogram import F, Router, types
 
@@ -15,6 +16,11 @@ logger = logging.getLogger(__name__)
 router = Router()
 
 
+def _format_updated(timestamp: int) -> str:
+    """Форматирует время пересчета сводки аналитики."""
+    return datetime.fromtimestamp(timestamp).strftime("%d.%m.%Y %H:%M")
+
+
 @safe_handler("Админ: Аналитика — меню")
 async def show_analytics_menu(call: types.CallbackQuery) -> None:
     """Главное меню аналитики"""
@@ -36,15 +42,14 @@ async def show_analytics_menu(call: types.CallbackQuery) -> None:
 @safe_handler("Админ: Аналитика — сводка")
 async def show_analytics_summary(call: types.CallbackQuery) -> None:
     """Сводка ключевых показателей (KPI)."""
-    # Пользователи и воронка
-    total_users = await db.user.get_total_users_count()
-    users_with_channels = await db.user.get_users_with_channels_count()
-    users_with_sub = await db.user.get_users_with_active_subscription_count()
-
-    # Финансы
-    total_revenue = await db.payment.get_total_revenue()
-    active_subs = await db.channel.get_active_subscriptions_count()
-    mrr = active_subs * 99  # Monthly Recurring Revenue (упрощенно)
+    # Пользователи, воронка и финансы — одним запросом
+    summary = await db.stats.get_analytics_summary()
+    total_users = summary["total_users"]
+    users_with_channels = summary["users_with_channels"]
+    users_with_sub = summary["users_with_sub"]
+    total_revenue = summary["total_revenue"]
+
+    mrr = summary["active_subs"] * 99  # Monthly Recurring Revenue (упрощенно)
     arr = mrr * 12  # Annual Recurring Revenue
 
     # Конверсии
@@ -82,9 +87,11 @@ async def show_analytics_summary(call: types.CallbackQuery) -> None:
 @safe_handler("Админ: Аналитика — Churn & Retention")
 async def show_analytics_churn(call: types.CallbackQuery) -> None:
     """Показатели оттока и удержания."""
-    churn_rate = await db.channel.get_churn_rate(30)
-    expired_30d = await db.channel.get_expired_subscriptions_count(30)
-    avg_duration = await db.channel.get_average_subscription_duration()
+    # Тяжелые метрики читаем из периодически пересчитываемой сводки
+    rollup = await db.stats.get_rollup()
+    churn_rate = rollup.churn_rate
+    expired_30d = rollup.expired_30d
+    avg_duration = rollup.avg_subscription_days
 
     text_msg = (
         "📉 <b>Churn & Retention (30 дней)</b>\n\n"
@@ -92,7 +99,8 @@ async def show_analytics_churn(call: types.CallbackQuery) -> None:
         f"├ Churn Rate: <b>{churn_rate}%</b>\n"
         f"└ Истекло подписок: <b>{expired_30d}</b>\n\n"
         f"⏳ <b>Удержание:</b>\n"
-        f"└ Средняя жизнь подписки: <b>{avg_duration} дн.</b>"
+        f"└ Средняя жизнь подписки: <b>{avg_duration} дн.</b>\n\n"
+        f"<i>Обновлено: {_format_updated(rollup.updated_timestamp)}</i>"
     )
 
     from aiogram.exceptions import TelegramBadRequest
@@ -110,8 +118,9 @@ async def show_analytics_churn(call: types.CallbackQuery) -> None:
 @safe_handler("Админ: Аналитика — Топ пользователей")
 async def show_analytics_top(call: types.CallbackQuery) -> None:
     """Топ пользователей по каналам и платежам."""
-    top_channels = await db.user.get_top_users_by_channels(5)
-    top_payments = await db.payment.get_top_users_by_payments(5)
+    rollup = await db.stats.get_rollup()
+    top_channels = rollup.top_channels
+    top_payments = rollup.top_payments
 
     text_msg = "🏆 <b>Топ пользователей</b>\n\n"
 
@@ -126,6 +135,8 @@ async def show_analytics_top(call: types.CallbackQuery) -> None:
         user_link = f"<a href='tg://user?id={data['user_id']}'>{data['user_id']}</a>"
         text_msg += f"{i}. {user_link} — <b>{data['total_paid']:,}₽</b>\n"
 
+    text_msg += f"\n<i>Обновлено: {_format_updated(rollup.updated_timestamp)}</i>"
+
     from aiogram.exceptions import TelegramBadRequest
 
     try:
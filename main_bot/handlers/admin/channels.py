@@ -17,6 +17,7 @@ from aiogram.fsm.context import FSMContext
 from main_bot.database.db import db
 from main_bot.keyboards import keyboards
 from main_bot.states.admin import AdminChannels
+from main_bot.utils.pagination import FIRST_PAGE_CURSOR, parse_cursor, split_page
 from utils.error_handler import safe_handler
 
 logger = logging.getLogger(__name__)
@@ -24,28 +25,37 @@ logger = logging.getLogger(__name__)
 router = Router()
 
 CHANNELS_PER_PAGE = 10
+SEARCH_LIMIT = 50  # Максимум каналов в результатах поиска
 
 
 @safe_handler("Admin Show Channels List")
-async def show_channels_list(call: types.CallbackQuery, offset: int = 0) -> None:
+async def show_channels_list(
+    call: types.CallbackQuery, cursor: str = FIRST_PAGE_CURSOR, page: int = 1
+) -> None:
     """
-    Показать список каналов с пагинацией.
+    Показать список каналов с keyset-пагинацией.
 
     Аргументы:
         call (types.CallbackQuery): Callback запрос.
-        offset (int): Смещение для пагинации.
+        cursor (str): Курсор страницы (см. main_bot.utils.pagination).
+        page (int): Номер страницы (для отображения).
     """
-    # Получить все каналы
-    all_channels = await db.channel.get_all_channels()
-    total = len(all_channels)
-
-    # Пагинация
-    channels = all_channels[offset : offset + CHANNELS_PER_PAGE]
+    cursor_id, backward = parse_cursor(cursor)
+    rows, total = await db.channel.get_channels_page(
+        cursor_id=cursor_id, backward=backward, limit=CHANNELS_PER_PAGE + 1
+    )
+    if not rows and cursor_id is not None:
+        # Граничная строка удалена (подзапрос курсора дает NULL) или за ней
+        # ничего не осталось — открываем первую страницу
+        return await show_channels_list(call)
+    channels, prev_cursor, next_cursor = split_page(
+        rows, CHANNELS_PER_PAGE, cursor_id, backward
+    )
 
     # Формирование текста
     text_msg = "📺 <b>Управление каналами</b>\n\n"
-    text_msg += f"Всего каналов: {total}\n"
-    text_msg += f"Страница: {offset // CHANNELS_PER_PAGE + 1}/{(total + CHANNELS_PER_PAGE - 1) // CHANNELS_PER_PAGE}\n\n"
+    text_msg += f"Всего каналов: ~{total}\n"
+    text_msg += f"Страница: {page}\n\n"
 
     if not channels:
         text_msg += "Нет добавленных каналов"
@@ -53,7 +63,9 @@ async def show_channels_list(call: types.CallbackQuery, offset: int = 0) -> None
     try:
         await call.message.edit_text(
             text_msg,
-            reply_markup=keyboards.admin_channels_list(channels, offset, total),
+            reply_markup=keyboards.admin_channels_list(
+                channels, page, prev_cursor, next_cursor
+            ),
             parse_mode="HTML",
         )
     except Exception as e:
@@ -93,11 +105,8 @@ async def search_channel_process(message: types.Message, state: FSMContext) -> N
     """
     query = message.text.strip().lower()
 
-    # Получить все каналы
-    all_channels = await db.channel.get_all_channels()
-
-    # Фильтрация
-    found_channels = [ch for ch in all_channels if query in ch.title.lower()]
+    # Поиск по названию в БД (GIN-индекс pg_trgm)
+    found_channels = await db.channel.search_channels(query, limit=SEARCH_LIMIT)
 
     if not found_channels:
         await message.answer(
@@ -112,9 +121,7 @@ async def search_channel_process(message: types.Message, state: FSMContext) -> N
 
         await message.answer(
             text_msg,
-            reply_markup=keyboards.admin_channels_list(
-                found_channels, 0, len(found_channels)
-            ),
+            reply_markup=keyboards.admin_channels_list(found_channels),
             parse_mode="HTML",
         )
 
@@ -352,8 +359,9 @@ async def channels_callback_handler(
     action = data[1] if len(data) > 1 else None
 
     if action == "list":
-        offset = int(data[2]) if len(data) > 2 else 0
-        await show_channels_list(call, offset)
+        cursor = data[2] if len(data) > 2 else FIRST_PAGE_CURSOR
+        page = int(data[3]) if len(data) > 3 else 1
+        await show_channels_list(call, cursor, page)
     elif action == "search":
         await search_channel_start(call, state)
     elif action == "view":
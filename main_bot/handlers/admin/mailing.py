@@ -5,80 +5,278 @@
 - Прием контента для рассылки.
 - Подтверждение и запуск процесса рассылки.
 - Фоновое выполнение рассылки с контролем частоты запросов (flood control).
+
+Получатели читаются из БД страницами (keyset по ID), отправка идет через
+token bucket. Курсор и счетчики сохраняются в Redis после каждой страницы,
+поэтому после перезапуска рассылка продолжается с места остановки.
 """
 
 import asyncio
+import json
 import logging
 import time
+import uuid
 
 from aiogram import Router, F, types, Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
 from aiogram.fsm.context import FSMContext
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from main_bot.database.db import db
 from main_bot.states.admin import AdminMailing
+from main_bot.utils.background import run_background_task
 from main_bot.utils.lang.language import text
+from main_bot.utils.rate_limiter import TokenBucket
+from main_bot.utils.redis_client import redis_client
 from utils.error_handler import safe_handler
 
 logger = logging.getLogger(__name__)
 
 # Константы для контроля флуда
-MAX_CONCURRENT_REQUESTS = 30  # Сообщений в секунду
+MAILING_RATE_PER_SECOND = 25  # Лимит Bot API ~30 сообщений в секунду
+MAILING_BATCH_SIZE = 200  # Размер страницы получателей
+MAILING_MAX_RETRIES = 3  # Повторы одного получателя после RetryAfter
+PROGRESS_UPDATE_INTERVAL = 5  # Секунд между обновлениями прогресса
+MAILING_MAX_FAILURES = 3  # Сбоев рассылки подряд до ее остановки
+MAILING_RETRY_DELAY = 30  # Секунд до перезапуска после сбоя (удваивается)
+
+# Ключ Redis с состоянием текущей рассылки
+MAILING_JOB_KEY = "admin_mailing:job"
+# ID остановленной администратором рассылки (задача завершится на следующей странице)
+MAILING_CANCEL_KEY = "admin_mailing:cancel"
+MAILING_CANCEL_TTL = 24 * 3600
+
+
+async def _save_job(job: dict) -> None:
+    """Сохраняет состояние рассылки (курсор и счетчики) в Redis."""
+    await redis_client.set(MAILING_JOB_KEY, json.dumps(job))
+
 
+async def _claim_job(job: dict) -> bool:
+    """
+    Атомарно занимает слот рассылки (SET NX).
 
-async def broadcast_task(bot: Bot, admin_id: int, message_to_copy: types.Message, user_ids: list) -> None:
+    Возвращает:
+        bool: False, если другая рассылка уже запущена.
+    """
+    return bool(await redis_client.set(MAILING_JOB_KEY, json.dumps(job), nx=True))
+
+
+async def _load_job() -> dict | None:
+    """Загружает состояние незавершенной рассылки из Redis."""
+    raw = await redis_client.get(MAILING_JOB_KEY)
+    return json.loads(raw) if raw else None
+
+
+async def _is_cancelled(job: dict) -> bool:
+    """Проверяет, остановил ли администратор эту рассылку."""
+    cancelled = await redis_client.get(MAILING_CANCEL_KEY)
+    return cancelled is not None and cancelled.decode() == job["id"]
+
+
+def _stop_kb() -> types.InlineKeyboardMarkup:
+    """Клавиатура с кнопкой остановки текущей рассылки."""
+    kb = InlineKeyboardBuilder()
+    kb.button(text=text("admin:mailing:btn:stop"), callback_data="AdminMail|stop")
+    return kb.as_markup()
+
+
+async def _notify_admin(bot: Bot, job: dict, message: str) -> None:
+    """Отправляет администратору сообщение о состоянии рассылки."""
+    try:
+        await bot.send_message(job["admin_id"], message, parse_mode="HTML")
+    except Exception as e:
+        logger.error(f"Не удалось уведомить администратора {job['admin_id']}: {e}")
+
+
+async def _update_progress(bot: Bot, job: dict, running: bool = True) -> None:
+    """Обновляет сообщение с прогрессом рассылки у администратора."""
+    if not job.get("progress_message_id"):
+        return
+
+    try:
+        await bot.edit_message_text(
+            text=text("admin:mailing:progress").format(
+                job["processed"],
+                job["total"],
+                job["success"],
+                job["errors"],
+                job["blocked"],
+            ),
+            chat_id=job["admin_id"],
+            message_id=job["progress_message_id"],
+            reply_markup=_stop_kb() if running else None,
+            parse_mode="HTML",
+        )
+    except TelegramBadRequest:
+        pass  # message is not modified / сообщение удалено
+    except Exception as e:
+        logger.debug(f"Не удалось обновить прогресс рассылки: {e}")
+
+
+async def _send_to_user(
+    bot: Bot, bucket: TokenBucket, job: dict, user_id: int
+) -> str:
+    """
+    Отправка сообщения конкретному пользователю.
+
+    Возвращает:
+        str: "success", "blocked" или "error".
+    """
+    for _ in range(MAILING_MAX_RETRIES):
+        await bucket.acquire()
+        try:
+            await bot.copy_message(
+                chat_id=user_id,
+                from_chat_id=job["from_chat_id"],
+                message_id=job["message_id"],
+            )
+            return "success"
+        except TelegramRetryAfter as e:
+            logger.warning(f"Рассылка: RetryAfter {e.retry_after}с")
+            bucket.pause(e.retry_after)
+        except TelegramForbiddenError:
+            return "blocked"
+        except Exception as e:
+            logger.debug(f"Ошибка отправки пользователю {user_id}: {e}")
+            return "error"
+
+    return "error"
+
+
+async def broadcast_task(bot: Bot, job: dict) -> None:
     """
     Фоновая задача для массовой рассылки сообщений пользователям.
 
     Аргументы:
         bot (Bot): Экземпляр бота.
-        admin_id (int): Telegram ID администратора для отправки отчета.
-        message_to_copy (types.Message): Объект сообщения, которое нужно скопировать.
-        user_ids (list): Список ID пользователей-получателей.
+        job (dict): Состояние рассылки (admin_id, from_chat_id, message_id,
+            cursor, счетчики, progress_message_id).
     """
-    logger.info(f"Запуск массовой рассылки от админа {admin_id} на {len(user_ids)} пользователей")
-    
-    success = 0
-    errors = 0
+    admin_id = job["admin_id"]
+    logger.info(
+        f"Запуск массовой рассылки от админа {admin_id} на {job['total']} "
+        f"пользователей (курсор={job['cursor']})"
+    )
+
     start_time = time.time()
-    
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
-
-    async def send_to_user(user_id: int) -> None:
-        """
-        Отправка сообщения конкретному пользователю.
-        """
-        nonlocal success, errors
-        async with semaphore:
-            try:
-                await bot.copy_message(
-                    chat_id=user_id,
-                    from_chat_id=message_to_copy.chat.id,
-                    message_id=message_to_copy.message_id
-                )
-                success += 1
-            except Exception as e:
-                errors += 1
-                logger.debug(f"Ошибка отправки пользователю {user_id}: {e}")
-            
-            # Небольшая задержка для соблюдения лимитов
-            await asyncio.sleep(0.05)
-
-    # Запускаем задачи параллельно с ограничением семафором
-    tasks = [send_to_user(uid) for uid in user_ids]
-    await asyncio.gather(*tasks)
+    last_progress = 0.0
+    bucket = TokenBucket(rate=MAILING_RATE_PER_SECOND)
+
+    try:
+        while True:
+            if await _is_cancelled(job):
+                logger.info(f"Рассылка {job['id']} остановлена администратором")
+                await redis_client.delete(MAILING_CANCEL_KEY)
+                await _update_progress(bot, job, running=False)
+                return
+
+            user_ids = await db.user.get_active_user_ids_page(
+                after_id=job["cursor"], limit=MAILING_BATCH_SIZE
+            )
+            if not user_ids:
+                break
+
+            results = await asyncio.gather(
+                *(_send_to_user(bot, bucket, job, uid) for uid in user_ids)
+            )
+
+            blocked = [uid for uid, res in zip(user_ids, results) if res == "blocked"]
+            await db.user.deactivate_users(blocked)
+
+            job["cursor"] = user_ids[-1]
+            job["processed"] += len(user_ids)
+            job["success"] += results.count("success")
+            job["errors"] += results.count("error")
+            job["blocked"] += len(blocked)
+            job["failures"] = 0
+            # Остановленную рассылку не сохраняем — иначе ключ появится снова
+            if await _is_cancelled(job):
+                continue
+            await _save_job(job)
+
+            if time.monotonic() - last_progress >= PROGRESS_UPDATE_INTERVAL:
+                last_progress = time.monotonic()
+                await _update_progress(bot, job)
+    except Exception as e:
+        logger.error(f"Рассылка прервана на курсоре {job['cursor']}: {e}", exc_info=True)
+
+        job["failures"] = job.get("failures", 0) + 1
+        if job["failures"] >= MAILING_MAX_FAILURES:
+            # Освобождаем слот рассылки, чтобы можно было запустить новую
+            await redis_client.delete(MAILING_JOB_KEY)
+            await _update_progress(bot, job, running=False)
+            await _notify_admin(
+                bot,
+                job,
+                text("admin:mailing:failed").format(
+                    job["failures"], job["processed"], job["total"]
+                ),
+            )
+            return
+
+        # Счетчик сбоев сохраняется в Redis: после перезапуска лимит продолжает действовать
+        if not await _is_cancelled(job):
+            await _save_job(job)
+        delay = MAILING_RETRY_DELAY * 2 ** (job["failures"] - 1)
+        await _notify_admin(
+            bot,
+            job,
+            text("admin:mailing:retry").format(
+                job["failures"], MAILING_MAX_FAILURES, delay
+            ),
+        )
+        await asyncio.sleep(delay)
+        run_background_task(broadcast_task(bot, job), name="admin_mailing")
+        return
+
+    await redis_client.delete(MAILING_JOB_KEY)
+    await _update_progress(bot, job, running=False)
 
     duration = round(time.time() - start_time, 2)
-    logger.info(f"Рассылка завершена за {duration}с. Успешно: {success}, Ошибок: {errors}")
+    logger.info(
+        f"Рассылка завершена за {duration}с. Успешно: {job['success']}, "
+        f"Ошибок: {job['errors']} (заблокировали: {job['blocked']})"
+    )
 
     # Отправка отчета администратору
     try:
-        report = text("admin:mailing:finished").format(success, errors)
+        report = text("admin:mailing:finished").format(
+            job["success"], job["errors"] + job["blocked"]
+        )
         await bot.send_message(admin_id, report, parse_mode="HTML")
     except Exception as e:
         logger.error(f"Не удалось отправить отчет о рассылке администратору {admin_id}: {e}")
 
 
+async def resume_broadcast(bot: Bot) -> None:
+    """
+    Возобновляет незавершенную рассылку после перезапуска приложения.
+
+    Аргументы:
+        bot (Bot): Экземпляр бота.
+    """
+    job = await _load_job()
+    if not job:
+        return
+
+    logger.info(f"Найдена незавершенная рассылка, курсор={job['cursor']}")
+    # Рассылки, сохраненные до появления ID
+    job.setdefault("id", uuid.uuid4().hex)
+    try:
+        await bot.send_message(
+            job["admin_id"], text("admin:mailing:resumed"), parse_mode="HTML"
+        )
+    except Exception as e:
+        logger.error(f"Не удалось уведомить администратора о возобновлении: {e}")
+
+    run_background_task(broadcast_task(bot, job), name="admin_mailing")
+
+
 @safe_handler("Админ-панель: прием сообщения для рассылки")
 async def get_mailing_post(message: types.Message, state: FSMContext) -> None:
     """
@@ -87,8 +285,7 @@ async def get_mailing_post(message: types.Message, state: FSMContext) -> None:
     """
     logger.info(f"Админ {message.from_user.id} прислал контент для рассылки")
     
-    all_users = await db.user.get_users()
-    count = len(all_users)
+    count = await db.user.get_active_users_count()
     
     # Сохраняем данные сообщения для последующего копирования
     await state.update_data(
@@ -127,28 +324,67 @@ async def confirm_mailing(call: types.CallbackQuery, state: FSMContext, bot: Bot
         await call.answer("❌ Ошибка: данные сообщения утеряны", show_alert=True)
         return await state.clear()
 
-    # Получаем список всех ID пользователей
-    users = await db.user.get_users()
-    user_ids = [u.id for u in users]
-    
-    # Подготовка объекта сообщения для передачи в таску
-    message_to_copy = types.Message(
-        message_id=msg_id,
-        chat=types.Chat(id=chat_id, type="private"),
-        date=int(time.time())
-    )
+    job = {
+        "id": uuid.uuid4().hex,
+        "admin_id": call.from_user.id,
+        "from_chat_id": chat_id,
+        "message_id": msg_id,
+        "cursor": 0,
+        "total": await db.user.get_active_users_count(),
+        "processed": 0,
+        "success": 0,
+        "errors": 0,
+        "blocked": 0,
+        "failures": 0,
+        "progress_message_id": call.message.message_id,
+    }
+    # Повторное нажатие или два администратора сразу не должны запустить две рассылки
+    if not await _claim_job(job):
+        await call.message.edit_text(
+            text("admin:mailing:already_running"),
+            reply_markup=_stop_kb(),
+            parse_mode="HTML",
+        )
+        return await state.clear()
 
-    # Запуск фонового процесса
-    asyncio.create_task(broadcast_task(bot, call.from_user.id, message_to_copy, user_ids))
-    
     await call.message.edit_text(
         text("admin:mailing:started"),
+        reply_markup=_stop_kb(),
         parse_mode="HTML"
     )
+
+    # Запуск фонового процесса
+    run_background_task(broadcast_task(bot, job), name="admin_mailing")
+
     await state.clear()
     await call.answer()
 
 
+@safe_handler("Админ-панель: остановка рассылки")
+async def stop_mailing(call: types.CallbackQuery) -> None:
+    """
+    Обработчик остановки текущей рассылки.
+
+    Сразу освобождает слот рассылки; если задача еще выполняется,
+    она завершится на следующей странице получателей.
+    """
+    job = await _load_job()
+    if not job:
+        await call.answer(text("admin:mailing:not_running"), show_alert=True)
+        return
+
+    logger.info(f"Админ {call.from_user.id} остановил рассылку на курсоре {job['cursor']}")
+    if job.get("id"):
+        await redis_client.set(MAILING_CANCEL_KEY, job["id"], ex=MAILING_CANCEL_TTL)
+    await redis_client.delete(MAILING_JOB_KEY)
+
+    await call.message.edit_text(
+        text("admin:mailing:stopped").format(job["processed"], job["total"]),
+        parse_mode="HTML",
+    )
+    await call.answer()
+
+
 def get_router() -> Router:
     """
     Создает и настраивает роутер для модуля рассылки.
@@ -159,4 +395,5 @@ def get_router() -> Router:
     router = Router(name="AdminMailing")
     router.message.register(get_mailing_post, AdminMailing.post)
     router.callback_query.register(confirm_mailing, F.data == "AdminMail|confirm", AdminMailing.confirm)
+    router.callback_query.register(stop_mailing, F.data == "AdminMail|stop")
     return router
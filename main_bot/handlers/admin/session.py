@@ -24,6 +24,7 @@ from aiogram.fsm.context import FSMContext
 
 from instance_bot import bot as main_bot_obj
 from main_bot.database.db import db
+from main_bot.database.mt_client.model import MtClient
 from main_bot.keyboards import keyboards
 from main_bot.states.admin import Session
 from main_bot.utils.lang.language import text
@@ -40,6 +41,13 @@ logger = logging.getLogger(__name__)
 
 apps: Dict[str, SessionManager] = {}
 
+# Параметры сканирования неучтенных сессий
+SCAN_CONCURRENCY = 5  # Одновременно проверяемых сессий
+SCAN_SESSION_TIMEOUT = 60  # Секунд на проверку одной сессии
+SCAN_DELAY_MIN = 5  # Пауза между проверками в одном воркере (секунды)
+SCAN_DELAY_MAX = 15
+SCAN_PROGRESS_INTERVAL = 5  # Секунд между обновлениями прогресса
+
 
 @safe_handler("Admin Session Choice")
 async def choice(call: types.CallbackQuery, state: FSMContext) -> None:
@@ -579,9 +587,56 @@ async def get_code(message: types.Message, state: FSMContext) -> None:
     )
 
 
+async def _probe_session(session_path: Path) -> dict:
+    """
+    Проверяет файл сессии: авторизацию и базовое состояние аккаунта.
+
+    Аргументы:
+        session_path (Path): Путь к файлу сессии.
+
+    Возвращает:
+        dict: {"me": ..., "health": ...} или {"error": "..."}.
+    """
+    async with SessionManager(session_path) as manager:
+        if not manager.client:
+            return {"error": "не удалось подключиться"}
+
+        me = await manager.me()
+        if not me:
+            return {"error": "не удалось получить данные"}
+
+        # При импорте активно не проверяем на спам, только базовый health check
+        health = await manager.health_check(check_spam=False)
+        return {"me": me, "health": health}
+
+
+async def _edit_scan_progress(
+    user_id: int, message_id: Optional[int], done: int, total: int, found: int
+) -> None:
+    """Обновляет сообщение с прогрессом сканирования."""
+    if not message_id:
+        return
+
+    try:
+        await main_bot_obj.edit_message_text(
+            text=f"🔍 Сканирование сессий: {done}/{total}\nНайдено рабочих: {found}",
+            chat_id=user_id,
+            message_id=message_id,
+        )
+    except TelegramBadRequest:
+        pass  # message is not modified / сообщение удалено
+    except Exception as e:
+        logger.debug(f"Не удалось обновить прогресс сканирования: {e}")
+
+
 async def scan_orphaned_sessions_task(user_id: int):
     """
-    Фоновая задача сканирования orphaned сессий с рандомными задержками.
+    Фоновая задача сканирования orphaned сессий.
+
+    Сессии проверяются пулом из SCAN_CONCURRENCY воркеров с рандомными
+    задержками между проверками внутри воркера; зависшая проверка
+    прерывается по SCAN_SESSION_TIMEOUT. Найденные клиенты добавляются
+    в БД одной пачкой, прогресс обновляется в отдельном сообщении.
     """
     logger.info(f"Начато фоновое сканирование сессий для пользователя {user_id}")
     
@@ -602,76 +657,124 @@ async def scan_orphaned_sessions_task(user_id: int):
         await main_bot_obj.send_message(user_id, "✅ Фоновое сканирование завершено: неучтённых сессий не найдено.")
         return
 
-    added_sessions = []
-    errors = []
-    total_db_count = len(internal) + len(external) + len(unassigned)
+    total = len(orphaned)
+    progress_message_id = None
+    try:
+        message = await main_bot_obj.send_message(
+            user_id, f"🔍 Сканирование сессий: 0/{total}\nНайдено рабочих: 0"
+        )
+        progress_message_id = message.message_id
+    except Exception as e:
+        logger.debug(f"Не удалось отправить прогресс сканирования {user_id}: {e}")
 
-    for i, session_path in enumerate(orphaned):
-        # Рандомная задержка перед проверкой следующей сессии (кроме первой)
-        if i > 0:
-            delay = random.uniform(5, 15)  # 5-15 секунд
-            logger.info(f"Пауза {delay:.2f}с перед сканированием {session_path.name}")
-            await asyncio.sleep(delay)
+    queue: asyncio.Queue[Path] = asyncio.Queue()
+    for session_path in orphaned:
+        queue.put_nowait(session_path)
 
-        try:
-            async with SessionManager(session_path) as manager:
-                if not manager.client:
-                    errors.append(f"❌ {session_path.name}: не удалось подключиться")
-                    continue
-
-                me = await manager.me()
-                if not me:
-                    errors.append(f"❌ {session_path.name}: не удалось получить данные")
-                    continue
-
-                username = me.username if me else None
-                pool_type = determine_pool_type(
-                    username,
-                    me.first_name if me else None,
-                    me.last_name if me else None,
+    probed = []  # (session_path, результат _probe_session)
+    errors = []
+    last_progress = time.monotonic()
+
+    async def worker() -> None:
+        nonlocal last_progress
+        first = True
+        while not queue.empty():
+            session_path = queue.get_nowait()
+
+            # Рандомная задержка перед проверкой следующей сессии (кроме первой)
+            if not first:
+                delay = random.uniform(SCAN_DELAY_MIN, SCAN_DELAY_MAX)
+                logger.info(f"Пауза {delay:.2f}с перед сканированием {session_path.name}")
+                await asyncio.sleep(delay)
+            first = False
+
+            try:
+                result = await asyncio.wait_for(
+                    _probe_session(session_path), timeout=SCAN_SESSION_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                result = {"error": f"таймаут {SCAN_SESSION_TIMEOUT}с"}
+            except Exception as e:
+                logger.error(f"Ошибка фонового сканирования {session_path.name}: {e}")
+                result = {"error": str(e)[:50]}
+
+            if "error" in result:
+                errors.append(f"❌ {session_path.name}: {result['error']}")
+            else:
+                probed.append((session_path, result))
+                logger.info(f"Фоновое сканирование: {session_path.name} — сессия рабочая")
+
+            if time.monotonic() - last_progress >= SCAN_PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
+                await _edit_scan_progress(
+                    user_id, progress_message_id, len(probed) + len(errors), total, len(probed)
                 )
 
-                alias = generate_client_alias(me, pool_type, total_db_count + len(added_sessions))
+    await asyncio.gather(*(worker() for _ in range(min(SCAN_CONCURRENCY, total))))
 
-                new_client = await db.mt_client.create_mt_client(
-                    alias=alias,
-                    pool_type=pool_type,
-                    session_path=str(session_path),
-                    status="NEW",
-                    is_active=False,
-                )
+    # Добавляем найденных клиентов одной пачкой
+    added_sessions = []
+    rows = []
+    total_db_count = len(internal) + len(external) + len(unassigned)
+    current_time = int(time.time())
 
-                # При импорте активно не проверяем на спам, только базовый health check
-                health = await manager.health_check(check_spam=False)
-                current_time = int(time.time())
-                updates = {"last_self_check_at": current_time}
-
-                if health["ok"]:
-                    updates["status"] = "ACTIVE"
-                    updates["is_active"] = True
-                    status_icon = "✅"
-                else:
-                    updates["status"] = "DISABLED"
-                    updates["is_active"] = False
-                    updates["last_error_code"] = health.get("error_code", "UNKNOWN")
-                    updates["last_error_at"] = current_time
-                    status_icon = "❌"
-
-                await db.mt_client.update_mt_client(client_id=new_client.id, **updates)
-
-                added_sessions.append(
-                    {
-                        "alias": alias,
-                        "pool": pool_type,
-                        "status": status_icon,
-                        "username": username or "N/A",
-                    }
-                )
-                logger.info(f"Фоновое добавление: {session_path.name} -> {pool_type}")
+    for session_path, result in probed:
+        me, health = result["me"], result["health"]
+        username = me.username
+        pool_type = determine_pool_type(username, me.first_name, me.last_name)
+        alias = generate_client_alias(me, pool_type, total_db_count + len(rows))
+        alias = alias[:MtClient.__table__.c.alias.type.length]
+
+        row = {
+            "alias": alias,
+            "pool_type": pool_type,
+            "session_path": str(session_path),
+            "last_self_check_at": current_time,
+            "last_error_code": None,
+            "last_error_at": None,
+        }
+        if health["ok"]:
+            row.update(status="ACTIVE", is_active=True)
+            status_icon = "✅"
+        else:
+            row.update(
+                status="DISABLED",
+                is_active=False,
+                last_error_code=health.get("error_code", "UNKNOWN"),
+                last_error_at=current_time,
+            )
+            status_icon = "❌"
+
+        rows.append(row)
+        added_sessions.append(
+            {
+                "alias": alias,
+                "pool": pool_type,
+                "status": status_icon,
+                "username": username or "N/A",
+            }
+        )
 
+    if rows:
+        try:
+            await db.mt_client.create_mt_clients(rows)
+            logger.info(f"Фоновое сканирование: добавлено {len(rows)} клиентов")
         except Exception as e:
-            logger.error(f"Ошибка фонового сканирования {session_path.name}: {e}")
-            errors.append(f"❌ {session_path.name}: {str(e)[:50]}")
+            # Одна некорректная строка не должна отменять всю пачку
+            logger.error(f"Ошибка пакетного добавления клиентов, добавляем по одному: {e}")
+            inserted = []
+            for row, added in zip(rows, added_sessions):
+                try:
+                    await db.mt_client.create_mt_client(**row)
+                    inserted.append(added)
+                except Exception as row_error:
+                    logger.error(f"Ошибка добавления {row['session_path']}: {row_error}")
+                    errors.append(
+                        f"❌ {Path(row['session_path']).name}: {str(row_error)[:50]}"
+                    )
+            added_sessions = inserted
+
+    await _edit_scan_progress(user_id, progress_message_id, total, total, len(probed))
 
     # Формируем финальный отчет
     report = "🏁 Фоновое сканирование завершено!\n\n"
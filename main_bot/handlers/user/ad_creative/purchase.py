@@ -10,18 +10,21 @@
 - Статистику по закупам
 """
 
+import asyncio
 import copy
 import logging
 import re
 import time
 from datetime import datetime, timezone
 from io import BytesIO
+from typing import Any
 
 
 from aiogram import Router, F, types
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery, BufferedInputFile
 from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
 
 from main_bot.database.db import db
 from main_bot.database.db_types import AdPricingType, AdTargetType
@@ -696,6 +699,107 @@ async def show_global_stats_menu(call: CallbackQuery) -> None:
     )
 
 
+def _global_stats_row(
+    p: Any, stats_batch: dict, creative_names: dict[int, str]
+) -> tuple:
+    """
+    Формирует строку общего отчета по закупу.
+
+    Аргументы:
+        p (AdPurchase): Закуп.
+        stats_batch (dict): Статистика {purchase_id: {"leads", "subs"}}.
+        creative_names (dict[int, str]): Названия креативов.
+
+    Возвращает:
+        tuple: Значения ячеек строки.
+    """
+    creative_name = creative_names.get(p.creative_id, f"Unknown #{p.creative_id}")
+
+    # Статистика (ПАКЕТНО)
+    p_stats = stats_batch.get(p.id, {"leads": 0, "subs": 0})
+    leads_count = p_stats["leads"]
+    subs_count = p_stats["subs"]
+
+    # Цены
+    fix_price = p.price_value if p.pricing_type.value == "FIXED" else 0
+    cpl_price = p.price_value if p.pricing_type.value == "CPL" else 0
+    cps_price = p.price_value if p.pricing_type.value == "CPS" else 0
+
+    # Расчеты
+    total_spend = 0
+    if p.pricing_type.value == "FIXED":
+        total_spend = p.price_value
+    elif p.pricing_type.value == "CPL":
+        total_spend = p.price_value * leads_count
+    elif p.pricing_type.value == "CPS":
+        total_spend = p.price_value * subs_count
+
+    cost_per_sub = (total_spend / subs_count) if subs_count > 0 else 0
+    cost_per_lead = (total_spend / leads_count) if leads_count > 0 else 0
+
+    # Форматирование даты
+    date_str = datetime.fromtimestamp(p.created_timestamp).strftime("%d.%m.%Y %H:%M")
+
+    return (
+        date_str,
+        creative_name,
+        p.comment or "",
+        fix_price,
+        cpl_price,
+        cps_price,
+        leads_count,
+        subs_count,
+        round(cost_per_sub, 2),
+        round(cost_per_lead, 2),
+    )
+
+
+def _build_global_stats_workbook(rows: list[tuple]) -> BytesIO:
+    """
+    Собирает Excel общего отчета в режиме write_only (строки не держатся в памяти).
+
+    Выполняется в executor.
+
+    Аргументы:
+        rows (list[tuple]): Строки отчета.
+
+    Возвращает:
+        BytesIO: Файл отчета.
+    """
+    headers = [
+        text("excel:date"),
+        text("excel:creative_name"),
+        text("excel:comment"),
+        text("excel:fix_price"),
+        text("excel:cpl_price"),
+        text("excel:cps_price"),
+        text("excel:leads_count"),
+        text("excel:subs_count"),
+        text("excel:cost_per_sub"),
+        text("excel:cost_per_lead"),
+    ]
+
+    # Автоширина: в write_only ширины задаются до записи строк
+    widths = [len(str(h)) for h in headers]
+    for row in rows:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(str(value)))
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Statistics")
+    for i, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = width + 2
+
+    ws.append(headers)
+    for row in rows:
+        ws.append(row)
+
+    file_stream = BytesIO()
+    wb.save(file_stream)
+    file_stream.seek(0)
+    return file_stream
+
+
 @router.callback_query(F.data.startswith("AdPurchase|global_stats_period|"))
 @safe_handler(
     "Закуп: генерация Excel (все закупы)"
@@ -740,93 +844,18 @@ async def show_global_stats(call: CallbackQuery) -> None:
 
     await call.answer(text("ad_purchase:global_stats:generating"))
 
-    # ОПТИМИЗАЦИЯ: Пакетное получение статистики для всех закупов
+    # ОПТИМИЗАЦИЯ: Пакетное получение статистики и названий креативов
     purchase_ids = [p.id for p in purchases]
     stats_batch = await db.ad_purchase.get_purchases_stats_batch(purchase_ids)
+    creative_names = await db.ad_creative.get_creative_names(
+        [p.creative_id for p in purchases]
+    )
 
-    # 2. Создание Excel
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Statistics"
-
-    # Заголовки
-    headers = [
-        text("excel:date"),
-        text("excel:creative_name"),
-        text("excel:comment"),
-        text("excel:fix_price"),
-        text("excel:cpl_price"),
-        text("excel:cps_price"),
-        text("excel:leads_count"),
-        text("excel:subs_count"),
-        text("excel:cost_per_sub"),
-        text("excel:cost_per_lead"),
-    ]
-    ws.append(headers)
-
-    for p in purchases:
-        # Получение деталей
-        creative = await db.ad_creative.get_creative(p.creative_id)
-        creative_name = creative.name if creative else f"Unknown #{p.creative_id}"
-
-        # Статистика (ПАКЕТНО)
-        p_stats = stats_batch.get(p.id, {"leads": 0, "subs": 0})
-        leads_count = p_stats["leads"]
-        subs_count = p_stats["subs"]
-
-        # Цены
-        fix_price = p.price_value if p.pricing_type.value == "FIXED" else 0
-        cpl_price = p.price_value if p.pricing_type.value == "CPL" else 0
-        cps_price = p.price_value if p.pricing_type.value == "CPS" else 0
-
-        # Расчеты
-        total_spend = 0
-        if p.pricing_type.value == "FIXED":
-            total_spend = p.price_value
-        elif p.pricing_type.value == "CPL":
-            total_spend = p.price_value * leads_count
-        elif p.pricing_type.value == "CPS":
-            total_spend = p.price_value * subs_count
-
-        cost_per_sub = (total_spend / subs_count) if subs_count > 0 else 0
-        cost_per_lead = (total_spend / leads_count) if leads_count > 0 else 0
-
-        # Форматирование даты
-        date_str = datetime.fromtimestamp(p.created_timestamp).strftime(
-            "%d.%m.%Y %H:%M"
-        )
-
-        row = [
-            date_str,
-            creative_name,
-            p.comment or "",
-            fix_price,
-            cpl_price,
-            cps_price,
-            leads_count,
-            subs_count,
-            round(cost_per_sub, 2),
-            round(cost_per_lead, 2),
-        ]
-        ws.append(row)
-
-    # Автоширина
-    for column in ws.columns:
-        max_length = 0
-        column = [cell for cell in column]
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except Exception:
-                pass
-        adjusted_width = max_length + 2
-        ws.column_dimensions[column[0].column_letter].width = adjusted_width
+    rows = [_global_stats_row(p, stats_batch, creative_names) for p in purchases]
 
-    # Сохранение в память
-    file_stream = BytesIO()
-    wb.save(file_stream)
-    file_stream.seek(0)
+    # 2. Создание Excel (в отдельном потоке, чтобы не блокировать event loop)
+    loop = asyncio.get_running_loop()
+    file_stream = await loop.run_in_executor(None, _build_global_stats_workbook, rows)
 
     input_file = BufferedInputFile(
         file_stream.getvalue(), filename=f"stats_{period_name}.xlsx"
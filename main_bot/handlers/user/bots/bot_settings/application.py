@@ -7,12 +7,10 @@
 - Ручное одобрение заявок (всех, части, по ссылке)
 """
 
-import asyncio
 import logging
-from datetime import datetime, timezone
 from typing import Any, List, Dict, Union
 
-from aiogram import types, F, Router
+from aiogram import types, F, Router, Bot
 from aiogram.fsm.context import FSMContext
 
 from main_bot.database.channel_bot_settings.model import ChannelBotSetting
@@ -23,7 +21,7 @@ from main_bot.handlers.user.bots.bot_settings.menu import (
     show_channel_setting,
 )
 from main_bot.states.user import Application
-from main_bot.utils.bot_manager import BotManager
+from main_bot.utils.bulk_actions import ACTION_APPROVE, start_bulk_action
 from main_bot.utils.lang.language import text
 from main_bot.keyboards import keyboards
 from utils.error_handler import safe_handler
@@ -164,34 +162,30 @@ async def choice_application_delay(
 
 
 async def approve(
-    user_bot: UserBot, chat_id: int, users: List[Any], db_obj: Any
-) -> None:
+    bot: Bot, owner_id: int, user_bot: UserBot, chat_id: int, users: List[Any]
+) -> bool:
     """
-    Асинхронная задача одобрения заявок.
+    Запускает фоновое одобрение заявок (см. main_bot.utils.bulk_actions).
 
     Аргументы:
+        bot (Bot): Основной бот (для прогресса владельцу).
+        owner_id (int): ID владельца бота.
         user_bot (UserBot): Бот, от имени которого одобряем.
         chat_id (int): ID канала.
         users (List[Any]): Список пользователей для одобрения.
-        db_obj (Database): Объект базы данных бота.
+
+    Возвращает:
+        bool: False, если одобрение в этом канале уже выполняется.
     """
     user_bot = ensure_bot_obj(user_bot)
-    async with BotManager(token=user_bot.token) as manager:
-        if not manager.bot:
-            return
-
-        for user in users:
-            try:
-                await manager.bot.approve_chat_join_request(chat_id, user.id)
-                await db_obj.update_user(
-                    user.id, is_approved=True, time_approved=int(datetime.now(timezone.utc).timestamp())
-                )
-            except Exception as e:
-                logger.error(
-                    f"Ошибка при одобрении заявки пользователя {user.id}: {e}", exc_info=True
-                )
-
-            await asyncio.sleep(0.25)
+    return await start_bulk_action(
+        bot=bot,
+        owner_id=owner_id,
+        bot_id=user_bot.id,
+        chat_id=chat_id,
+        action=ACTION_APPROVE,
+        user_ids=[user.id for user in users],
+    )
 
 
 @safe_handler(
@@ -228,9 +222,11 @@ async def choice_manual_approve(
     await state.update_data(not_approve_users_count=len(not_approve_users))
 
     if temp[1] == "all":
-        asyncio.create_task(
-            approve(db_bot, data.get("chat_id"), not_approve_users, db_obj)
-        )
+        if not await approve(
+            call.bot, call.from_user.id, db_bot, data.get("chat_id"), not_approve_users
+        ):
+            await call.answer(text("bulk_action:already_running"), show_alert=True)
+            return
         logger.info("Пользователь %s запустил массовое одобрение (%s чел) в канале %s", call.from_user.id, len(not_approve_users), data.get("chat_id"))
         await call.answer(text("welcome:started_approving"), show_alert=True)
 
@@ -323,7 +319,11 @@ async def get_count_part(
         chat_id=data.get("chat_id"), limit=count
     )
 
-    asyncio.create_task(approve(db_bot, data.get("chat_id"), not_approve_users, db_obj))
+    if not await approve(
+        message.bot, message.from_user.id, db_bot, data.get("chat_id"), not_approve_users
+    ):
+        await message.answer(text("bulk_action:already_running"))
+        return
     logger.info("Пользователь %s запустил частичное одобрение (%s чел) в канале %s", message.from_user.id, len(not_approve_users), data.get("chat_id"))
 
     await message.answer(text("welcome:started_approving"))
@@ -366,7 +366,11 @@ async def choice_invite_url(
         chat_id=channel_settings.id, invite_url=temp[1]
     )
 
-    asyncio.create_task(approve(db_bot, data.get("chat_id"), not_approve_users, db_obj))
+    if not await approve(
+        call.bot, call.from_user.id, db_bot, data.get("chat_id"), not_approve_users
+    ):
+        await call.answer(text("bulk_action:already_running"), show_alert=True)
+        return
     logger.info("Пользователь %s запустил одобрение по ссылке %s (%s чел) в канале %s", call.from_user.id, temp[1], len(not_approve_users), channel_settings.id)
     await call.answer(text("welcome:started_approving"), show_alert=True)
 
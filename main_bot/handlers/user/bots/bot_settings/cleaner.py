@@ -7,19 +7,18 @@
 - Асинхронный процесс очистки
 """
 
-import asyncio
 import logging
 from datetime import datetime
 from typing import Any, List, Dict, Union
 
-from aiogram import types, F, Router
+from aiogram import types, F, Router, Bot
 from aiogram.fsm.context import FSMContext
 
 from hello_bot.database.db import Database
 from main_bot.database.user_bot.model import UserBot
 from main_bot.handlers.user.bots.bot_settings.menu import show_channel_setting
 from main_bot.states.user import Cleaner
-from main_bot.utils.bot_manager import BotManager
+from main_bot.utils.bulk_actions import ACTION_BAN, ACTION_DECLINE, start_bulk_action
 from main_bot.utils.lang.language import text
 from main_bot.keyboards import keyboards
 from utils.error_handler import safe_handler
@@ -98,32 +97,36 @@ async def back(call: types.CallbackQuery, state: FSMContext) -> None:
 
 
 async def start_clean(
-    user_bot: UserBot, cleaner_type: str, users: List[Any], chat_id: int
-) -> None:
+    bot: Bot,
+    owner_id: int,
+    user_bot: UserBot,
+    cleaner_type: str,
+    users: List[Any],
+    chat_id: int,
+) -> bool:
     """
-    Асинхронная задача очистки пользователей.
+    Запускает фоновую очистку пользователей (см. main_bot.utils.bulk_actions).
 
     Аргументы:
+        bot (Bot): Основной бот (для прогресса владельцу).
+        owner_id (int): ID владельца бота.
         user_bot (UserBot): Бот, выполняющий очистку.
         cleaner_type (str): Тип очистки ('ban' или отклонение заявок).
         users (List[Any]): Список пользователей для очистки.
         chat_id (int): ID канала.
+
+    Возвращает:
+        bool: False, если такая очистка в этом канале уже выполняется.
     """
     user_bot = ensure_bot_obj(user_bot)
-    async with BotManager(user_bot.token) as manager:
-        if not manager.bot:
-            return
-
-        for user in users:
-            try:
-                if cleaner_type == "ban":
-                    await manager.bot.ban_chat_member(chat_id, user.id)
-                else:
-                    await manager.bot.decline_chat_join_request(chat_id, user.id)
-            except Exception as e:
-                logger.error(f"Ошибка при очистке пользователя: {e}", exc_info=True)
-
-            await asyncio.sleep(0.25)
+    return await start_bulk_action(
+        bot=bot,
+        owner_id=owner_id,
+        bot_id=user_bot.id,
+        chat_id=chat_id,
+        action=ACTION_BAN if cleaner_type == "ban" else ACTION_DECLINE,
+        user_ids=[user.id for user in users],
+    )
 
 
 @safe_handler(
@@ -158,16 +161,19 @@ async def get_period(
         participant=data.get("cleaner_type") == "ban",
     )
 
-    asyncio.create_task(
-        start_clean(
-            data.get("user_bot"), data.get("cleaner_type"), users, data.get("chat_id")
-        )
+    started = await start_clean(
+        message.bot,
+        message.from_user.id,
+        data.get("user_bot"),
+        data.get("cleaner_type"),
+        users,
+        data.get("chat_id"),
     )
 
     await state.clear()
     await state.update_data(**data)
 
-    await message.answer("Начал очистку")
+    await message.answer("Начал очистку" if started else text("bulk_action:already_running"))
     await show_channel_setting(message, db_obj, state)
 
 
@@ -105,6 +105,8 @@ async def start_clone(
     """
     Выполняет клонирование выбранных настроек из текущего канала в целевые.
 
+    Все настройки копируются одной транзакцией (см. clone_channel_settings).
+
     Аргументы:
         settings (List[int]): Список ID выбранных настроек.
         chat_ids (List[int]): Список ID целевых каналов.
@@ -113,70 +115,15 @@ async def start_clone(
     channel = await db.channel_bot_settings.get_channel_bot_setting(
         chat_id=current_chat
     )
-    hello_messages = await db.channel_bot_hello.get_hello_messages(chat_id=channel.id)
-    captcha_list = await db.channel_bot_captcha.get_all_captcha(chat_id=channel.id)
-
-    # application / bye
-    if 0 in settings or 3 in settings:
-        kwargs = {}
-
-        if 0 in settings:
-            kwargs["auto_approve"] = channel.auto_approve
-            kwargs["delay_approve"] = channel.delay_approve
-        if 3 in settings:
-            kwargs["bye"] = channel.bye
-
-        for chat_id in chat_ids:
-            await db.channel_bot_settings.update_channel_bot_setting(
-                chat_id=chat_id, **kwargs
-            )
 
-    # captcha
-    # captcha
-    if 1 in settings:
-        for chat_id in chat_ids:
-            captcha_list_remove = await db.channel_bot_captcha.get_all_captcha(
-                chat_id=chat_id
-            )
-            for captcha_remove in captcha_list_remove:
-                await db.channel_bot_captcha.delete_captcha(captcha_remove.id)
-
-            new_active_captcha_id = None
-
-            for captcha in captcha_list:
-                new_captcha = await db.channel_bot_captcha.add_channel_captcha(
-                    return_obj=True,
-                    channel_id=chat_id,
-                    message=captcha.message,
-                    delay=captcha.delay,
-                    start_delay=captcha.start_delay,
-                )
-                if channel.active_captcha_id == captcha.id:
-                    new_active_captcha_id = new_captcha.id
-
-            await db.channel_bot_settings.update_channel_bot_setting(
-                chat_id=chat_id, active_captcha_id=new_active_captcha_id
-            )
-
-    # hello
-    if 2 in settings:
-        for chat_id in chat_ids:
-            hello_messages_remove = await db.channel_bot_hello.get_hello_messages(
-                chat_id=chat_id
-            )
-            for hello_remove in hello_messages_remove:
-                await db.channel_bot_hello.delete_hello_message(hello_remove.id)
-
-            for hello in hello_messages:
-                max_id = await db.channel_bot_hello.get_next_id_hello_message()
-                await db.channel_bot_hello.add_channel_hello_message(
-                    id=max_id,
-                    channel_id=chat_id,
-                    message=hello.message,
-                    delay=hello.delay,
-                    text_with_name=hello.text_with_name,
-                    is_active=hello.is_active,
-                )
+    await db.channel_bot_settings.clone_channel_settings(
+        source=channel,
+        target_ids=chat_ids,
+        application=0 in settings,
+        captcha=1 in settings,
+        hello=2 in settings,
+        bye=3 in settings,
+    )
 
 
 @safe_handler("Боты: клонирование — выбор настроек")
@@ -345,9 +345,7 @@ async def get_message(message: types.Message, state: FSMContext) -> None:
         )
 
     else:
-        next_id = await db.channel_bot_hello.get_next_id_hello_message()
-        await db.channel_bot_hello.add_channel_hello_message(
-            id=next_id,
+        next_id = await db.channel_bot_hello.add_channel_hello_message(
             channel_id=data.get("chat_id"),
             message=message_options.model_dump(),
         )
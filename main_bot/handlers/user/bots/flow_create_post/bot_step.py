@@ -20,7 +20,7 @@ from main_bot.handlers.user.menu import start_bots
 from main_bot.handlers.user.bots.menu import show_create_post
 from main_bot.utils.lang.language import text
 from main_bot.keyboards import keyboards
-from main_bot.utils.user_settings import get_user_view_mode, set_user_view_mode
+from main_bot.utils.user_settings import get_user_view_mode, toggle_user_view_mode
 from utils.error_handler import safe_handler
 
 logger = logging.getLogger(__name__)
@@ -93,12 +93,9 @@ async def choice_bots(call: types.CallbackQuery, state: FSMContext) -> None:
 
     channels = await db.channel_bot_settings.get_bot_channels(call.from_user.id)
 
-    view_mode = await get_user_view_mode(call.from_user.id)
-
-    # Переключение вида
+    # Переключение вида — один атомарный запрос к Redis
     if temp[1] == "switch_view":
-        view_mode = "channels" if view_mode == "folders" else "folders"
-        await set_user_view_mode(call.from_user.id, view_mode)
+        view_mode = await toggle_user_view_mode(call.from_user.id)
 
         # Сбрасываем пагинацию и вход в папку
         if view_mode == "channels":
@@ -110,6 +107,8 @@ async def choice_bots(call: types.CallbackQuery, state: FSMContext) -> None:
             temp[2] = "0"
         else:
             temp.append("0")
+    else:
+        view_mode = await get_user_view_mode(call.from_user.id)
 
     # Определяем что показывать
     if current_folder_id:
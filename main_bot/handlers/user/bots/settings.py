@@ -7,13 +7,11 @@
 - Импорт/экспорт базы пользователей бота
 """
 
-import csv
 import logging
 import os
 import time
 from typing import Any, Dict, Union
 
-import pandas as pd
 from aiogram import types, F, Router
 from aiogram.fsm.context import FSMContext
 
@@ -26,6 +24,7 @@ from main_bot.handlers.user.bots.menu import show_settings
 from main_bot.keyboards import keyboards
 from main_bot.utils.bot_manager import BotManager
 from main_bot.utils.lang.language import text
+from main_bot.utils.subscribers_io import export_user_ids, iter_import_chunks
 from utils.error_handler import safe_handler
 
 logger = logging.getLogger(__name__)
@@ -507,22 +506,6 @@ async def get_import_file(message: types.Message, state: FSMContext) -> None:
     await message.bot.download(message.document.file_id, filepath)
 
     try:
-        users = []
-        if extension == "txt":
-            with open(filepath, "r") as file:
-                users = [
-                    {"id": int(i.strip())}
-                    for i in file.readlines()
-                    if i.strip().isdigit()
-                ]
-        elif extension == "csv":
-            with open(filepath, "r", encoding="utf-8-sig") as file:
-                read = csv.reader(file)
-                users = [{"id": int(i[0])} for i in read if i and i[0].isdigit()]
-        else:
-            file_data = pd.read_excel(filepath, header=None)
-            users = [{"id": i} for i in file_data[0] if isinstance(i, int)]
-
         data = await state.get_data()
         user_bot_data = data.get("user_bot")
         if not user_bot_data:
@@ -534,19 +517,21 @@ async def get_import_file(message: types.Message, state: FSMContext) -> None:
 
         # Устанавливаем флаги активности и одобрения для импортированных пользователей
         current_time = int(time.time())
-        for user in users:
-            user.update(
-                {
-                    "is_active": True,
-                    "is_approved": True,
-                    "walk_captcha": True,
-                    "time_approved": current_time,
-                    "time_walk_captcha": current_time,
-                }
+        async for user_ids in iter_import_chunks(filepath, extension):
+            await other_db.many_insert_user(
+                [
+                    {
+                        "id": user_id,
+                        "is_active": True,
+                        "is_approved": True,
+                        "walk_captcha": True,
+                        "time_approved": current_time,
+                        "time_walk_captcha": current_time,
+                    }
+                    for user_id in user_ids
+                ]
             )
 
-        await other_db.many_insert_user(users)
-
     except Exception as e:
         logger.error(f"Ошибка импорта файла: {e}")
         await message.answer(text("error_import"))
@@ -594,8 +579,8 @@ async def choice_export(call: types.CallbackQuery, state: FSMContext) -> None:
     other_db = Database()
     other_db.schema = ensure_bot_obj(user_bot_data).schema
 
-    users = await other_db.get_dump_users()
-    if not users:
+    count_users = await other_db.get_count_users()
+    if not count_users.get("total"):
         await call.answer(text("error_empty_users"))
         return
 
@@ -606,37 +591,19 @@ async def choice_export(call: types.CallbackQuery, state: FSMContext) -> None:
     filepath = "main_bot/utils/temp/export_users_{}_{}.{}".format(
         ensure_bot_obj(data.get("user_bot")).username,
         int(time.time()),
-        temp[1] if temp[1] == "txt" else "csv",
+        temp[1],
     )
 
     try:
         # Create directory if not exists
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-        if temp[1] in ["xlsx", "csv"]:
-            # Для xlsx сначала пишем csv, потом конвертируем
-            with open(filepath, "w", encoding="utf-8", newline="") as export_file:
-                writer = csv.writer(export_file)
-                writer.writerow(["id"])
-
-                for user in users:
-                    writer.writerow([str(user.id)])
-
-            if temp[1] == "xlsx":
-                csv_file = pd.read_csv(filepath)
-                # Меняем расширение на xlsx
-                filepath_xlsx = filepath.replace(".csv", ".xlsx")
-                csv_file.to_excel(filepath_xlsx, index=False, header=True)
-                os.remove(filepath)  # Remove csv
-                filepath = filepath_xlsx
-        else:
-            with open(filepath, "w", encoding="utf-8") as export_file:
-                for user in users:
-                    export_file.write(str(user.id) + "\n")
+        await export_user_ids(other_db, filepath, temp[1])
 
     except Exception as e:
         logger.error(f"Ошибка экспорта пользователей: {e}")
         await call.message.answer(text("error_export"))
+        if os.path.exists(filepath):
+            os.remove(filepath)
         return
 
     try:
@@ -26,7 +26,7 @@ from main_bot.utils.message_utils import reload_main_menu
 from utils.error_handler import safe_handler
 from main_bot.utils.novastat import novastat_service
 from main_bot.utils.report_signature import get_report_signatures
-from main_bot.utils.user_settings import get_user_view_mode, set_user_view_mode
+from main_bot.utils.user_settings import get_user_view_mode, toggle_user_view_mode
 
 logger = logging.getLogger(__name__)
 
@@ -1049,12 +1049,9 @@ async def novastat_choice_channels(
     chosen: list = data.get("chosen", [])
     current_folder_id = data.get("current_folder_id")
 
-    view_mode = await get_user_view_mode(call.from_user.id)
-
-    # Переключение вида
+    # Переключение вида — один атомарный запрос к Redis
     if temp[1] == "switch_view":
-        view_mode = "channels" if view_mode == "folders" else "folders"
-        await set_user_view_mode(call.from_user.id, view_mode)
+        view_mode = await toggle_user_view_mode(call.from_user.id)
         if view_mode == "channels":
             await state.update_data(current_folder_id=None)
             current_folder_id = None
@@ -1065,6 +1062,8 @@ async def novastat_choice_channels(
             temp[2] = "0"
         else:
             temp.append("0")
+    else:
+        view_mode = await get_user_view_mode(call.from_user.id)
 
     # Determine objects
     if view_mode == "channels":
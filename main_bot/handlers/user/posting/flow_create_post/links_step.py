@@ -12,8 +12,10 @@ from aiogram import types
 from aiogram.fsm.context import FSMContext
 
 from main_bot.database.db import db
+from main_bot.utils import reactions
 from main_bot.utils.lang.language import text
-from main_bot.utils.schemas import Hide, React
+from main_bot.utils.membership_cache import is_channel_member
+from main_bot.utils.schemas import Hide
 from main_bot.keyboards import keyboards
 from main_bot.keyboards.posting import ensure_obj
 from main_bot.states.user import AddHide
@@ -202,6 +204,7 @@ async def click_hide(call: types.CallbackQuery):
     Обработка клика на hide кнопку в опубликованном посте.
 
     Показывает разный текст для подписчиков и неподписчиков канала.
+    Статус подписки берется из кэша (main_bot.utils.membership_cache).
 
     Args:
         call: Callback query от hide кнопки
@@ -215,8 +218,8 @@ async def click_hide(call: types.CallbackQuery):
     if not published_post:
         return
 
-    user = await call.bot.get_chat_member(
-        chat_id=call.message.sender_chat.id, user_id=call.from_user.id
+    is_member = await is_channel_member(
+        call.bot, chat_id=call.message.sender_chat.id, user_id=call.from_user.id
     )
 
     hide_model = Hide(hide=published_post.hide)
@@ -225,7 +228,7 @@ async def click_hide(call: types.CallbackQuery):
             continue
 
         await call.answer(
-            row_hide.for_member if user.status != "left" else row_hide.not_member,
+            row_hide.for_member if is_member else row_hide.not_member,
             show_alert=True,
         )
 
@@ -237,7 +240,8 @@ async def click_react(call: types.CallbackQuery):
     """
     Обработка клика на реакцию в опубликованном посте.
 
-    Добавляет/убирает пользователя из списка реакций и обновляет кнопки.
+    Голос учитывается атомарно в Redis, обновление кнопок со счетчиками
+    откладывается и схлопывается (см. main_bot.utils.reactions).
 
     Args:
         call: Callback query от кнопки реакции
@@ -248,28 +252,24 @@ async def click_react(call: types.CallbackQuery):
         chat_id=call.message.sender_chat.id,
         message_id=call.message.message_id,
     )
-    if not published_post:
+    if not published_post or not published_post.reaction:
         return
 
-    react_model = React(rows=published_post.reaction.get("rows"))
-    for react_row in react_model.rows:
-        for react in react_row.reactions:
-            # Если пользователь уже нажал на эту реакцию - показываем галочку
-            if call.from_user.id in react.users and int(temp[1]) == react.id:
-                return await call.answer("✅")
-
-            # Убираем пользователя из других реакций
-            if call.from_user.id in react.users:
-                react.users.remove(call.from_user.id)
-
-            # Добавляем пользователя к выбранной реакции
-            if int(temp[1]) == react.id:
-                react.users.append(call.from_user.id)
-
-    # Обновляем пост в БД
-    post = await db.published_post.update_published_post(
-        post_id=published_post.id, return_obj=True, reaction=react_model.model_dump()
+    changed = await reactions.vote(
+        post_id=published_post.id,
+        chat_id=published_post.chat_id,
+        message_id=published_post.message_id,
+        reaction=published_post.reaction,
+        user_id=call.from_user.id,
+        reaction_id=int(temp[1]),
     )
 
-    # Обновляем кнопки с новыми счетчиками
-    await call.message.edit_reply_markup(reply_markup=keyboards.post_kb(post=post))
+    # Повторный клик по уже выбранной реакции - показываем галочку
+    await call.answer("✅" if not changed else None)
+    if changed:
+        await reactions.schedule_markup_refresh(
+            bot=call.bot,
+            post_id=published_post.id,
+            chat_id=published_post.chat_id,
+            message_id=published_post.message_id,
+        )
@@ -12,6 +12,7 @@ from aiogram import types
 from aiogram.fsm.context import FSMContext
 
 from main_bot.database.db import db
+from main_bot.utils.reactions import reset_reactions
 from main_bot.handlers.user.posting.menu import show_create_post
 from main_bot.utils.message_utils import answer_post
 from main_bot.utils.lang.language import text
@@ -505,10 +506,21 @@ async def get_value(message: types.Message, state: FSMContext):
     if data.get("is_published"):
         post_id_val = post_data.get("post_id") or post_data.get("id")
         await db.published_post.update_published_posts_by_post_id(post_id=post_id_val, **kwargs)
+
+        # Новая раскладка реакций: старые голоса из Redis не должны к ней применяться
+        if param == "reaction":
+            for published in await db.published_post.get_published_posts_by_post_id(post_id_val):
+                await reset_reactions(published.chat_id, published.message_id)
+
         post = await db.published_post.get_published_post_by_id(post_data.get("id"))
     else:
         post = await db.post.update_post(post_id=post_data.get("id"), return_obj=True, **kwargs)
 
+    # Ссылка на локальный медиафайл (старый файл освободится для GC)
+    if post:
+        parent_post_id = post.post_id if data.get("is_published") else post.id
+        await MediaManager.link_post_media(parent_post_id, media_value)
+
     # 6. Синхронизация live-сообщений
     if data.get("is_published") and post:
         from main_bot.utils.backup_utils import update_live_messages
@@ -86,7 +86,8 @@ async def accept(call: types.CallbackQuery, state: FSMContext):
                 year=cal_year,
                 month=cal_month,
                 selected_date=sel_date,
-                user_id=call.from_user.id
+                user_id=call.from_user.id,
+                recent_times=data.get("recent_times"),
             )
             
             return await call.message.edit_text(
@@ -28,7 +28,7 @@ from utils.error_handler import safe_handler
 
 # Импорты для расширенного календаря
 from main_bot.keyboards.calendar import InlineCalendar
-from main_bot.utils.recent_times import save_recent_time
+from main_bot.utils.recent_times import get_recent_times, save_recent_time
 
 logger = logging.getLogger(__name__)
 
@@ -149,18 +149,22 @@ async def finish_params(call: types.CallbackQuery, state: FSMContext):
     # Выбор времени отправки (Календарь)
     if temp[1] == "send_time":
         now = datetime.now()
+        # Последние времена читаются один раз и хранятся в FSM на время работы с календарем
+        recent_times = await get_recent_times(call.from_user.id)
         await state.update_data(
             calendar_year=now.year,
             calendar_month=now.month,
             selected_date=now.strftime("%d.%m.%Y"),
             selected_time="--:--",
+            recent_times=recent_times,
         )
         
         kb = await InlineCalendar.create(
             year=now.year,
             month=now.month,
             selected_date=now,
-            user_id=call.from_user.id
+            user_id=call.from_user.id,
+            recent_times=recent_times,
         )
         
         await call.message.edit_text(
@@ -408,7 +412,10 @@ async def get_send_time(message: types.Message, state: FSMContext):
         return await message.answer(text("error_time_value"))
 
     # Сохраняем время в Redis как последнее использованное
-    await save_recent_time(message.from_user.id, date.strftime("%H:%M"))
+    recent_times = await save_recent_time(message.from_user.id, date.strftime("%H:%M"))
+    # None — ошибка Redis: кэш в FSM не трогаем, календарь прочитает Redis сам
+    if recent_times is not None:
+        await state.update_data(recent_times=recent_times)
 
     data = await state.get_data()
     is_edit: bool = data.get("is_edit")
@@ -528,7 +535,8 @@ async def choice_publication_date(call: types.CallbackQuery, state: FSMContext):
             year=year,
             month=month,
             selected_date=selected_date,
-            user_id=call.from_user.id
+            user_id=call.from_user.id,
+            recent_times=data.get("recent_times"),
         )
         
         try:
@@ -548,7 +556,8 @@ async def choice_publication_date(call: types.CallbackQuery, state: FSMContext):
     kb = await InlineCalendar.create(
         year=year,
         month=month,
-        user_id=call.from_user.id
+        user_id=call.from_user.id,
+        recent_times=data.get("recent_times"),
     )
     
     try:
@@ -597,7 +606,10 @@ async def choice_publication_time(call: types.CallbackQuery, state: FSMContext):
         return await call.answer(text("error_format"), show_alert=True)
 
     # Сохраняем время в Redis как последнее использованное
-    await save_recent_time(call.from_user.id, selected_time)
+    recent_times = await save_recent_time(call.from_user.id, selected_time)
+    # None — ошибка Redis: кэш в FSM не трогаем, календарь прочитает Redis сам
+    if recent_times is not None:
+        await state.update_data(recent_times=recent_times)
 
     # Форматируем данные для шага подтверждения
     weekday = text("weekdays")[str(date.weekday())]
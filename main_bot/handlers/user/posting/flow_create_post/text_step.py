@@ -144,6 +144,7 @@ async def get_message(message: types.Message, state: FSMContext):
             message_options=message_options.model_dump(),
             buttons=buttons_str,
         )
+        await MediaManager.link_post_media(post.id, media_value)
         logger.info(
             "Пользователь %s: создан пост ID=%s для %d каналов",
             message.from_user.id,
@@ -6,7 +6,7 @@ import logging
 from aiogram import types, Router, F
 from aiogram.fsm.context import FSMContext
 
-from main_bot.database.db import db
+from main_bot.database.user.model import User
 from main_bot.keyboards import keyboards
 from main_bot.utils.lang.language import text
 from utils.error_handler import safe_handler
@@ -17,14 +17,13 @@ logger = logging.getLogger(__name__)
 @safe_handler(
     "Баланс: выбор действия"
 )  # Безопасная обёртка: логирование + перехват ошибок без падения бота
-async def choice(call: types.CallbackQuery, state: FSMContext):
+async def choice(call: types.CallbackQuery, state: FSMContext, user: User):
     """Маршрутизатор меню баланса."""
     temp = call.data.split("|")
     await call.message.delete()
 
     if temp[1] == "back":
         # Возврат в меню подписки с информацией о балансе
-        user = await db.user.get_user(user_id=call.from_user.id)
         await call.message.answer(
             text("balance_text").format(user.balance),
             reply_markup=keyboards.subscription_menu(),
@@ -4,7 +4,7 @@
 
 from aiogram import Router, F, types
 
-from main_bot.database.db import db
+from main_bot.database.user.model import User
 from main_bot.keyboards import keyboards
 from main_bot.utils.lang.language import text
 from utils.error_handler import safe_handler
@@ -23,13 +23,12 @@ async def show_info_menu(call: types.CallbackQuery):
 @safe_handler(
     "Инфо: выбор раздела"
 )  # Безопасная обёртка: логирование + перехват ошибок без падения бота
-async def choice(call: types.CallbackQuery):
+async def choice(call: types.CallbackQuery, user: User):
     """Обработчик выбора в меню информации"""
     temp = call.data.split("|")
 
     if temp[1] == "back":
         # Возврат в меню подписки с информацией о балансе
-        user = await db.user.get_user(user_id=call.from_user.id)
         await call.message.delete()
         return await call.message.answer(
             text("balance_text").format(user.balance),
@@ -91,7 +91,7 @@ async def cancel(call: types.CallbackQuery, state: FSMContext):
 @safe_handler(
     "Оплата: назад к методам"
 )  # Безопасная обёртка: логирование + перехват ошибок без падения бота
-async def back_to_method(call: types.CallbackQuery, state: FSMContext):
+async def back_to_method(call: types.CallbackQuery, state: FSMContext, user: User):
     """Возврат к выбору способа оплаты с экрана ожидания"""
     try:
         await call.answer()
@@ -133,7 +133,6 @@ async def back_to_method(call: types.CallbackQuery, state: FSMContext):
     await state.clear()
     await safe_delete(call.message)
 
-    user = await db.user.get_user(user_id=call.from_user.id)
     await call.message.answer(
         text("balance_text").format(user.balance),
         reply_markup=keyboards.subscription_menu(),
@@ -4,22 +4,21 @@
 
 from aiogram import types, Router, F
 
+from main_bot.database.user.model import User
 from utils.error_handler import safe_handler
 
 
 @safe_handler("Рефералы: выбор")
-async def choice(call: types.CallbackQuery):
+async def choice(call: types.CallbackQuery, user: User):
     """Обработчик действий в меню реферальной программы."""
     temp = call.data.split("|")
     await call.message.delete()
 
     if temp[1] == "back":
         # Возврат в меню подписки с информацией о балансе
-        from main_bot.database.db import db
         from main_bot.keyboards import keyboards
         from main_bot.utils.lang.language import text
 
-        user = await db.user.get_user(user_id=call.from_user.id)
         await call.message.answer(
             text("balance_text").format(user.balance),
             reply_markup=keyboards.subscription_menu(),
@@ -12,7 +12,7 @@ from main_bot.database.channel.model import Channel
 from main_bot.keyboards import keyboards
 from main_bot.utils.lang.language import text
 from utils.error_handler import safe_handler
-from main_bot.utils.user_settings import get_user_view_mode, set_user_view_mode
+from main_bot.utils.user_settings import get_user_view_mode, toggle_user_view_mode
 from main_bot.utils.currency import get_usd_rate
 
 logger = logging.getLogger(__name__)
@@ -241,15 +241,14 @@ async def choice_object_subscribe(
 
     # ПЕРЕКЛЮЧЕНИЕ ВИДА
     if temp[1] == "switch_view":
-        current_view = await get_user_view_mode(call.from_user.id)
-        new_view = "channels" if current_view == "folders" else "folders"
-        await set_user_view_mode(call.from_user.id, new_view)
+        # Один атомарный запрос к Redis
+        view_mode = await toggle_user_view_mode(call.from_user.id)
         # Сброс навигации по папкам
         await state.update_data(current_folder_id=None)
 
         # Перезагрузка происходит ниже
-
-    view_mode = await get_user_view_mode(call.from_user.id)
+    else:
+        view_mode = await get_user_view_mode(call.from_user.id)
     current_folder_id = data.get("current_folder_id")
 
     # Загрузка объектов
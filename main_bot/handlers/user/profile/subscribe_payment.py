@@ -367,7 +367,7 @@ async def align_subscribe(call: types.CallbackQuery, state: FSMContext, user: Us
         )
 
     if temp[1] == "cancel":
-        return await back_to_method(call, state)
+        return await back_to_method(call, state, user)
 
     if temp[1] == "align":
         logger.info(
@@ -509,7 +509,7 @@ async def cancel(call: types.CallbackQuery, state: FSMContext, user: User):
 @safe_handler(
     "Подписка: назад к методам"
 )  # Безопасная обёртка: логирование + перехват ошибок без падения бота
-async def back_to_method(call: types.CallbackQuery, state: FSMContext):
+async def back_to_method(call: types.CallbackQuery, state: FSMContext, user: User):
     """Возврат к выбору способа оплаты с экрана ожидания"""
     logger.info(f"back_to_method вызван: {call.data}")
     try:
@@ -517,7 +517,6 @@ async def back_to_method(call: types.CallbackQuery, state: FSMContext):
     except Exception:
         pass
 
-    user = await db.user.get_user(user_id=call.from_user.id)
     data = await state.get_data()
 
     # Отменяем платеж Platega если он был создан
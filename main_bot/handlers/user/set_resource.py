@@ -27,6 +27,7 @@ from main_bot.utils.schedulers import (
     update_channel_stats,
 )
 from main_bot.utils.lang.language import text
+from main_bot.utils.membership_cache import invalidate_membership
 from utils.error_handler import safe_handler
 
 logger = logging.getLogger(__name__)
@@ -220,7 +221,8 @@ async def set_admin(call: types.ChatMemberUpdated) -> None:
 
     chat_id = call.chat.id
 
-    chat_id = call.chat.id
+    # Статус участника изменился - сбрасываем кэш членства для hide-кнопок
+    await invalidate_membership(chat_id, call.new_chat_member.user.id)
 
     # Отслеживание подписки для рекламных закупок, если пользователь вступил по ссылке
     if call.new_chat_member.status == ChatMemberStatus.MEMBER:
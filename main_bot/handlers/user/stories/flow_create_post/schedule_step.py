@@ -22,7 +22,7 @@ from main_bot.utils.schemas import StoryOptions
 from main_bot.keyboards import keyboards
 from main_bot.states.user import Stories
 from utils.error_handler import safe_handler
-from main_bot.utils.user_settings import get_user_view_mode, set_user_view_mode
+from main_bot.utils.user_settings import get_user_view_mode, toggle_user_view_mode
 
 logger = logging.getLogger(__name__)
 
@@ -119,12 +119,9 @@ async def choice_channels(call: types.CallbackQuery, state: FSMContext):
     chosen_folders: list = data.get("chosen_folders")
     current_folder_id = data.get("current_folder_id")
 
-    view_mode = await get_user_view_mode(call.from_user.id)
-
-    # Переключение вида
+    # Переключение вида — один атомарный запрос к Redis
     if temp[1] == "switch_view":
-        view_mode = "channels" if view_mode == "folders" else "folders"
-        await set_user_view_mode(call.from_user.id, view_mode)
+        view_mode = await toggle_user_view_mode(call.from_user.id)
 
         # Сбрасываем пагинацию и вход в папку
         if view_mode == "channels":
@@ -136,6 +133,8 @@ async def choice_channels(call: types.CallbackQuery, state: FSMContext):
             temp[2] = "0"
         else:
             temp.append("0")
+    else:
+        view_mode = await get_user_view_mode(call.from_user.id)
 
     # Определяем что показывать
     if current_folder_id:
@@ -218,14 +218,21 @@ class InlineAdmin(InlineKeyboardBuilder):
         return kb.as_markup()
 
     @classmethod
-    def admin_channels_list(cls, channels: list, offset: int, total: int):
+    def admin_channels_list(
+        cls,
+        channels: list,
+        page: int = 1,
+        prev_cursor: str | None = None,
+        next_cursor: str | None = None,
+    ):
         """
         Клавиатура со списком каналов и пагинацией.
 
         Аргументы:
             channels (list): Список каналов для текущей страницы.
-            offset (int): Смещение для пагинации.
-            total (int): Общее количество каналов.
+            page (int): Номер текущей страницы.
+            prev_cursor (str | None): Курсор предыдущей страницы.
+            next_cursor (str | None): Курсор следующей страницы.
         """
         kb = cls()
 
@@ -243,19 +250,20 @@ class InlineAdmin(InlineKeyboardBuilder):
         nav_buttons = []
 
         # Кнопка "Назад" (предыдущая страница)
-        if offset > 0:
+        if prev_cursor:
             nav_buttons.append(
                 InlineKeyboardButton(
                     text="⬅️ Назад",
-                    callback_data=f"AdminChannels|list|{max(0, offset - 10)}",
+                    callback_data=f"AdminChannels|list|{prev_cursor}|{page - 1}",
                 )
             )
 
         # Кнопка "Вперед" (следующая страница)
-        if offset + 10 < total:
+        if next_cursor:
             nav_buttons.append(
                 InlineKeyboardButton(
-                    text="Вперед ➡️", callback_data=f"AdminChannels|list|{offset + 10}"
+                    text="Вперед ➡️",
+                    callback_data=f"AdminChannels|list|{next_cursor}|{page + 1}",
                 )
             )
 
@@ -312,7 +320,13 @@ class InlineAdmin(InlineKeyboardBuilder):
         return kb.as_markup()
 
     @classmethod
-    def admin_bots_list(cls, bots: list, offset: int, total: int):
+    def admin_bots_list(
+        cls,
+        bots: list,
+        page: int = 1,
+        prev_cursor: str | None = None,
+        next_cursor: str | None = None,
+    ):
         """Список всех ботов системы."""
         kb = cls()
         for bot in bots:
@@ -323,16 +337,16 @@ class InlineAdmin(InlineKeyboardBuilder):
         kb.adjust(1)
 
         nav = []
-        if offset > 0:
+        if prev_cursor:
             nav.append(
                 InlineKeyboardButton(
-                    text="⬅️", callback_data=f"AdminBots|list|{max(0, offset-10)}"
+                    text="⬅️", callback_data=f"AdminBots|list|{prev_cursor}|{page - 1}"
                 )
             )
-        if offset + 10 < total:
+        if next_cursor:
             nav.append(
                 InlineKeyboardButton(
-                    text="➡️", callback_data=f"AdminBots|list|{offset+10}"
+                    text="➡️", callback_data=f"AdminBots|list|{next_cursor}|{page + 1}"
                 )
             )
         if nav:
@@ -350,7 +364,13 @@ class InlineAdmin(InlineKeyboardBuilder):
         return kb.as_markup()
 
     @classmethod
-    def admin_users_list(cls, users: list, offset: int, total: int):
+    def admin_users_list(
+        cls,
+        users: list,
+        page: int = 1,
+        prev_cursor: str | None = None,
+        next_cursor: str | None = None,
+    ):
         """Список всех пользователей."""
         kb = cls()
         for user in users:
@@ -361,16 +381,16 @@ class InlineAdmin(InlineKeyboardBuilder):
         kb.adjust(1)
 
         nav = []
-        if offset > 0:
+        if prev_cursor:
             nav.append(
                 InlineKeyboardButton(
-                    text="⬅️", callback_data=f"AdminUsers|list|{max(0, offset-10)}"
+                    text="⬅️", callback_data=f"AdminUsers|list|{prev_cursor}|{page - 1}"
                 )
             )
-        if offset + 10 < total:
+        if next_cursor:
             nav.append(
                 InlineKeyboardButton(
-                    text="➡️", callback_data=f"AdminUsers|list|{offset+10}"
+                    text="➡️", callback_data=f"AdminUsers|list|{next_cursor}|{page + 1}"
                 )
             )
         if nav:
@@ -1,9 +1,15 @@
 """
 Модуль инлайн-календаря для выбора даты и времени планирования поста.
+
+Статическая часть клавиатуры (шапка, дни недели, сетка месяца, пресеты
+времени) строится один раз на (год, месяц, префикс) и кэшируется;
+при каждом показе поверх шаблона подставляются только отметки
+текущего/выбранного дня и последние времена пользователя.
 """
 
 import calendar
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
@@ -12,6 +18,78 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from main_bot.utils.lang.language import text
 from main_bot.utils.recent_times import get_recent_times
 
+# Количество закэшированных шаблонов месяцев
+CALENDAR_TEMPLATE_CACHE_SIZE = 128
+
+WEEKDAYS = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]
+TIME_PRESETS = ["09:00", "12:00", "15:00", "18:00", "21:00"]
+
+# Строки шаблона до сетки дней: шапка и дни недели
+_GRID_OFFSET = 2
+
+
+def _time_button(t: str) -> InlineKeyboardButton:
+    """Кнопка быстрого выбора времени."""
+    return InlineKeyboardButton(text=f"⏰ {t}", callback_data=f"ChoicePublicationTime|{t}")
+
+
+def _day_button(year: int, month: int, day: int, data: str, label: str) -> InlineKeyboardButton:
+    """Кнопка дня месяца."""
+    return InlineKeyboardButton(
+        text=label, callback_data=f"{data}|select_day|{year}|{month}|{day}"
+    )
+
+
+@lru_cache(maxsize=CALENDAR_TEMPLATE_CACHE_SIZE)
+def _month_template(
+    year: int, month: int, data: str
+) -> tuple[tuple[InlineKeyboardButton, ...], ...]:
+    """
+    Шаблон клавиатуры месяца без отметок дней.
+
+    Кнопки шаблона общие для всех клавиатур и не должны изменяться.
+
+    Аргументы:
+        year (int): Год.
+        month (int): Месяц.
+        data (str): Префикс callback_data.
+
+    Возвращает:
+        tuple: Ряды кнопок: шапка, дни недели, недели месяца, пресеты времени.
+    """
+    empty = InlineKeyboardButton(text=" ", callback_data="ignore")
+    month_name = text("other_month").get(str(month))
+
+    rows = [
+        (
+            InlineKeyboardButton(
+                text="⬅️", callback_data=f"{data}|prev_month|{year}|{month}"
+            ),
+            InlineKeyboardButton(text=f"📅 {month_name} {year}", callback_data="ignore"),
+            InlineKeyboardButton(
+                text="➡️", callback_data=f"{data}|next_month|{year}|{month}"
+            ),
+        ),
+        tuple(InlineKeyboardButton(text=d, callback_data="ignore") for d in WEEKDAYS),
+    ]
+
+    for week in calendar.monthcalendar(year, month):
+        rows.append(
+            tuple(
+                _day_button(year, month, day, data, str(day)) if day else empty
+                for day in week
+            )
+        )
+
+    rows.append(tuple(_time_button(t) for t in TIME_PRESETS))
+    return tuple(rows)
+
+
+def _day_cell(year: int, month: int, day: int) -> tuple[int, int]:
+    """Позиция дня (ряд, колонка) в шаблоне месяца."""
+    index = calendar.monthrange(year, month)[0] + day - 1
+    return _GRID_OFFSET + index // 7, index % 7
+
 
 class InlineCalendar(InlineKeyboardBuilder):
     """
@@ -26,6 +104,7 @@ class InlineCalendar(InlineKeyboardBuilder):
         selected_date: datetime = None,
         user_id: int = None,
         data: str = "ChoicePublicationDate",
+        recent_times: Optional[List[str]] = None,
     ) -> InlineKeyboardMarkup:
         """
         Создает клавиатуру календаря.
@@ -36,6 +115,7 @@ class InlineCalendar(InlineKeyboardBuilder):
             selected_date: Уже выбранная дата.
             user_id: ID пользователя для получения последних времен.
             data: Префикс для callback_data.
+            recent_times: Последние времена из FSM (без запроса к Redis).
 
         Returns:
             InlineKeyboardMarkup
@@ -48,87 +128,32 @@ class InlineCalendar(InlineKeyboardBuilder):
         if selected_date is None:
             selected_date = now
 
-        kb = cls()
+        rows = [list(row) for row in _month_template(year, month, data)]
 
-        # 1. Шапка: Месяц и Год
-        month_name = text("other_month").get(str(month))
-        kb.row(
-            InlineKeyboardButton(
-                text="⬅️", callback_data=f"{data}|prev_month|{year}|{month}"
-            ),
-            InlineKeyboardButton(
-                text=f"📅 {month_name} {year}", callback_data="ignore"
-            ),
-            InlineKeyboardButton(
-                text="➡️", callback_data=f"{data}|next_month|{year}|{month}"
-            ),
-        )
+        # Отметки текущего и выбранного дня (выбранный приоритетнее)
+        marks = {}
+        if year == now.year and month == now.month:
+            marks[now.day] = f"•{now.day}•"
+        if year == selected_date.year and month == selected_date.month:
+            marks[selected_date.day] = f"🔸{selected_date.day}🔸"
 
-        # 2. Дни недели
-        weekdays = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]
-        kb.row(*[InlineKeyboardButton(text=d, callback_data="ignore") for d in weekdays])
-
-        # 3. Сетка календаря
-        month_calendar = calendar.monthcalendar(year, month)
-        for week in month_calendar:
-            days = []
-            for day in week:
-                if day == 0:
-                    days.append(InlineKeyboardButton(text=" ", callback_data="ignore"))
-                else:
-                    # Помечаем текущий/выбранный день
-                    is_today = (
-                        year == now.year and month == now.month and day == now.day
-                    )
-                    is_selected = (
-                        year == selected_date.year
-                        and month == selected_date.month
-                        and day == selected_date.day
-                    )
-
-                    btn_text = str(day)
-                    if is_selected:
-                        btn_text = f"🔸{day}🔸"
-                    elif is_today:
-                        btn_text = f"•{day}•"
-
-                    days.append(
-                        InlineKeyboardButton(
-                            text=btn_text,
-                            callback_data=f"{data}|select_day|{year}|{month}|{day}",
-                        )
-                    )
-            kb.row(*days)
-
-        # 4. Выбор времени (Рекомендуемые пресеты)
-        time_presets = ["09:00", "12:00", "15:00", "18:00", "21:00"]
-        kb.row(
-            *[
-                InlineKeyboardButton(
-                    text=f"⏰ {t}", callback_data=f"ChoicePublicationTime|{t}"
-                )
-                for t in time_presets
-            ]
-        )
+        for day, label in marks.items():
+            row, col = _day_cell(year, month, day)
+            rows[row][col] = _day_button(year, month, day, data, label)
 
-        # 5. Последние 3 времени из Redis
-        if user_id:
+        # Последние 3 времени (из FSM, иначе из Redis)
+        if recent_times is None and user_id:
             recent_times = await get_recent_times(user_id)
-            if recent_times:
-                kb.row(
-                    *[
-                        InlineKeyboardButton(
-                            text=f"⏰ {t}", callback_data=f"ChoicePublicationTime|{t}"
-                        )
-                        for t in recent_times
-                    ]
-                )
+        if recent_times:
+            rows.append([_time_button(t) for t in recent_times])
 
-        # 6. Кнопка Назад
-        kb.row(
-            InlineKeyboardButton(
-                text=text("back:button"), callback_data="FinishPostParams|cancel"
-            )
+        # Кнопка Назад
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=text("back:button"), callback_data="FinishPostParams|cancel"
+                )
+            ]
         )
 
-        return kb.as_markup()
+        return InlineKeyboardMarkup(inline_keyboard=rows)
@@ -4,7 +4,9 @@
 """
 
 from datetime import datetime
-from aiogram.types import InlineKeyboardButton
+from functools import lru_cache
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from main_bot.database.bot_post.model import BotPost
@@ -17,6 +19,48 @@ from main_bot.keyboards.base import _parse_button
 from config import Config
 
 
+# Количество закэшированных шаблонов кнопок постов
+POST_KB_CACHE_SIZE = 1024
+# Максимум кнопок в ряду (как в InlineKeyboardBuilder)
+ROW_MAX_WIDTH = 8
+
+
+def _split_row(buttons: list) -> list[list]:
+    """Делит ряд на ряды не длиннее ROW_MAX_WIDTH (как InlineKeyboardBuilder.row)."""
+    return [buttons[i : i + ROW_MAX_WIDTH] for i in range(0, len(buttons), ROW_MAX_WIDTH)]
+
+
+@lru_cache(maxsize=POST_KB_CACHE_SIZE)
+def _url_button_rows(buttons: str) -> tuple[tuple[InlineKeyboardButton, ...], ...]:
+    """
+    Шаблон рядов URL-кнопок поста (строка формата "текст — ссылка|...").
+
+    Один пост публикуется во многие каналы и перерисовывается при каждом
+    обновлении реакций, поэтому разбор строки кэшируется. Кнопки шаблона
+    общие для всех клавиатур и не должны изменяться.
+    """
+    rows = []
+    for row in buttons.split("\n"):
+        row_buttons = []
+        for button in row.split("|"):
+            btn_text, btn_url = _parse_button(button)
+            if btn_url:
+                row_buttons.append(InlineKeyboardButton(text=btn_text, url=btn_url))
+        rows.extend(tuple(r) for r in _split_row(row_buttons))
+    return tuple(rows)
+
+
+@lru_cache(maxsize=POST_KB_CACHE_SIZE)
+def _hide_button_rows(
+    hide: tuple[tuple[int, str], ...],
+) -> tuple[tuple[InlineKeyboardButton, ...], ...]:
+    """Шаблон рядов hide-кнопок опубликованного поста по (id, название)."""
+    return tuple(
+        (InlineKeyboardButton(text=name, callback_data=f"ClickHide|{hide_id}"),)
+        for hide_id, name in hide
+    )
+
+
 class ObjWrapper:
     """
     Обёртка для словаря, позволяющая обращаться к ключам как к атрибутам.
@@ -145,14 +189,8 @@ class InlinePosting(InlineKeyboardBuilder):
                 )
 
         if post.buttons:
-            for row in post.buttons.split("\n"):
-                buttons = []
-                for button in row.split("|"):
-                    btn_text, btn_url = _parse_button(button)
-                    if btn_url:
-                        buttons.append(InlineKeyboardButton(text=btn_text, url=btn_url))
-                if buttons:
-                    kb.row(*buttons)
+            for row in _url_button_rows(post.buttons):
+                kb.row(*row)
 
         if reactions:
             for row in reactions.rows:
@@ -277,22 +315,18 @@ class InlinePosting(InlineKeyboardBuilder):
         """
         Генерация клавиатуры, прикрепляемой к самому посту (кнопки-ссылки, скрытие, реакции).
 
+        URL- и hide-кнопки берутся из кэшированных шаблонов, заново
+        создаются только кнопки реакций со счетчиками.
+
         Аргументы:
             post: Объект поста.
             is_bot: Если True, игнорирует скрытие и реакции (для бот-постов).
         """
         post = ensure_obj(post)
-        kb = cls()
+        rows = []
 
         if post.buttons:
-            for row in post.buttons.split("\n"):
-                buttons = []
-                for button in row.split("|"):
-                    btn_text, btn_url = _parse_button(button)
-                    if btn_url:
-                        buttons.append(InlineKeyboardButton(text=btn_text, url=btn_url))
-                if buttons:
-                    kb.row(*buttons)
+            rows.extend(list(row) for row in _url_button_rows(post.buttons))
 
         if not is_bot:
             hide = Hide(hide=post.hide) if post.hide else None
@@ -300,13 +334,12 @@ class InlinePosting(InlineKeyboardBuilder):
             reactions = React(rows=reaction_data.get("rows")) if reaction_data else None
 
             if hide:
-                for row_hide in hide.hide:
-                    kb.row(
-                        InlineKeyboardButton(
-                            text=row_hide.button_name,
-                            callback_data=f"ClickHide|{row_hide.id}",
-                        )
+                rows.extend(
+                    list(row)
+                    for row in _hide_button_rows(
+                        tuple((row_hide.id, row_hide.button_name) for row_hide in hide.hide)
                     )
+                )
 
             if reactions:
                 for row in reactions.rows:
@@ -322,9 +355,9 @@ class InlinePosting(InlineKeyboardBuilder):
                                 callback_data=f"ClickReact|{react.id}",
                             )
                         )
-                    kb.row(*buttons)
+                    rows.extend(_split_row(buttons))
 
-        return kb.as_markup()
+        return InlineKeyboardMarkup(inline_keyboard=rows)
 
     @classmethod
     def param_cancel(cls, param: str, data: str = "ParamCancel", post=None):
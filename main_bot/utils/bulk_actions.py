@@ -0,0 +1,356 @@
+"""
+Массовые действия с участниками каналов через ботов-помощников.
+
+Общий движок для одобрения заявок (application.py) и очистки
+подписчиков/заявок (cleaner.py):
+- запросы к Bot API идут через AdaptiveTokenBucket (скорость снижается
+  после RetryAfter) с ограниченной параллельностью;
+- успешные одобрения сбрасываются в БД пачками одним UPDATE;
+- ID пользователей и курсор хранятся в Redis, поэтому после перезапуска
+  задача продолжается с последней сохраненной пачки;
+- владелец бота видит прогресс в отдельном сообщении.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from hello_bot.database.db import Database
+from main_bot.database.db import db
+from main_bot.utils.background import run_background_task
+from main_bot.utils.bot_manager import BotManager
+from main_bot.utils.lang.language import text
+from main_bot.utils.rate_limiter import AdaptiveTokenBucket
+from main_bot.utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Типы действий
+ACTION_APPROVE = "approve"
+ACTION_DECLINE = "decline"
+ACTION_BAN = "ban"
+
+# Параметры выполнения
+BULK_RATE_PER_SECOND = 20  # Начальная (максимальная) скорость запросов
+BULK_CONCURRENCY = 5  # Одновременных запросов к Bot API
+BULK_FLUSH_SIZE = 300  # Размер пачки: сброс в БД и сохранение курсора
+BULK_MAX_RETRIES = 3  # Повторы одного пользователя после RetryAfter
+BULK_MAX_FAILURES = 3  # Сбоев задачи подряд до ее отмены
+BULK_RETRY_DELAY = 30  # Секунд до перезапуска после сбоя (удваивается)
+PROGRESS_UPDATE_INTERVAL = 5  # Секунд между обновлениями прогресса
+
+# Ключи Redis
+BULK_JOBS_KEY = "bulk_actions:jobs"
+BULK_JOB_KEY = "bulk_actions:job:{}"
+BULK_IDS_KEY = "bulk_actions:ids:{}"
+
+# Ошибки, означающие, что действие уже выполнено (например, до перезапуска)
+_ALREADY_DONE_ERRORS = ("HIDE_REQUESTER_MISSING", "USER_ALREADY_PARTICIPANT")
+
+
+def _job_id(action: str, bot_id: int, chat_id: int) -> str:
+    """Идентификатор задачи: одна задача на действие, бота и канал."""
+    return f"{action}:{bot_id}:{chat_id}"
+
+
+async def _save_job(job: dict) -> None:
+    """Сохраняет курсор и счетчики задачи в Redis."""
+    await redis_client.set(BULK_JOB_KEY.format(job["id"]), json.dumps(job))
+
+
+async def _delete_job(job_id: str) -> None:
+    """Удаляет состояние завершенной задачи."""
+    await redis_client.delete(BULK_JOB_KEY.format(job_id), BULK_IDS_KEY.format(job_id))
+    await redis_client.srem(BULK_JOBS_KEY, job_id)
+
+
+async def _abort_job(bot: Bot, job: dict, reason: str) -> None:
+    """Удаляет задачу, которую невозможно выполнить, и уведомляет владельца."""
+    await _delete_job(job["id"])
+    logger.warning(f"Задача {job['id']} отменена на курсоре {job['cursor']}: {reason}")
+
+    try:
+        await bot.send_message(
+            job["owner_id"],
+            text("bulk_action:aborted").format(
+                text(f"bulk_action:{job['action']}"),
+                job["cursor"],
+                job["total"],
+                job["success"],
+                job["errors"],
+            ),
+            parse_mode="HTML",
+        )
+    except Exception as e:
+        logger.error(f"Не удалось уведомить владельца {job['owner_id']}: {e}")
+
+
+async def _update_progress(bot: Bot, job: dict) -> None:
+    """Обновляет сообщение с прогрессом у владельца бота."""
+    if not job.get("progress_message_id"):
+        return
+
+    try:
+        await bot.edit_message_text(
+            text=text("bulk_action:progress").format(
+                text(f"bulk_action:{job['action']}"),
+                job["cursor"],
+                job["total"],
+                job["success"],
+                job["errors"],
+            ),
+            chat_id=job["owner_id"],
+            message_id=job["progress_message_id"],
+            parse_mode="HTML",
+        )
+    except TelegramBadRequest:
+        pass  # message is not modified / сообщение удалено
+    except Exception as e:
+        logger.debug(f"Не удалось обновить прогресс задачи {job['id']}: {e}")
+
+
+async def _apply(bot: Bot, action: str, chat_id: int, user_id: int) -> None:
+    """Выполняет действие над одним пользователем."""
+    if action == ACTION_APPROVE:
+        await bot.approve_chat_join_request(chat_id, user_id)
+    elif action == ACTION_DECLINE:
+        await bot.decline_chat_join_request(chat_id, user_id)
+    else:
+        await bot.ban_chat_member(chat_id, user_id)
+
+
+async def _process_user(
+    bot: Bot,
+    bucket: AdaptiveTokenBucket,
+    semaphore: asyncio.Semaphore,
+    job: dict,
+    user_id: int,
+) -> bool:
+    """
+    Выполняет действие над пользователем с учетом лимитов.
+
+    Возвращает:
+        bool: True, если действие выполнено (или уже было выполнено ранее).
+    """
+    async with semaphore:
+        for _ in range(BULK_MAX_RETRIES):
+            await bucket.acquire()
+            try:
+                await _apply(bot, job["action"], job["chat_id"], user_id)
+                bucket.on_success()
+                return True
+            except TelegramRetryAfter as e:
+                logger.warning(f"Задача {job['id']}: RetryAfter {e.retry_after}с")
+                bucket.on_retry_after(e.retry_after)
+            except TelegramBadRequest as e:
+                if any(err in str(e) for err in _ALREADY_DONE_ERRORS):
+                    return True
+                logger.debug(f"Задача {job['id']}: ошибка для {user_id}: {e}")
+                return False
+            except Exception as e:
+                logger.error(
+                    f"Задача {job['id']}: ошибка для пользователя {user_id}: {e}",
+                    exc_info=True,
+                )
+                return False
+
+    return False
+
+
+async def _run_job(bot: Bot, job: dict) -> None:
+    """
+    Выполняет задачу пачками начиная с сохраненного курсора.
+
+    Аргументы:
+        bot (Bot): Основной бот (для сообщений владельцу).
+        job (dict): Состояние задачи.
+    """
+    user_bot = await db.user_bot.get_bot_by_id(job["bot_id"])
+    if not user_bot:
+        await _abort_job(bot, job, f"бот {job['bot_id']} не найден")
+        return
+
+    db_obj = Database()
+    db_obj.schema = user_bot.schema
+
+    ids_key = BULK_IDS_KEY.format(job["id"])
+    bucket = AdaptiveTokenBucket(max_rate=BULK_RATE_PER_SECOND)
+    semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+    last_progress = 0.0
+
+    failed = False
+    async with BotManager(token=user_bot.token) as manager:
+        if not manager.bot:
+            # Токен отозван или недействителен — задачу не выполнить
+            await _abort_job(bot, job, "бот-помощник недоступен")
+            return
+
+        try:
+            while job["cursor"] < job["total"]:
+                raw_ids = await redis_client.lrange(
+                    ids_key, job["cursor"], job["cursor"] + BULK_FLUSH_SIZE - 1
+                )
+                if not raw_ids:
+                    break
+
+                user_ids = [int(uid) for uid in raw_ids]
+                results = await asyncio.gather(
+                    *(
+                        _process_user(manager.bot, bucket, semaphore, job, uid)
+                        for uid in user_ids
+                    )
+                )
+                done = [uid for uid, ok in zip(user_ids, results) if ok]
+
+                if job["action"] == ACTION_APPROVE:
+                    await db_obj.mark_users_approved(
+                        done, int(datetime.now(timezone.utc).timestamp())
+                    )
+
+                job["cursor"] += len(user_ids)
+                job["success"] += len(done)
+                job["errors"] += len(user_ids) - len(done)
+                job["failures"] = 0
+                await _save_job(job)
+
+                if time.monotonic() - last_progress >= PROGRESS_UPDATE_INTERVAL:
+                    last_progress = time.monotonic()
+                    await _update_progress(bot, job)
+        except Exception as e:
+            logger.error(
+                f"Задача {job['id']} прервана на курсоре {job['cursor']}: {e}",
+                exc_info=True,
+            )
+            failed = True
+
+    if failed:
+        job["failures"] = job.get("failures", 0) + 1
+        if job["failures"] >= BULK_MAX_FAILURES:
+            await _abort_job(bot, job, f"{job['failures']} сбоев подряд")
+            return
+
+        # Счетчик сбоев сохраняется в Redis: после перезапуска лимит продолжает действовать
+        await _save_job(job)
+        delay = BULK_RETRY_DELAY * 2 ** (job["failures"] - 1)
+        logger.info(f"Задача {job['id']}: повтор через {delay}с")
+        await asyncio.sleep(delay)
+        run_background_task(_run_job(bot, job), name=f"bulk_{job['id']}")
+        return
+
+    await _delete_job(job["id"])
+    await _update_progress(bot, job)
+    logger.info(
+        f"Задача {job['id']} завершена: успешно {job['success']}, ошибок {job['errors']}"
+    )
+
+    try:
+        await bot.send_message(
+            job["owner_id"],
+            text("bulk_action:finished").format(
+                text(f"bulk_action:{job['action']}"), job["success"], job["errors"]
+            ),
+            parse_mode="HTML",
+        )
+    except Exception as e:
+        logger.error(f"Не удалось отправить отчет владельцу {job['owner_id']}: {e}")
+
+
+async def start_bulk_action(
+    bot: Bot,
+    owner_id: int,
+    bot_id: int,
+    chat_id: int,
+    action: str,
+    user_ids: list[int],
+) -> bool:
+    """
+    Запускает массовое действие в фоне.
+
+    Аргументы:
+        bot (Bot): Основной бот (для сообщений владельцу).
+        owner_id (int): ID владельца, получающего прогресс.
+        bot_id (int): ID бота-помощника (user_bot).
+        chat_id (int): ID канала.
+        action (str): ACTION_APPROVE, ACTION_DECLINE или ACTION_BAN.
+        user_ids (list[int]): ID пользователей.
+
+    Возвращает:
+        bool: False, если такая задача для канала уже выполняется.
+    """
+    job_id = _job_id(action, bot_id, chat_id)
+    if not await redis_client.sadd(BULK_JOBS_KEY, job_id):
+        return False
+
+    job = {
+        "id": job_id,
+        "action": action,
+        "owner_id": owner_id,
+        "bot_id": bot_id,
+        "chat_id": chat_id,
+        "cursor": 0,
+        "total": len(user_ids),
+        "success": 0,
+        "errors": 0,
+        "failures": 0,
+        "progress_message_id": None,
+    }
+
+    # Без сохраненного состояния ID в наборе блокировал бы повторный запуск
+    try:
+        ids_key = BULK_IDS_KEY.format(job_id)
+        await redis_client.delete(ids_key)
+        for i in range(0, len(user_ids), BULK_FLUSH_SIZE):
+            await redis_client.rpush(ids_key, *user_ids[i : i + BULK_FLUSH_SIZE])
+
+        try:
+            message = await bot.send_message(
+                owner_id,
+                text("bulk_action:progress").format(
+                    text(f"bulk_action:{action}"), 0, job["total"], 0, 0
+                ),
+                parse_mode="HTML",
+            )
+            job["progress_message_id"] = message.message_id
+        except Exception as e:
+            logger.debug(f"Не удалось отправить прогресс владельцу {owner_id}: {e}")
+
+        await _save_job(job)
+    except Exception:
+        await _delete_job(job_id)
+        raise
+    run_background_task(_run_job(bot, job), name=f"bulk_{job_id}")
+    return True
+
+
+async def resume_bulk_actions(bot: Bot) -> None:
+    """
+    Возобновляет незавершенные массовые действия после перезапуска.
+
+    Аргументы:
+        bot (Bot): Основной бот.
+    """
+    job_ids = await redis_client.smembers(BULK_JOBS_KEY)
+    for raw_id in job_ids:
+        job_id = raw_id.decode()
+        raw = await redis_client.get(BULK_JOB_KEY.format(job_id))
+        if not raw:
+            await redis_client.srem(BULK_JOBS_KEY, job_id)
+            continue
+
+        job = json.loads(raw)
+        logger.info(f"Возобновление задачи {job_id} с курсора {job['cursor']}")
+        try:
+            await bot.send_message(
+                job["owner_id"],
+                text("bulk_action:resumed").format(text(f"bulk_action:{job['action']}")),
+                parse_mode="HTML",
+            )
+        except Exception as e:
+            logger.debug(f"Не удалось уведомить владельца {job['owner_id']}: {e}")
+
+        run_background_task(_run_job(bot, job), name=f"bulk_{job_id}")
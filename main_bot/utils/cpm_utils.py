@@ -8,14 +8,22 @@ from main_bot.utils.report_signature import get_report_signatures
 
 logger = logging.getLogger(__name__)
 
-async def generate_cpm_report(user, post_id, related_posts, bot) -> str:
+# Максимум дополнительных каналов, перечисляемых в отчете
+MAX_DISPLAY_CHANNELS = 20
+
+
+async def generate_cpm_report(user, post_id, related_posts, bot, channels=None) -> str:
     """
     Генерирует текст CPM-отчета в новом формате.
+
+    Каналы всех постов загружаются одним запросом (или берутся из channels),
+    курс валют — из кэша курсов (один запрос на все отчеты).
     
     :param user: Объект пользователя (админа)
     :param post_id: ID оригинального поста
     :param related_posts: Список объектов PublishedPost
     :param bot: Объект бота
+    :param channels: Заранее загруженные каналы {chat_id: Channel} (опционально)
     :return: Отформатированный текст отчета
     """
     if not related_posts:
@@ -35,7 +43,15 @@ async def generate_cpm_report(user, post_id, related_posts, bot) -> str:
 
     # Основной пост (для заголовка берем первый)
     main_pp = related_posts[0]
-    main_channel = await db.channel.get_channel_by_chat_id(main_pp.chat_id)
+    other_posts = related_posts[1:]
+    display_posts = other_posts[:MAX_DISPLAY_CHANNELS]
+
+    # Все каналы отчета одним запросом
+    if channels is None:
+        channels = await db.channel.get_channels_by_chat_ids(
+            [p.chat_id for p in [main_pp, *display_posts]]
+        )
+    main_channel = channels.get(main_pp.chat_id)
     
     # Резюме контента
     opts = main_pp.message_options or {}
@@ -64,24 +80,20 @@ async def generate_cpm_report(user, post_id, related_posts, bot) -> str:
     # Список каналов
     # Сначала основной канал
     main_views = max(main_pp.views_24h or 0, main_pp.views_48h or 0, main_pp.views_72h or 0)
-    chat_id_str = str(main_channel.chat_id)
+    chat_id_str = str(main_pp.chat_id)
     main_link = f"https://t.me/c/{chat_id_str[4:] if chat_id_str.startswith('-100') else chat_id_str}"
+    main_title = main_channel.title if main_channel else f"Channel {main_pp.chat_id}"
     
     report_text += "\n" + text("cpm:report:channel_row").format(
         main_link,
-        html.escape(main_channel.title),
+        html.escape(main_title),
         main_views
     )
 
-    # Остальные каналы
-    if len(related_posts) > 1:
-        # Берем остальные посты (кроме первого)
-        other_posts = related_posts[1:]
-        max_display = 20
-        display_posts = other_posts[:max_display]
-        
+    # Остальные каналы (кроме первого)
+    if other_posts:
         for p in display_posts:
-            ch = await db.channel.get_channel_by_chat_id(p.chat_id)
+            ch = channels.get(p.chat_id)
             if not ch:
                 continue
             
@@ -95,8 +107,10 @@ async def generate_cpm_report(user, post_id, related_posts, bot) -> str:
                 ch_views
             )
             
-        if len(other_posts) > max_display:
-            report_text += "\n" + text("cpm:report:more_channels").format(len(other_posts) - max_display)
+        if len(other_posts) > MAX_DISPLAY_CHANNELS:
+            report_text += "\n" + text("cpm:report:more_channels").format(
+                len(other_posts) - MAX_DISPLAY_CHANNELS
+            )
 
     # Таймер удаления
     # Ищем максимальный таймер удаления среди постов
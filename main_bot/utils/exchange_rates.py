@@ -7,11 +7,17 @@ import json
 import logging
 import os
 import pathlib
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
 from dotenv import load_dotenv
 
+from main_bot.utils.http_client import (
+    CircuitBreaker,
+    close_http_session,
+    get_http_session,
+)
+
 logger = logging.getLogger(__name__)
 
 load_dotenv()
@@ -20,34 +26,81 @@ load_dotenv()
 current_dir = pathlib.Path(__file__).parent.resolve()
 
 
+# Таймауты (в секундах) и circuit breaker'ы для каждого источника
+SOURCE_TIMEOUTS: Dict[str, int] = {
+    "crypto_bot": 5,
+    "bybit": 10,
+    "bestchange": 15,
+}
+_breakers: Dict[str, CircuitBreaker] = {
+    source: CircuitBreaker(source) for source in SOURCE_TIMEOUTS
+}
+
+# Кэш условных запросов: {url: (etag, last_modified, json)}
+_conditional_cache: Dict[str, Tuple[Optional[str], Optional[str], Any]] = {}
+
+
 async def _fetch_json(
     url: str,
+    source: str,
     method: str = "GET",
     headers: Dict[str, str] = None,
     json_data: Any = None,
-    timeout: int = 10,
 ) -> Any:
-    """Вспомогательная функция для выполнения HTTP запросов."""
+    """
+    Вспомогательная функция для выполнения HTTP запросов.
+
+    Использует общую HTTP-сессию, таймаут и circuit breaker источника.
+    GET-запросы выполняются условно (If-None-Match / If-Modified-Since):
+    при ответе 304 возвращается ранее полученное тело.
+    """
+    breaker = _breakers[source]
+    if not breaker.allow_request():
+        logger.debug(f"Источник {source} временно отключен, запрос к {url} пропущен")
+        return None
+
+    headers = dict(headers or {})
+    cached = _conditional_cache.get(url) if method.upper() == "GET" else None
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    timeout = aiohttp.ClientTimeout(total=SOURCE_TIMEOUTS[source])
     try:
-        async with aiohttp.ClientSession() as session:
-            if method.upper() == "GET":
-                async with session.get(
-                    url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-            elif method.upper() == "POST":
-                async with session.post(
-                    url,
-                    headers=headers,
-                    json=json_data,
-                    timeout=aiohttp.ClientTimeout(total=timeout),
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
+        session = await get_http_session()
+        async with session.request(
+            method.upper(),
+            url,
+            headers=headers,
+            json=json_data if method.upper() == "POST" else None,
+            timeout=timeout,
+        ) as response:
+            if response.status == 304 and cached:
+                breaker.record_success()
+                return cached[2]
+
+            if response.status == 200:
+                data = await response.json(content_type=None)
+                breaker.record_success()
+                if method.upper() == "GET" and (
+                    response.headers.get("ETag") or response.headers.get("Last-Modified")
+                ):
+                    _conditional_cache[url] = (
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        data,
+                    )
+                return data
+
             logger.warning(f"API {url} вернул статус: {response.status}")
+            if response.status >= 500:
+                breaker.record_failure()
     except Exception as e:
         logger.error(f"Ошибка при запросе к {url}: {e}")
+        breaker.record_failure()
     return None
 
 
@@ -67,7 +120,7 @@ async def get_crypto_bot_usdt_rub_rate() -> float:
     url = "https://pay.crypt.bot/api/getExchangeRates"
     headers = {"Crypto-Pay-API-Token": api_token}
 
-    data = await _fetch_json(url, headers=headers)
+    data = await _fetch_json(url, source="crypto_bot", headers=headers)
     if data and data.get("ok"):
         for rate in data.get("result", []):
             if rate.get("source") == "USDT" and rate.get("target") == "RUB":
@@ -109,7 +162,7 @@ async def get_best_change_usdt_rub_rate() -> Dict[str, float]:
     pairs_str = "+".join(sell_pairs + buy_pairs)
     url = f"https://bestchange.app/v2/{api_key}/rates/{pairs_str}"
 
-    data = await _fetch_json(url)
+    data = await _fetch_json(url, source="bestchange")
     if data and "rates" in data:
         rates_data = data["rates"]
 
@@ -153,7 +206,9 @@ async def get_p2p_bybit_usdt_rub_rate() -> Dict[str, float]:
 
     async def fetch_side(side: str):
         payload = {**base_payload, "side": side}
-        data = await _fetch_json(url, method="POST", headers=headers, json_data=payload)
+        data = await _fetch_json(
+            url, source="bybit", method="POST", headers=headers, json_data=payload
+        )
         if data:
             return [
                 float(ad["price"])
@@ -267,4 +322,6 @@ if __name__ == "__main__":
         rate_bc = await get_best_change_usdt_rub_rate()
         logger.info(f"BestChange: {rate_bc}")
 
+        await close_http_session()
+
     asyncio.run(test())
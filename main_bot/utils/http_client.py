@@ -0,0 +1,178 @@
+"""
+Общий HTTP-клиент для обращений к внешним API.
+
+Держит одну aiohttp.ClientSession на процесс (пул соединений, кэш DNS,
+переиспользование TLS) вместо создания новой сессии на каждый запрос.
+Содержит простой circuit breaker для отключения недоступных источников
+и обертку повторов с jitter для клиентов платежных провайдеров.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Параметры пула соединений
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 20
+HTTP_DNS_CACHE_TTL = 300
+
+# Повторы запросов к провайдерам (экспоненциальная задержка с full jitter)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 5.0
+
+T = TypeVar("T")
+
+_session: aiohttp.ClientSession | None = None
+_session_lock = asyncio.Lock()
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Возвращает общую для процесса aiohttp-сессию, создавая её при первом вызове.
+
+    Возвращает:
+        aiohttp.ClientSession: Сессия с пулом соединений.
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        return _session
+
+    async with _session_lock:
+        if _session is None or _session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            )
+            _session = aiohttp.ClientSession(connector=connector)
+            logger.debug("Создана общая HTTP-сессия")
+    return _session
+
+
+async def close_http_session() -> None:
+    """Закрывает общую HTTP-сессию (вызывается при остановке приложения)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("Общая HTTP-сессия закрыта")
+    _session = None
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker для внешнего источника.
+
+    После `failure_threshold` ошибок подряд источник считается недоступным
+    на `reset_timeout` секунд, запросы к нему не выполняются. По истечении
+    таймаута пропускается одна пробная попытка (half-open).
+
+    Атрибуты:
+        name (str): Имя источника для логов.
+        failure_threshold (int): Количество ошибок подряд до размыкания.
+        reset_timeout (float): Время в секундах до пробной попытки.
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 3, reset_timeout: float = 300
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Разомкнут ли breaker (запросы к источнику запрещены)."""
+        if self._opened_at is None:
+            return False
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return False  # half-open: пропускаем пробный запрос
+        return True
+
+    def allow_request(self) -> bool:
+        """Можно ли сейчас выполнять запрос к источнику."""
+        return not self.is_open
+
+    def record_success(self) -> None:
+        """Фиксирует успешный запрос и замыкает breaker."""
+        if self._opened_at is not None:
+            logger.info(f"Источник {self.name} снова доступен")
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Фиксирует ошибку; при достижении порога размыкает breaker."""
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            if not self.is_open:
+                logger.warning(
+                    f"Источник {self.name} отключен на {self.reset_timeout}с "
+                    f"после {self._failures} ошибок подряд"
+                )
+            self._opened_at = time.monotonic()
+
+
+class ProviderUnavailableError(Exception):
+    """Источник временно отключен circuit breaker'ом."""
+
+
+class ProviderServerError(Exception):
+    """Источник ответил ошибкой 5xx (повод для повтора и учета в breaker)."""
+
+
+async def call_with_retries(
+    call: Callable[[], Awaitable[T]],
+    breaker: CircuitBreaker,
+    failures: tuple[type[BaseException], ...],
+    retry_on: tuple[type[BaseException], ...] = (),
+    attempts: int = RETRY_ATTEMPTS,
+) -> T:
+    """
+    Выполняет запрос к внешнему API с circuit breaker и ограниченными повторами.
+
+    Исключения из `failures` учитываются в breaker; повторяются только
+    исключения из `retry_on` — для неидемпотентных запросов туда
+    передаются лишь ошибки установки соединения (запрос не был отправлен).
+    Пауза перед повтором — случайная в [0, base * 2^n] (full jitter).
+
+    Аргументы:
+        call: Функция без аргументов, выполняющая один запрос.
+        breaker (CircuitBreaker): Breaker источника.
+        failures (tuple): Исключения, означающие сбой источника.
+        retry_on (tuple): Исключения, после которых запрос можно повторить.
+        attempts (int): Максимум попыток.
+
+    Возвращает:
+        Результат `call`.
+
+    Исключения:
+        ProviderUnavailableError: Если breaker разомкнут.
+    """
+    for attempt in range(1, attempts + 1):
+        if not breaker.allow_request():
+            raise ProviderUnavailableError(breaker.name)
+
+        try:
+            result = await call()
+        except failures as e:
+            breaker.record_failure()
+            if attempt >= attempts or not isinstance(e, retry_on):
+                raise
+
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+            logger.warning(
+                f"Источник {breaker.name}: {type(e).__name__}, "
+                f"повтор {attempt}/{attempts - 1} через {delay:.2f}с"
+            )
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
@@ -2,19 +2,40 @@
 Модуль для управления медиафайлами и методом их доставки.
 Реализует адаптивную логику: использование Telegram file_id для коротких постов
 и локальное сохранение + URL для длинных постов (метод Скрытая ссылка).
+
+Локальные файлы хранятся по хэшу содержимого (дедупликация), посты ссылаются
+на них через таблицу media_blob_refs, а периодический сборщик мусора удаляет
+файлы без ссылок по истечении MEDIA_GC_GRACE_SECONDS.
 """
 
+import hashlib
 import logging
 import os
+import re
+import time
 import uuid
-from typing import Optional, Tuple
+from typing import BinaryIO, Optional, Tuple
 
 from aiogram import types
 from config import Config
 from instance_bot import bot
+from main_bot.database.db import db
 
 logger = logging.getLogger(__name__)
 
+# Папка для недокачанных файлов: рядом с публичной (в той же ФС, чтобы replace
+# был атомарным), но вне раздаваемого каталога — до проверки хэша файл недоступен по URL
+MEDIA_TMP_PATH = os.path.join(
+    os.path.dirname(Config.PUBLIC_IMAGES_PATH),
+    os.path.basename(Config.PUBLIC_IMAGES_PATH) + "_tmp",
+)
+# Файл без ссылок удаляется, если его не загружали дольше этого срока
+MEDIA_GC_GRACE_SECONDS = 24 * 3600
+MEDIA_GC_BATCH_SIZE = 500
+
+# Имя blob в URL: ab/cd/<sha256><ext>
+_BLOB_NAME_RE = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})\.\w+$")
+
 class MediaManager:
     """
     Класс-менеджер для обработки медиа в системе адаптивного постинга.
@@ -97,8 +118,16 @@ class MediaManager:
     async def save_to_local(message: types.Message) -> Optional[str]:
         """
         Скачивает медиа из Telegram и сохраняет в публичную папку.
-        Возвращает внешний URL.
+
+        Файл адресуется SHA-256 содержимого (считается потоково во время
+        скачивания) и лежит в шардированной папке `ab/cd/<hash><ext>`,
+        поэтому повторно загруженное медиа не дублируется на диске.
+        Запись атомарна: файл скачивается во временный и переименовывается.
+
+        Возвращает:
+            Optional[str]: Внешний URL файла или None при ошибке.
         """
+        tmp_path = None
         try:
             # Определяем медиа-объект
             media_obj = None
@@ -117,20 +146,144 @@ class MediaManager:
             if not media_obj:
                 return None
 
-            # Подготовка путей
-            os.makedirs(Config.PUBLIC_IMAGES_PATH, exist_ok=True)
-            unique_name = f"{uuid.uuid4().hex}{ext}"
-            file_path = os.path.join(Config.PUBLIC_IMAGES_PATH, unique_name)
+            # Скачивание во временный файл с подсчетом хэша
+            os.makedirs(MEDIA_TMP_PATH, exist_ok=True)
+            tmp_path = os.path.join(MEDIA_TMP_PATH, uuid.uuid4().hex)
+            with open(tmp_path, "wb") as file:
+                writer = _HashingWriter(file)
+                await bot.download(media_obj, destination=writer, seek=False)
+            blob_hash = writer.sha256.hexdigest()
 
-            # Скачивание
-            await bot.download(media_obj, destination=file_path)
-            
-            # Формирование URL
-            public_url = f"{Config.PUBLIC_IMAGES_URL}{unique_name}"
-            
-            logger.info(f"Медиа сохранено локально: {unique_name} -> {public_url}")
+            # Регистрация до записи: свежая отметка защищает файл от GC
+            await db.media_blob.touch_blob(blob_hash, ext, writer.size)
+
+            # Одинаковое содержимое дает одинаковый файл, поэтому одновременная
+            # запись одного blob безопасна — replace атомарен
+            file_path = _blob_path(blob_hash, ext)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            os.replace(tmp_path, file_path)
+            tmp_path = None
+
+            public_url = f"{Config.PUBLIC_IMAGES_URL}{_blob_name(blob_hash, ext)}"
+            logger.info(f"Медиа сохранено локально: {blob_hash}{ext} -> {public_url}")
             return public_url
 
         except Exception as e:
             logger.error(f"Ошибка при локальном сохранении медиа: {e}", exc_info=True)
             return None
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def get_blob_hash(media_value: Optional[str]) -> Optional[str]:
+        """
+        Извлекает хэш медиафайла из URL локального хранилища.
+
+        Аргументы:
+            media_value (str | None): file_id или URL медиа поста.
+
+        Возвращает:
+            Optional[str]: SHA-256 файла или None, если это не локальный blob.
+        """
+        if not media_value or not media_value.startswith(Config.PUBLIC_IMAGES_URL):
+            return None
+
+        match = _BLOB_NAME_RE.match(media_value[len(Config.PUBLIC_IMAGES_URL):])
+        return match.group(1) if match else None
+
+    @staticmethod
+    async def link_post_media(post_id: int, media_value: Optional[str]) -> None:
+        """
+        Сохраняет ссылку поста на локальный медиафайл (для сборщика мусора).
+
+        Аргументы:
+            post_id (int): ID поста.
+            media_value (str | None): file_id или URL медиа поста.
+        """
+        await db.media_blob.set_post_media(
+            post_id, MediaManager.get_blob_hash(media_value)
+        )
+
+    @staticmethod
+    async def collect_garbage() -> int:
+        """
+        Удаляет медиафайлы, на которые не ссылается ни один пост.
+
+        Файл удаляется, только если его не загружали дольше
+        MEDIA_GC_GRACE_SECONDS. Перед удалением файл переносится
+        в карантин; если за это время blob снова зарегистрировали
+        (параллельная загрузка того же содержимого), файл возвращается.
+
+        Возвращает:
+            int: Количество удаленных файлов.
+        """
+        await db.media_blob.delete_stale_refs()
+
+        removed = 0
+        seen_before = int(time.time()) - MEDIA_GC_GRACE_SECONDS
+        while True:
+            blobs = await db.media_blob.delete_unreferenced_blobs(
+                seen_before=seen_before, limit=MEDIA_GC_BATCH_SIZE
+            )
+            for blob in blobs:
+                if await _remove_blob_file(blob.hash, blob.ext):
+                    removed += 1
+
+            if len(blobs) < MEDIA_GC_BATCH_SIZE:
+                break
+
+        if removed:
+            logger.info(f"Медиа GC: удалено файлов: {removed}")
+        return removed
+
+
+class _HashingWriter:
+    """Файловый приемник для bot.download, считающий SHA-256 и размер."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> int:
+        self.sha256.update(chunk)
+        self.size += len(chunk)
+        return self._file.write(chunk)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+
+def _blob_name(blob_hash: str, ext: str) -> str:
+    """Относительный путь blob: `ab/cd/<hash><ext>`."""
+    return f"{blob_hash[:2]}/{blob_hash[2:4]}/{blob_hash}{ext}"
+
+
+def _blob_path(blob_hash: str, ext: str) -> str:
+    """Путь blob на диске."""
+    return os.path.join(Config.PUBLIC_IMAGES_PATH, *_blob_name(blob_hash, ext).split("/"))
+
+
+async def _remove_blob_file(blob_hash: str, ext: str) -> bool:
+    """
+    Удаляет файл blob, запись которого уже удалена из БД.
+
+    Возвращает:
+        bool: True, если файл удален.
+    """
+    file_path = _blob_path(blob_hash, ext)
+    quarantine_path = f"{file_path}.{uuid.uuid4().hex}.gc"
+    try:
+        os.replace(file_path, quarantine_path)
+    except FileNotFoundError:
+        return False
+
+    # Blob зарегистрирован заново — загрузчик мог записать файл до переноса
+    if await db.media_blob.blob_exists(blob_hash):
+        if not os.path.exists(file_path):
+            os.replace(quarantine_path, file_path)
+            return False
+
+    os.remove(quarantine_path)
+    return True
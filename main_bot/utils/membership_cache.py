@@ -0,0 +1,64 @@
+"""
+Кэш членства пользователей в каналах.
+
+Hide-кнопки в опубликованных постах проверяют подписку пользователя на каждый
+клик. Чтобы не упираться в лимиты Bot API, вердикт `get_chat_member`
+кэшируется в Redis (общий для всех воркеров) по ключу (channel_id, user_id).
+Положительный и отрицательный ответы живут разное время: неподписавшийся
+пользователь, скорее всего, подпишется и нажмет кнопку снова.
+Кэш сбрасывается обновлениями `chat_member` (см. set_resource.set_admin).
+"""
+
+import logging
+
+from aiogram import Bot
+
+from main_bot.utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Префикс ключа Redis
+MEMBERSHIP_KEY = "member:{}:{}"
+# Время жизни вердиктов в секундах
+MEMBER_TTL = 600
+NOT_MEMBER_TTL = 30
+
+
+async def is_channel_member(bot: Bot, chat_id: int, user_id: int) -> bool:
+    """
+    Проверяет, подписан ли пользователь на канал, с кэшированием в Redis.
+
+    Аргументы:
+        bot (Bot): Бот, администрирующий канал.
+        chat_id (int): ID канала.
+        user_id (int): ID пользователя.
+
+    Возвращает:
+        bool: True, если пользователь состоит в канале.
+    """
+    key = MEMBERSHIP_KEY.format(chat_id, user_id)
+
+    cached = await redis_client.get(key)
+    if cached is not None:
+        return cached == b"1"
+
+    member = await bot.get_chat_member(chat_id=chat_id, user_id=user_id)
+    is_member = member.status != "left"
+
+    await redis_client.set(
+        key,
+        "1" if is_member else "0",
+        ex=MEMBER_TTL if is_member else NOT_MEMBER_TTL,
+    )
+    return is_member
+
+
+async def invalidate_membership(chat_id: int, user_id: int) -> None:
+    """
+    Сбрасывает закэшированный вердикт (при изменении статуса участника).
+
+    Аргументы:
+        chat_id (int): ID канала.
+        user_id (int): ID пользователя.
+    """
+    await redis_client.delete(MEMBERSHIP_KEY.format(chat_id, user_id))
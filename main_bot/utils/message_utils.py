@@ -5,14 +5,17 @@
 - Отправки превью постов, сторис и бот-постов
 - Отправки сообщений через ботов
 - Работы с медиафайлами в сообщениях
+- Пакетного удаления сообщений (deleteMessages)
 """
 
+import asyncio
 import logging
 import os
 import pathlib
 from typing import Optional, Union
 
 from aiogram import Bot, types
+from aiogram.exceptions import TelegramRetryAfter
 from aiogram.fsm.context import FSMContext
 
 from config import Config
@@ -32,6 +35,9 @@ from main_bot.utils.lang.language import text
 
 logger = logging.getLogger(__name__)
 
+# Максимум ID сообщений в одном вызове deleteMessages
+DELETE_MESSAGES_LIMIT = 100
+
 
 async def answer_bot_post(
     message: types.Message, state: FSMContext, from_edit: bool = False
@@ -569,3 +575,65 @@ async def safe_delete_message(
     except Exception as e:
         logger.debug(f"Не удалось удалить сообщение: {e}")
     return False
+
+
+async def _delete_single_messages(bot: Bot, chat_id: int, message_ids: list[int]) -> list[int]:
+    """
+    Удаляет сообщения по одному (fallback для deleteMessages).
+
+    Возвращает:
+        list[int]: ID сообщений, которые не удалось удалить.
+    """
+    failed = []
+    for message_id in message_ids:
+        try:
+            await bot.delete_message(chat_id, message_id)
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+            try:
+                await bot.delete_message(chat_id, message_id)
+            except Exception as retry_err:
+                logger.debug(f"Не удалось удалить {message_id} в {chat_id}: {retry_err}")
+                failed.append(message_id)
+        except Exception as e:
+            # Сообщение уже удалено вручную — цель достигнута
+            if "message to delete not found" not in str(e).lower():
+                logger.debug(f"Не удалось удалить {message_id} в {chat_id}: {e}")
+                failed.append(message_id)
+    return failed
+
+
+async def delete_messages_bulk(bot: Bot, chat_id: int, message_ids: list[int]) -> list[int]:
+    """
+    Удаляет сообщения чата пачками через deleteMessages (до 100 ID за вызов).
+
+    Если пачка удалить не удалось, ее сообщения удаляются по одному,
+    чтобы найти конкретные проблемные ID.
+
+    Аргументы:
+        bot (Bot): Бот, от имени которого удаляются сообщения.
+        chat_id (int): ID чата.
+        message_ids (list[int]): ID сообщений.
+
+    Возвращает:
+        list[int]: ID сообщений, которые не удалось удалить.
+    """
+    failed = []
+    for i in range(0, len(message_ids), DELETE_MESSAGES_LIMIT):
+        chunk = message_ids[i : i + DELETE_MESSAGES_LIMIT]
+        try:
+            await bot.delete_messages(chat_id, chunk)
+            continue
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+            try:
+                await bot.delete_messages(chat_id, chunk)
+                continue
+            except Exception as retry_err:
+                logger.warning(f"deleteMessages в {chat_id} не выполнен: {retry_err}")
+        except Exception as e:
+            logger.warning(f"deleteMessages в {chat_id} не выполнен: {e}")
+
+        failed.extend(await _delete_single_messages(bot, chat_id, chunk))
+
+    return failed
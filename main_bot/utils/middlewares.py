@@ -48,8 +48,16 @@ class StartMiddle(BaseMiddleware):
             return await handler(message, data)
 
         user_obj = message.from_user
-        # Проверяем наличие пользователя в БД
-        user = await db.user.get_user(user_obj.id)
+        # Пользователь уже загружен GetUserMiddleware — повторно в БД не ходим
+        user = data.get("user")
+        if user is None:
+            user = await db.user.get_user(user_obj.id)
+
+        if user and not user.is_active:
+            # Пользователь вернулся после блокировки бота — снова получатель рассылок
+            data["user"] = await db.user.update_user(
+                user_id=user_obj.id, return_obj=True, is_active=True
+            )
 
         if not user:
             referral_id = None
@@ -76,7 +84,7 @@ class StartMiddle(BaseMiddleware):
                             ads_tag = None
 
             try:
-                await db.user.add_user(
+                data["user"] = await db.user.add_user(
                     id=user_obj.id,
                     is_premium=user_obj.is_premium or False,
                     referral_id=referral_id,
@@ -124,6 +132,7 @@ class GetUserMiddleware(BaseMiddleware):
         if not user_id:
             return await handler(event, data)
 
+        # Кэшируется в UserCrud, хендлеры получают объект через data["user"]
         user = await db.user.get_user(user_id)
         data["user"] = user
 
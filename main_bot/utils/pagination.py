@@ -0,0 +1,61 @@
+"""
+Keyset-пагинация списков админ-панели.
+
+Курсор в callback_data — ID граничной строки с направлением:
+"n<id>" — строки после id, "p<id>" — строки перед id, "0" — первая страница
+(совместимо со старыми кнопками "…|list|0"). Страница запрашивается
+с лимитом per_page + 1, лишняя строка показывает, есть ли продолжение.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+FIRST_PAGE_CURSOR = "0"
+
+
+def parse_cursor(raw: Optional[str]) -> Tuple[Optional[int], bool]:
+    """
+    Разбирает курсор из callback_data.
+
+    Аргументы:
+        raw (str | None): Курсор ("0", "n<id>", "p<id>").
+
+    Возвращает:
+        Tuple[Optional[int], bool]: (ID граничной строки, листать назад).
+    """
+    if not raw or raw[0] not in "np":
+        return None, False
+    return int(raw[1:]), raw[0] == "p"
+
+
+def split_page(
+    rows: List[Any], per_page: int, cursor_id: Optional[int], backward: bool
+) -> Tuple[List[Any], Optional[str], Optional[str]]:
+    """
+    Отделяет страницу от строки-индикатора и формирует курсоры навигации.
+
+    Аргументы:
+        rows (List[Any]): Результат запроса с лимитом per_page + 1
+            (при backward — в обратном порядке, как вернул keyset_page).
+        per_page (int): Размер страницы.
+        cursor_id (int | None): Курсор текущего запроса.
+        backward (bool): Запрос шел назад.
+
+    Возвращает:
+        Tuple: (строки страницы, курсор «назад» или None, курсор «вперед» или None).
+    """
+    has_more = len(rows) > per_page
+    page = rows[:per_page]
+    if backward:
+        page.reverse()
+
+    if not page:
+        return page, None, None
+
+    if backward:
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = cursor_id is not None, has_more
+
+    prev_cursor = f"p{page[0].id}" if has_prev else None
+    next_cursor = f"n{page[-1].id}" if has_next else None
+    return page, prev_cursor, next_cursor
@@ -1,36 +1,85 @@
+import asyncio
 import json
 import logging
+
+import aiohttp
 from aiocryptopay import AioCryptoPay
 
 from config import Config
+from main_bot.utils.http_client import CircuitBreaker, call_with_retries
 
 logger = logging.getLogger(__name__)
 
+# Таймауты (в секундах) запросов к Crypto Pay API
+CRYPTO_BOT_TIMEOUT = aiohttp.ClientTimeout(total=20, connect=5, sock_read=15)
+
+# Сбои провайдера: сеть и таймауты
+_FAILURES = (aiohttp.ClientError, asyncio.TimeoutError)
+# Ошибки до отправки запроса — безопасны для повтора любого метода
+_CONNECT_ERRORS = (aiohttp.ClientConnectorError,)
+
+
+class _CryptoPayClient(AioCryptoPay):
+    """AioCryptoPay с таймаутами запросов (сессия одна на экземпляр)."""
+
+    def get_session(self, **kwargs):
+        kwargs.setdefault("timeout", CRYPTO_BOT_TIMEOUT)
+        return super().get_session(**kwargs)
+
 
 class CryptoBot:
     """
     Класс для работы с Crypto Pay API.
+
+    Использует один клиент (и пул соединений) на процесс; клиент
+    закрывается при остановке приложения через close().
     """
 
     def __init__(self, api_token: str):
         self.api_token = api_token
+        self._client: _CryptoPayClient | None = None
+        self.breaker = CircuitBreaker("crypto_bot_pay", failure_threshold=5, reset_timeout=60)
+
+    @property
+    def client(self) -> _CryptoPayClient:
+        """Общий клиент Crypto Pay (создается при первом запросе)."""
+        if self._client is None:
+            self._client = _CryptoPayClient(token=self.api_token)
+        return self._client
+
+    async def close(self) -> None:
+        """Закрывает сессию клиента (вызывается при остановке приложения)."""
+        if self._client is not None:
+            await self._client.close()
+        self._client = None
+
+    async def _call(self, method, idempotent: bool, **kwargs):
+        """
+        Вызывает метод клиента с circuit breaker и повторами.
+
+        Идемпотентные вызовы повторяются при сетевых сбоях и таймаутах,
+        остальные — только если соединение не было установлено.
+        """
+        return await call_with_retries(
+            lambda: method(**kwargs),
+            breaker=self.breaker,
+            failures=_FAILURES,
+            retry_on=_FAILURES if idempotent else _CONNECT_ERRORS,
+        )
 
     async def get_crypto_bot_sum(self, summa: float, currency: str) -> float | None:
         """
         Рассчитать сумму в крипте по курсу RUB.
         """
-        async with AioCryptoPay(token=self.api_token) as crypto_pay:
-            crypto_pay: AioCryptoPay
-
-            try:
-                courses = await crypto_pay.get_exchange_rates()
+        try:
+            courses = await self._call(self.client.get_exchange_rates, idempotent=True)
 
-                for course in courses:
-                    if course.source == currency and course.target == "RUB":
-                        return round(float(summa / course.rate), 8)
-            except Exception as e:
-                logger.error(f"Ошибка получения курсов CryptoBot: {e}")
-                return None
+            for course in courses:
+                if course.source == currency and course.target == "RUB":
+                    return round(float(summa / course.rate), 8)
+        except Exception as e:
+            logger.error(f"Ошибка получения курсов CryptoBot: {e}")
+            return None
 
     async def create_invoice(
         self, amount: float, asset: str = "USDT", payload: dict = None
@@ -38,53 +87,48 @@ class CryptoBot:
         """
         Создать счет на оплату.
         """
-        async with AioCryptoPay(token=self.api_token) as crypto_pay:
-            crypto_pay: AioCryptoPay
-
-            amount_crypto = await self.get_crypto_bot_sum(summa=amount, currency=asset)
+        amount_crypto = await self.get_crypto_bot_sum(summa=amount, currency=asset)
 
-            if not amount_crypto:
-                raise ValueError("Не удалось рассчитать сумму в криптовалюте")
+        if not amount_crypto:
+            raise ValueError("Не удалось рассчитать сумму в криптовалюте")
 
-            kwargs = {"amount": amount_crypto, "asset": asset}
+        kwargs = {"amount": amount_crypto, "asset": asset}
 
-            if payload:
-                # Лимит payload в CryptoBot - 4kb
-                kwargs["payload"] = json.dumps(payload)
+        if payload:
+            # Лимит payload в CryptoBot - 4kb
+            kwargs["payload"] = json.dumps(payload)
 
-            invoice = await crypto_pay.create_invoice(**kwargs)
+        invoice = await self._call(self.client.create_invoice, idempotent=False, **kwargs)
 
-            return {"url": invoice.bot_invoice_url, "invoice_id": invoice.invoice_id}
+        return {"url": invoice.bot_invoice_url, "invoice_id": invoice.invoice_id}
 
     async def is_paid(self, invoice_id: int) -> bool:
         """
         Проверить статус оплаты счета.
         """
-        async with AioCryptoPay(token=self.api_token) as crypto_pay:
-            crypto_pay: AioCryptoPay
-
-            try:
-                invoice = await crypto_pay.get_invoices(invoice_ids=invoice_id)
-                return invoice.status == "paid"
-            except Exception as e:
-                logger.error(
-                    f"Ошибка проверки статуса счета CryptoBot {invoice_id}: {e}"
-                )
-                return False
+        try:
+            invoice = await self._call(
+                self.client.get_invoices, idempotent=True, invoice_ids=invoice_id
+            )
+            return invoice.status == "paid"
+        except Exception as e:
+            logger.error(
+                f"Ошибка проверки статуса счета CryptoBot {invoice_id}: {e}"
+            )
+            return False
 
     async def delete_invoice(self, invoice_id: int) -> bool:
         """
         Удалить счет.
         """
-        async with AioCryptoPay(token=self.api_token) as crypto_pay:
-            crypto_pay: AioCryptoPay
-
-            try:
-                await crypto_pay.delete_invoice(invoice_id=invoice_id)
-                return True
-            except Exception as e:
-                logger.error(f"Ошибка при удалении счета CryptoBot {invoice_id}: {e}")
-                return False
+        try:
+            await self._call(
+                self.client.delete_invoice, idempotent=False, invoice_id=invoice_id
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Ошибка при удалении счета CryptoBot {invoice_id}: {e}")
+            return False
 
 
 crypto_bot = CryptoBot(api_token=Config.CRYPTO_BOT_TOKEN)
@@ -1,12 +1,28 @@
 import asyncio
 import uuid
 import logging
+
+import httpx
 from httpx import AsyncClient
 
 from config import Config
+from main_bot.utils.http_client import (
+    CircuitBreaker,
+    ProviderServerError,
+    call_with_retries,
+)
 
 logger = logging.getLogger(__name__)
 
+# Таймауты (в секундах) и пул соединений
+PLATEGA_TIMEOUT = httpx.Timeout(connect=5.0, read=15.0, write=10.0, pool=5.0)
+PLATEGA_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+# Сбои провайдера: сеть, таймауты, 5xx
+_FAILURES = (httpx.TransportError, ProviderServerError)
+# Ошибки до отправки запроса — безопасны для повтора любого метода
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
 
 class Platega:
     """
@@ -25,7 +41,49 @@ class Platega:
             "X-Secret": secret_key,
             "Content-Type": "application/json",
         }
-        self.client = AsyncClient(base_url=self.base_url, headers=self.headers)
+        self._client: AsyncClient | None = None
+        self.breaker = CircuitBreaker("platega", failure_threshold=5, reset_timeout=60)
+
+    @property
+    def client(self) -> AsyncClient:
+        """Общий для процесса клиент с пулом соединений (создается при первом запросе)."""
+        if self._client is None or self._client.is_closed:
+            self._client = AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=PLATEGA_TIMEOUT,
+                limits=PLATEGA_LIMITS,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Закрывает пул соединений (вызывается при остановке приложения)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def _request(
+        self, method: str, url: str, idempotent: bool, **kwargs
+    ) -> httpx.Response:
+        """
+        Выполняет запрос с таймаутами, circuit breaker и повторами.
+
+        Идемпотентные запросы повторяются при любых сетевых сбоях и 5xx,
+        остальные — только если соединение не было установлено.
+        """
+
+        async def send() -> httpx.Response:
+            res = await self.client.request(method, url, **kwargs)
+            if res.status_code >= 500:
+                raise ProviderServerError(f"Platega {method} {url}: {res.status_code}")
+            return res
+
+        return await call_with_retries(
+            send,
+            breaker=self.breaker,
+            failures=_FAILURES,
+            retry_on=_FAILURES if idempotent else _CONNECT_ERRORS,
+        )
 
     async def create_invoice(
         self, order_id: str, amount: float, description: str
@@ -44,7 +102,9 @@ class Platega:
 
         try:
             logger.info(f"Platega Создание счета: {params}")
-            res = await self.client.post("/transaction/process", json=params)
+            res = await self._request(
+                "POST", "/transaction/process", idempotent=False, json=params
+            )
 
             logger.info(f"Platega Статус ответа: {res.status_code}")
             logger.info(f"Platega Тело ответа: {res.text}")
@@ -76,12 +136,12 @@ class Platega:
 
     async def h2h_invoice(self, invoice_id: str):
         """Получить H2H данные (QR код)"""
-        res = await self.client.get(f"/h2h/{invoice_id}")
+        res = await self._request("GET", f"/h2h/{invoice_id}", idempotent=True)
         return res.json().get("qr")
 
     async def check_invoice(self, invoice_id: str):
         """Проверить статус транзакции"""
-        res = await self.client.get(f"/transaction/{invoice_id}")
+        res = await self._request("GET", f"/transaction/{invoice_id}", idempotent=True)
         return res.json()
 
     async def is_paid(self, invoice_id: str) -> bool:
@@ -97,7 +157,9 @@ class Platega:
         """Отменить платеж Platega"""
         try:
             logger.info(f"Platega Отмена счета: {invoice_id}")
-            res = await self.client.post(f"/transaction/{invoice_id}/cancel")
+            res = await self._request(
+                "POST", f"/transaction/{invoice_id}/cancel", idempotent=False
+            )
             logger.info(f"Platega Статус отмены: {res.status_code}")
             logger.info(f"Platega Тело отмены: {res.text}")
 
@@ -122,6 +184,7 @@ async def main():
         order_id=str(uuid.uuid4()), amount=10, description="123"
     )
     logger.info(f"Результат теста: {r}")
+    await platega_api.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+"""
+Ограничитель частоты запросов к Telegram Bot API.
+
+Реализует алгоритм token bucket: токены пополняются с постоянной скоростью,
+каждый запрос забирает один токен. При получении RetryAfter от Telegram
+ведро «замораживается» на указанное время для всех отправителей сразу.
+AdaptiveTokenBucket дополнительно снижает скорость после RetryAfter
+и плавно возвращает её при успешных запросах.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Асинхронный token bucket.
+
+    Атрибуты:
+        rate (float): Скорость пополнения (токенов в секунду).
+        capacity (float): Максимальное количество накопленных токенов (burst).
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Начисляет токены за прошедшее время."""
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    async def acquire(self) -> None:
+        """Ждет, пока не появится свободный токен, и забирает его."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Приостанавливает выдачу токенов (реакция на RetryAfter).
+
+        Аргументы:
+            seconds (float): Длительность паузы в секундах.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket, подстраивающий скорость под ответы Telegram.
+
+    RetryAfter уменьшает скорость вдвое (не ниже min_rate), каждый успешный
+    запрос увеличивает её на rate_step (не выше max_rate).
+
+    Атрибуты:
+        max_rate (float): Начальная и максимальная скорость (токенов в секунду).
+        min_rate (float): Минимальная скорость.
+        rate_step (float): Прирост скорости за успешный запрос.
+    """
+
+    def __init__(
+        self, max_rate: float, min_rate: float = 1, rate_step: float = 0.05
+    ) -> None:
+        super().__init__(rate=max_rate, capacity=max_rate)
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate_step = rate_step
+
+    def on_retry_after(self, seconds: float) -> None:
+        """
+        Реакция на RetryAfter: пауза и снижение скорости.
+
+        Аргументы:
+            seconds (float): Значение retry_after из ответа Telegram.
+        """
+        self.pause(seconds)
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def on_success(self) -> None:
+        """Плавно восстанавливает скорость после успешного запроса."""
+        self.rate = min(self.max_rate, self.rate + self.rate_step)
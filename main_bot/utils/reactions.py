@@ -0,0 +1,287 @@
+"""
+Счетчики реакций опубликованных постов в Redis.
+
+Голоса хранятся в Redis вместо JSON-колонки `reaction` в Postgres:
+hash `react:{chat_id}:{message_id}:users` — выбор пользователя (user_id → id реакции).
+Счетчик реакции — количество пользователей с этим выбором.
+
+Голосование выполняется Lua-скриптом, поэтому одновременные клики
+не теряют обновлений. Редактирование клавиатуры схлопывается: не чаще
+одного раза в REACTION_EDIT_INTERVAL секунд на сообщение (во всех воркерах).
+Каждый принятый голос увеличивает версию сообщения (`...:ver`): если после
+редактирования версия изменилась, обновление планируется повторно.
+Накопленные голоса периодически сбрасываются в Postgres (flush_reactions).
+"""
+
+import asyncio
+import logging
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+
+from main_bot.database.db import db
+from main_bot.utils.background import run_background_task
+from main_bot.utils.redis_client import redis_client
+from main_bot.utils.schemas import React
+
+logger = logging.getLogger(__name__)
+
+# Минимальный интервал между редактированиями клавиатуры одного сообщения
+REACTION_EDIT_INTERVAL = 3
+# Время жизни состояния реакций в Redis (после сброса в БД восстановится)
+REACTION_STATE_TTL = 7 * 24 * 3600
+# Сообщения с изменениями, ожидающие сброса в Postgres
+REACTION_DIRTY_KEY = "react:dirty"
+REACTION_FLUSH_BATCH = 500
+
+# Атомарное голосование.
+# KEYS: users, init, ver. ARGV: user_id, reaction_id, ttl.
+# Возвращает: -1 — состояние не загружено, 0 — голос уже учтен, 1 — голос принят.
+_VOTE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return -1
+end
+if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+return 1
+"""
+
+# Однократная загрузка голосов из Postgres (безопасна при гонке воркеров).
+# KEYS: users, init. ARGV: ttl, затем пары user_id, reaction_id.
+_SEED_SCRIPT = """
+if redis.call('SET', KEYS[2], 1, 'NX', 'EX', ARGV[1]) == false then
+    return 0
+end
+for i = 2, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+_vote_script = redis_client.register_script(_VOTE_SCRIPT)
+_seed_script = redis_client.register_script(_SEED_SCRIPT)
+
+
+def _keys(chat_id: int, message_id: int) -> list[str]:
+    """Ключи Redis с состоянием реакций сообщения."""
+    prefix = f"react:{chat_id}:{message_id}"
+    return [f"{prefix}:users", f"{prefix}:init", f"{prefix}:ver"]
+
+
+async def _seed_from_db(chat_id: int, message_id: int, reaction: dict) -> None:
+    """Загружает голоса из JSON-колонки поста в Redis."""
+    args = [REACTION_STATE_TTL]
+    for row in React(rows=reaction.get("rows")).rows:
+        for react in row.reactions:
+            for user_id in react.users:
+                args.extend([user_id, react.id])
+
+    await _seed_script(keys=_keys(chat_id, message_id), args=args)
+
+
+async def vote(
+    post_id: int, chat_id: int, message_id: int, reaction: dict, user_id: int, reaction_id: int
+) -> bool:
+    """
+    Учитывает голос пользователя за реакцию.
+
+    Пользователь может выбрать одну реакцию: голос за другую переносит его.
+
+    Аргументы:
+        post_id (int): ID опубликованного поста (для сброса в БД).
+        chat_id (int): ID канала.
+        message_id (int): ID сообщения.
+        reaction (dict): JSON реакций поста (для первичной загрузки).
+        user_id (int): ID пользователя.
+        reaction_id (int): ID выбранной реакции.
+
+    Возвращает:
+        bool: True, если голос изменил счетчики.
+    """
+    keys = _keys(chat_id, message_id)
+    args = [user_id, reaction_id, REACTION_STATE_TTL]
+
+    result = await _vote_script(keys=keys, args=args)
+    if result == -1:
+        await _seed_from_db(chat_id, message_id, reaction)
+        result = await _vote_script(keys=keys, args=args)
+
+    if result == 1:
+        await redis_client.sadd(REACTION_DIRTY_KEY, f"{post_id}:{chat_id}:{message_id}")
+        return True
+    return False
+
+
+async def reset_reactions(chat_id: int, message_id: int) -> None:
+    """
+    Сбрасывает голоса сообщения в Redis (после смены раскладки реакций).
+
+    Удаляет состояние голосов и снимает сообщение из очереди сброса в БД,
+    чтобы старые голоса не применились к новым кнопкам. Следующий голос
+    загрузит состояние из обновленной колонки `reaction`.
+
+    Аргументы:
+        chat_id (int): ID канала.
+        message_id (int): ID сообщения.
+    """
+    await redis_client.delete(*_keys(chat_id, message_id))
+
+    suffix = f":{chat_id}:{message_id}"
+    members = [
+        member
+        for member in await redis_client.smembers(REACTION_DIRTY_KEY)
+        if member.decode().endswith(suffix)
+    ]
+    if members:
+        await redis_client.srem(REACTION_DIRTY_KEY, *members)
+
+
+async def get_votes(chat_id: int, message_id: int) -> dict[int, list[int]]:
+    """
+    Возвращает голоса сообщения: {id реакции: [user_id, ...]}.
+    """
+    raw = await redis_client.hgetall(_keys(chat_id, message_id)[0])
+    votes: dict[int, list[int]] = {}
+    for user_id, reaction_id in raw.items():
+        votes.setdefault(int(reaction_id), []).append(int(user_id))
+    return votes
+
+
+def apply_votes(reaction: dict, votes: dict[int, list[int]]) -> dict:
+    """
+    Подставляет голоса из Redis в JSON реакций поста.
+
+    Аргументы:
+        reaction (dict): JSON реакций поста (раскладка кнопок).
+        votes (dict): Голоса {id реакции: [user_id, ...]}.
+
+    Возвращает:
+        dict: JSON реакций с актуальными списками пользователей.
+    """
+    react_model = React(rows=reaction.get("rows"))
+    for row in react_model.rows:
+        for react in row.reactions:
+            react.users = votes.get(react.id, [])
+    return react_model.model_dump()
+
+
+async def schedule_markup_refresh(
+    bot: Bot,
+    post_id: int,
+    chat_id: int,
+    message_id: int,
+    delay: float = REACTION_EDIT_INTERVAL,
+) -> None:
+    """
+    Планирует обновление клавиатуры сообщения с учетом debounce.
+
+    Первый клик занимает окно в Redis и запускает отложенное обновление;
+    клики внутри окна ничего не планируют — их голоса попадут в то же
+    редактирование или в повторное, если пришли уже после чтения голосов.
+
+    Аргументы:
+        bot (Bot): Экземпляр бота.
+        post_id (int): ID опубликованного поста.
+        chat_id (int): ID канала.
+        message_id (int): ID сообщения.
+        delay (float): Задержка перед редактированием (сек).
+    """
+    lock_key = f"react:{chat_id}:{message_id}:edit"
+    if not await redis_client.set(lock_key, 1, nx=True, ex=int(delay) + 5):
+        return
+
+    run_background_task(
+        _refresh_markup(bot, post_id, chat_id, message_id, lock_key, delay),
+        name=f"react_refresh_{chat_id}_{message_id}",
+    )
+
+
+async def _refresh_markup(
+    bot: Bot,
+    post_id: int,
+    chat_id: int,
+    message_id: int,
+    lock_key: str,
+    delay: float,
+) -> None:
+    """
+    Отложенно редактирует клавиатуру и освобождает окно debounce.
+
+    Если за время редактирования появились новые голоса (изменилась версия)
+    или Telegram ответил RetryAfter, обновление планируется повторно.
+    """
+    from main_bot.keyboards import keyboards
+
+    ver_key = _keys(chat_id, message_id)[2]
+    seen_version = None
+    retry_after = None
+    try:
+        await asyncio.sleep(delay)
+
+        post = await db.published_post.get_published_post_by_id(post_id)
+        if not post or not post.reaction:
+            return
+
+        # Версия читается до голосов: более поздние клики вызовут повторное обновление
+        seen_version = await redis_client.get(ver_key)
+        votes = await get_votes(chat_id, message_id)
+        post.reaction = apply_votes(post.reaction, votes)
+
+        await bot.edit_message_reply_markup(
+            chat_id=chat_id,
+            message_id=message_id,
+            reply_markup=keyboards.post_kb(post=post),
+        )
+    except TelegramRetryAfter as e:
+        logger.warning(f"Реакции: RetryAfter {e.retry_after}с для {chat_id}/{message_id}")
+        retry_after = e.retry_after
+    except TelegramBadRequest as e:
+        if "message is not modified" not in str(e).lower():
+            logger.error(f"Ошибка обновления реакций {chat_id}/{message_id}: {e}")
+    finally:
+        # Окно освобождается до сравнения версий: клик после этого сам займет окно
+        await redis_client.delete(lock_key)
+
+    if retry_after is not None:
+        await schedule_markup_refresh(bot, post_id, chat_id, message_id, delay=retry_after)
+    elif seen_version is not None and await redis_client.get(ver_key) != seen_version:
+        await schedule_markup_refresh(bot, post_id, chat_id, message_id)
+
+
+async def flush_reactions() -> None:
+    """
+    Периодическая задача: сброс голосов из Redis в колонку `reaction` Postgres.
+
+    Обрабатывает только сообщения, в которых были изменения с прошлого сброса.
+    """
+    members = await redis_client.spop(REACTION_DIRTY_KEY, REACTION_FLUSH_BATCH)
+    if not members:
+        return
+
+    try:
+        updates = []
+        for member in members:
+            post_id, chat_id, message_id = (int(x) for x in member.decode().split(":"))
+            post = await db.published_post.get_published_post_by_id(post_id)
+            if not post or not post.reaction:
+                continue
+
+            votes = await get_votes(chat_id, message_id)
+            updates.append(
+                {"id": post_id, "reaction": apply_votes(post.reaction, votes)}
+            )
+
+        await db.published_post.update_published_posts_batch(updates)
+    except Exception:
+        # Возвращаем сообщения в очередь, чтобы не потерять голоса
+        await redis_client.sadd(REACTION_DIRTY_KEY, *members)
+        raise
+
+    logger.debug(f"Реакции: сброшено в БД {len(updates)} постов")
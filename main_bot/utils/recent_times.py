@@ -4,6 +4,8 @@
 """
 
 import logging
+from typing import Optional
+
 from main_bot.utils.redis_client import redis_client
 
 logger = logging.getLogger(__name__)
@@ -11,7 +13,7 @@ logger = logging.getLogger(__name__)
 RECENT_TIMES_KEY = "recent_times:{}"
 
 
-async def get_recent_times(user_id: int) -> list[str]:
+async def get_recent_times(user_id: int) -> Optional[list[str]]:
     """
     Получает список 3 последних выбранных временных меток пользователя.
 
@@ -19,7 +21,8 @@ async def get_recent_times(user_id: int) -> list[str]:
         user_id: ID пользователя Telegram.
 
     Returns:
-        Список строк в формате "HH:MM".
+        Список строк в формате "HH:MM" или None при ошибке Redis
+        (такой результат не кэшируется в FSM).
     """
     if not redis_client:
         return []
@@ -30,31 +33,41 @@ async def get_recent_times(user_id: int) -> list[str]:
         return [t.decode() for t in times]
     except Exception as e:
         logger.error(f"Ошибка при получении последних времен из Redis для {user_id}: {e}")
-        return []
+        return None
 
 
-async def save_recent_time(user_id: int, time_str: str):
+async def save_recent_time(user_id: int, time_str: str) -> Optional[list[str]]:
     """
     Сохраняет выбранное время в список последних времен пользователя.
     Поддерживает только 3 последних уникальных значения.
 
+    Все шаги выполняются одной транзакцией (MULTI/EXEC) за один запрос к Redis.
+
     Args:
         user_id: ID пользователя Telegram.
         time_str: Строка времени в формате "HH:MM".
+
+    Returns:
+        Обновленный список последних времен (для кэширования в FSM)
+        или None при ошибке Redis — тогда кэш в FSM не обновляется.
     """
     if not redis_client:
-        return
+        return []
 
     try:
         key = RECENT_TIMES_KEY.format(user_id)
-        
-        # Удаляем существующее такое же значение, чтобы переместить его в начало
-        await redis_client.lrem(key, 0, time_str)
-        
-        # Добавляем в начало списка
-        await redis_client.lpush(key, time_str)
-        
-        # Ограничиваем список 3 элементами
-        await redis_client.ltrim(key, 0, 2)
+
+        async with redis_client.pipeline(transaction=True) as pipe:
+            # Удаляем существующее такое же значение, чтобы переместить его в начало
+            pipe.lrem(key, 0, time_str)
+            # Добавляем в начало списка
+            pipe.lpush(key, time_str)
+            # Ограничиваем список 3 элементами
+            pipe.ltrim(key, 0, 2)
+            pipe.lrange(key, 0, 2)
+            *_, times = await pipe.execute()
+
+        return [t.decode() for t in times]
     except Exception as e:
         logger.error(f"Ошибка при сохранении времени в Redis для {user_id}: {e}")
+        return None
@@ -34,9 +34,13 @@ from .channels import (
 from .cleanup import (
     check_subscriptions,
     mt_clients_self_check,
+    reconcile_mt_client_load,
     update_external_channels_stats,
 )
 from .extra import (
+    collect_media_garbage,
+    flush_reaction_counters,
+    refresh_admin_stats_rollup,
     update_exchange_rates_in_db,
 )
 from .posts import (
@@ -151,6 +155,15 @@ def init_scheduler(scheduler: AsyncIOScheduler) -> None:
     except Exception:
         pass
 
+    # Сверка нагрузки internal MT клиентов (потерянные резервы)
+    scheduler.add_job(
+        func=reconcile_mt_client_load,
+        trigger=IntervalTrigger(minutes=15),
+        id="reconcile_mt_client_load_periodic",
+        replace_existing=True,
+        name="Сверка нагрузки MT клиентов",
+    )
+
     # Обслуживание внешних каналов (ОТКЛЮЧЕНО ПО ЗАПРОСУ - ПРИВОДИТ К FROZEN)
     try:
         scheduler.remove_job("update_external_channels_periodic")
@@ -169,6 +182,34 @@ def init_scheduler(scheduler: AsyncIOScheduler) -> None:
         name="Обновление курсов валют",
     )
 
+    # Пересчет сводки админ-аналитики (stats_rollup)
+    stats_rollup_timer = int(os.getenv("STATS_ROLLUP_TIMER", "600"))
+    scheduler.add_job(
+        func=refresh_admin_stats_rollup,
+        trigger=IntervalTrigger(seconds=stats_rollup_timer),
+        id="refresh_admin_stats_rollup_periodic",
+        replace_existing=True,
+        name="Пересчет сводки админ-аналитики",
+    )
+
+    # Сброс счетчиков реакций из Redis в Postgres
+    scheduler.add_job(
+        func=flush_reaction_counters,
+        trigger=IntervalTrigger(seconds=60),
+        id="flush_reaction_counters_periodic",
+        replace_existing=True,
+        name="Сброс счетчиков реакций в БД",
+    )
+
+    # Удаление медиафайлов, на которые не ссылается ни один пост
+    scheduler.add_job(
+        func=collect_media_garbage,
+        trigger=IntervalTrigger(hours=1),
+        id="collect_media_garbage_periodic",
+        replace_existing=True,
+        name="Сборка мусора медиафайлов",
+    )
+
     # === AD STATS ===
     # Сбор статистики рекламы (Admin Log)
     # Используем `process_ad_stats` с IntervalTrigger
@@ -203,9 +244,13 @@ __all__ = [
     # Очистка и обслуживание
     "check_subscriptions",
     "mt_clients_self_check",
+    "reconcile_mt_client_load",
     "update_external_channels_stats",
     # Вспомогательные
     "update_exchange_rates_in_db",
+    "refresh_admin_stats_rollup",
+    "flush_reaction_counters",
+    "collect_media_garbage",
     # Channels
     "register_channel_jobs",
     "update_channel_stats",
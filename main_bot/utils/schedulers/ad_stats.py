@@ -9,9 +9,10 @@ import asyncio
 import logging
 import time
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
+from telethon import TelegramClient
 from telethon.tl.types import (
     ChannelAdminLogEventActionParticipantJoinByInvite,
     ChannelAdminLogEventActionParticipantLeave,
@@ -22,11 +23,15 @@ from main_bot.database.db import db
 from main_bot.database.channel.model import Channel
 from main_bot.database.ad_purchase.model import AdPurchase, AdPurchaseLinkMapping
 from main_bot.database.db_types import AdTargetType
+from main_bot.database.mt_client.model import MtClient
 from main_bot.utils.session_manager import SessionManager
 from utils.error_handler import safe_handler
 
 logger = logging.getLogger(__name__)
 
+# Сколько MT клиентов сканируют админ-логи одновременно
+AD_STATS_MAX_CLIENTS = 5
+
 
 async def ad_stats_worker() -> None:
     """
@@ -80,21 +85,20 @@ async def process_ad_stats() -> None:
     if not active_purchases:
         return
 
-    # 3. Собираем ВСЕ привязки (mappings) по всем закупкам
+    # 3. Собираем ВСЕ привязки (mappings) по всем закупкам одним запросом
     # Группируем их по каналу, чтобы сделать только ОДИН запрос Admin Log на канал
     all_channel_mappings = {} # {channel_id: [mappings]}
 
-    for purchase in active_purchases:
-        mappings = await db.ad_purchase.get_link_mappings(purchase.id)
-        for m in mappings:
-            if (
-                m.target_type == AdTargetType.CHANNEL
-                and m.track_enabled
-                and m.target_channel_id
-            ):
-                if m.target_channel_id not in all_channel_mappings:
-                    all_channel_mappings[m.target_channel_id] = []
-                all_channel_mappings[m.target_channel_id].append(m)
+    mappings = await db.fetch(
+        select(AdPurchaseLinkMapping).where(
+            AdPurchaseLinkMapping.ad_purchase_id.in_([p.id for p in active_purchases]),
+            AdPurchaseLinkMapping.target_type == AdTargetType.CHANNEL,
+            AdPurchaseLinkMapping.track_enabled.is_(True),
+            AdPurchaseLinkMapping.target_channel_id.is_not(None),
+        )
+    )
+    for m in mappings:
+        all_channel_mappings.setdefault(m.target_channel_id, []).append(m)
 
     if not all_channel_mappings:
         logger.debug("Нет активных привязок для отслеживания статистики")
@@ -102,32 +106,62 @@ async def process_ad_stats() -> None:
 
     logger.info(f"📊 Обработка статистики для {len(all_channel_mappings)} уникальных каналов")
 
-    # 4. Обрабатываем каждый канал ровно один раз
+    # 4. Распределяем каналы по MT клиентам: одна сессия на клиента,
+    # разные клиенты сканируют свои каналы параллельно
+    client_channels = {}  # {client_id: (client, [(channel_id, mappings)])}
     for channel_id, combined_maps in all_channel_mappings.items():
-        await process_channel_logs(channel_id, combined_maps)
+        client_model = await db.mt_client_channel.get_preferred_for_stats(channel_id)
+        if not client_model:
+            client_model = await db.mt_client_channel.get_any_client_for_channel(
+                channel_id
+            )
+        if not client_model or not client_model.client:
+            continue
+
+        client = client_model.client
+        client_channels.setdefault(client.id, (client, []))[1].append(
+            (channel_id, combined_maps)
+        )
 
+    semaphore = asyncio.Semaphore(AD_STATS_MAX_CLIENTS)
 
-async def process_channel_logs(
-    channel_id: int, mappings: List[AdPurchaseLinkMapping]
+    async def run_client(client, channels) -> None:
+        async with semaphore:
+            await process_client_channels(client, channels)
+
+    await asyncio.gather(
+        *(run_client(client, channels) for client, channels in client_channels.values())
+    )
+
+
+def normalize_link(link: str) -> str:
+    """Приводит пригласительную ссылку к виду для сравнения (без схемы и домена)."""
+    if not link:
+        return ""
+    return (
+        link.replace("https://", "")
+        .replace("http://", "")
+        .replace("t.me/", "")
+        .replace("telegram.me/", "")
+        .replace("+", "")
+        .strip()
+    )
+
+
+async def process_client_channels(
+    client_model: MtClient, channels: List[Tuple[int, List[AdPurchaseLinkMapping]]]
 ) -> None:
     """
-    Получает и обрабатывает админ-логи для конкретного канала и сверяет с привязками.
+    Сканирует админ-логи каналов одним MT клиентом (одна сессия на все каналы).
 
     Аргументы:
-        channel_id (int): ID канала для сканирования.
-        mappings (List[AdPurchaseLinkMapping]): Список привязок ссылок для этого канала.
+        client_model (MtClient): MT клиент.
+        channels (List[Tuple]): Пары (ID канала, привязки ссылок канала).
     """
-    client_model = await db.mt_client_channel.get_preferred_for_stats(channel_id)
-    if not client_model:
-        client_model = await db.mt_client_channel.get_any_client_for_channel(channel_id)
-
-    if not client_model or not client_model.client:
-        return
-
-    session_path = Path(client_model.client.session_path)
+    session_path = Path(client_model.session_path)
     if not session_path.exists():
         logger.warning(
-            f"Файл сессии не найден для клиента {client_model.client.id}: {session_path}"
+            f"Файл сессии не найден для клиента {client_model.id}: {session_path}"
         )
         return
 
@@ -142,87 +176,92 @@ async def process_channel_logs(
                     f"Не удалось загрузить сессию для клиента {client_model.id} или нет авторизации"
                 )
                 return
+        except Exception as e:
+            logger.error(f"Ошибка инициализации клиента в ad_stats: {e}")
+            return
 
-            client = manager.client
-
-            min_scanned_id = min((m.last_scanned_id for m in mappings), default=0)
-
+        for channel_id, mappings in channels:
             try:
-                # Telethon: iter_admin_log
-                # Нам нужны события вступления и выхода
-                async for event in client.iter_admin_log(
-                    entity=channel_id,
-                    limit=None,
-                    min_id=min_scanned_id,
-                    join=True,
-                    leave=True,
-                    invite=True,
-                ):
-                    event_id = event.id
-                    user_id = event.user_id
-
-                    # --- JOIN BY INVITE ---
-                    if isinstance(
-                        event.action, ChannelAdminLogEventActionParticipantJoinByInvite
-                    ):
-                        invite_link = event.action.invite.link
-
-                        if invite_link:
-
-                            def normalize_link(link: str) -> str:
-                                if not link:
-                                    return ""
-                                return (
-                                    link.replace("https://", "")
-                                    .replace("http://", "")
-                                    .replace("t.me/", "")
-                                    .replace("telegram.me/", "")
-                                    .replace("+", "")
-                                    .strip()
-                                )
-
-                            norm_event_link = normalize_link(invite_link)
-
-                            # Проверяем, принадлежит ли эта ссылка какой-либо привязке
-                            for m in mappings:
-                                if normalize_link(m.invite_link) == norm_event_link:
-                                    await db.ad_purchase.process_join_event(
-                                        channel_id=channel_id,
-                                        user_id=user_id,
-                                        invite_link=m.invite_link,  # Используем ссылку из БД для согласованности
-                                    )
-                                    logger.info(
-                                        f"Обработан JOIN через AdminLog: Пользователь {user_id} -> Закупка {m.ad_purchase_id}"
-                                    )
-
-                    # --- LEAVE EVENT ---
-                    elif isinstance(
-                        event.action, ChannelAdminLogEventActionParticipantLeave
-                    ):
-                        # update_subscription_status обрабатывает логику по (user_id, channel_id)
-                        await db.ad_purchase.update_subscription_status(
-                            user_id=user_id, channel_id=channel_id, status="left"
-                        )
-                        logger.info(
-                            f"Обработан LEAVE через AdminLog: Пользователь {user_id} в канале {channel_id}"
-                        )
-
-                    # Обновляем максимальный сканированный ID для ВСЕХ привязок этого канала
-                    # Это немного неточно, если событий много и мы упадем посередине, но приемлемо
-                    for m in mappings:
-                        if event_id > m.last_scanned_id:
-                            q = (
-                                update(AdPurchaseLinkMapping)
-                                .where(AdPurchaseLinkMapping.id == m.id)
-                                .values(last_scanned_id=event_id)
-                            )
-                            await db.execute(q)
-                            m.last_scanned_id = event_id
-
+                await process_channel_logs(manager.client, channel_id, mappings)
             except Exception as e:
                 logger.error(
                     f"Ошибка получения админ-лога для канала {channel_id}: {e}"
                 )
 
-        except Exception as e:
-            logger.error(f"Ошибка инициализации клиента в ad_stats: {e}")
+
+async def process_channel_logs(
+    client: TelegramClient, channel_id: int, mappings: List[AdPurchaseLinkMapping]
+) -> None:
+    """
+    Получает и обрабатывает админ-логи для конкретного канала и сверяет с привязками.
+
+    Лог читается от новых событий к старым и останавливается на водяном знаке
+    (минимальный last_scanned_id привязок). Водяной знак сохраняется одним
+    запросом после полного прохода: при ошибке следующий запуск повторит скан.
+
+    Аргументы:
+        client (TelegramClient): Авторизованный MT клиент.
+        channel_id (int): ID канала для сканирования.
+        mappings (List[AdPurchaseLinkMapping]): Список привязок ссылок для этого канала.
+    """
+    # Индекс нормализованная ссылка -> привязка (строится один раз на канал)
+    link_index = {normalize_link(m.invite_link): m for m in mappings if m.invite_link}
+    watermark = min((m.last_scanned_id for m in mappings), default=0)
+    max_event_id = watermark
+
+    # Telethon: iter_admin_log
+    # Нам нужны события вступления и выхода
+    async for event in client.iter_admin_log(
+        entity=channel_id,
+        limit=None,
+        min_id=watermark,
+        join=True,
+        leave=True,
+        invite=True,
+    ):
+        event_id = event.id
+        if event_id <= watermark:
+            break
+        max_event_id = max(max_event_id, event_id)
+        user_id = event.user_id
+
+        # --- JOIN BY INVITE ---
+        if isinstance(event.action, ChannelAdminLogEventActionParticipantJoinByInvite):
+            invite_link = event.action.invite.link
+            m = link_index.get(normalize_link(invite_link)) if invite_link else None
+
+            # Событие уже учтено для этой привязки в прошлых запусках
+            if m and event_id > m.last_scanned_id:
+                await db.ad_purchase.process_join_event(
+                    channel_id=channel_id,
+                    user_id=user_id,
+                    invite_link=m.invite_link,  # Используем ссылку из БД для согласованности
+                )
+                logger.info(
+                    f"Обработан JOIN через AdminLog: Пользователь {user_id} -> Закупка {m.ad_purchase_id}"
+                )
+
+        # --- LEAVE EVENT ---
+        elif isinstance(event.action, ChannelAdminLogEventActionParticipantLeave):
+            # update_subscription_status обрабатывает логику по (user_id, channel_id)
+            await db.ad_purchase.update_subscription_status(
+                user_id=user_id, channel_id=channel_id, status="left"
+            )
+            logger.info(
+                f"Обработан LEAVE через AdminLog: Пользователь {user_id} в канале {channel_id}"
+            )
+
+    # Один UPDATE водяного знака на канал за запуск
+    stale_ids = [m.id for m in mappings if m.last_scanned_id < max_event_id]
+    if stale_ids:
+        await db.execute(
+            update(AdPurchaseLinkMapping)
+            .where(AdPurchaseLinkMapping.id.in_(stale_ids))
+            .values(
+                last_scanned_id=func.greatest(
+                    AdPurchaseLinkMapping.last_scanned_id, max_event_id
+                )
+            )
+        )
+        for m in mappings:
+            m.last_scanned_id = max(m.last_scanned_id, max_event_id)
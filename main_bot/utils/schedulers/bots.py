@@ -25,6 +25,7 @@ from main_bot.database.db_types import Status
 from main_bot.database.user_bot.model import UserBot
 from main_bot.utils.bot_manager import BotManager
 from main_bot.utils.file_utils import TEMP_DIR
+from main_bot.utils.message_utils import delete_messages_bulk
 from main_bot.utils.schemas import MessageOptionsHello
 from utils.error_handler import safe_handler
 
@@ -48,20 +49,32 @@ async def delete_bot_posts(
         if not await bot_manager.status():
             return
 
+        # Группируем по чатам: deleteMessages принимает до 100 ID одного чата
+        chat_messages: Dict[int, List[int]] = {}
         for message in message_ids:
+            chat_messages.setdefault(message["chat_id"], []).append(
+                message["message_id"]
+            )
+
+        failed = 0
+        for chat_id, chat_message_ids in chat_messages.items():
             try:
-                await bot_manager.bot.delete_message(**message)
-            except (TelegramForbiddenError, TelegramBadRequest) as e:
-                # Ошибки прав или деактивации пользователя/бота — логируем предупреждение
-                logger.warning(
-                    f"Не удалось удалить сообщение бота в чате {message.get('chat_id')}: {e.message}"
+                failed += len(
+                    await delete_messages_bulk(
+                        bot_manager.bot, chat_id, chat_message_ids
+                    )
                 )
             except Exception as e:
-                # Прочие ошибки: если сообщение не найдено — это нормально (удалено вручную)
-                if "message to delete not found" not in str(e).lower():
-                    logger.error(
-                        f"Критическая ошибка при удалении сообщения бота: {e}", exc_info=True
-                    )
+                logger.error(
+                    f"Критическая ошибка при удалении сообщений бота в чате {chat_id}: {e}",
+                    exc_info=True,
+                )
+
+        if failed:
+            # Ошибки прав или деактивации пользователя/бота
+            logger.warning(
+                f"Бот {user_bot.id}: не удалось удалить {failed} из {len(message_ids)} сообщений"
+            )
 
 
 @safe_handler("Боты: удаление сообщений (Background)", log_start=False)
@@ -70,6 +83,7 @@ async def start_delete_bot_posts() -> None:
     Периодическая задача по очистке сообщений ботов с истекшим временем жизни.
     """
     bot_posts = await db.bot_post.get_bot_posts_for_clear_messages()
+    cleared_ids = []
 
     for bot_post in bot_posts:
         # Проверка времени удаления (время старта + задержка удаления)
@@ -88,13 +102,10 @@ async def start_delete_bot_posts() -> None:
                     delete_bot_posts(user_bot, messages[bot_id]["message_ids"])
                 )
 
-        # Помечаем пост как удаленный и очищаем список ID сообщений
-        await db.bot_post.update_bot_post(
-            post_id=bot_post.id, 
-            deleted_at=int(time.time()), 
-            status=Status.DELETED,
-            message_ids=None
-        )
+        cleared_ids.append(bot_post.id)
+
+    # Помечаем посты как удаленные и очищаем списки ID сообщений одним UPDATE
+    await db.bot_post.mark_bot_posts_cleared(cleared_ids)
 
 
 async def send_bot_messages(
@@ -4,6 +4,7 @@
 Этот модуль содержит функции для:
 - Проверки подписок и уведомлений пользователей
 - Самопроверки MT клиентов
+- Сверки нагрузки internal MT клиентов
 """
 
 import asyncio
@@ -281,6 +282,20 @@ async def mt_clients_self_check() -> None:
                 is_active=False,
             )
 
+
+@safe_handler("Очистка: сверка нагрузки MT клиентов", log_start=False)
+async def reconcile_mt_client_load() -> None:
+    """
+    Периодическая задача: сверка assigned_channels с mt_client_channels.
+
+    Возвращает счетчику нагрузки значение по фактическим связям, если резерв
+    клиента не был снят (процесс упал во время назначения канала).
+    """
+    fixed = await db.mt_client.reconcile_assigned_channels()
+    if fixed:
+        logger.warning(f"Исправлена нагрузка MT клиентов (потерянные резервы): {fixed}")
+
+
 @safe_handler("Обслуживание: обновление внешних каналов", log_start=False)
 async def update_external_channels_stats() -> None:
     """
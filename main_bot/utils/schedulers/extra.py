@@ -3,6 +3,8 @@
 
 Этот модуль содержит функции для:
 - Обновления курсов валют
+- Пересчета сводки админ-аналитики
+- Сброса счетчиков реакций из Redis в БД
 """
 
 import asyncio
@@ -14,6 +16,8 @@ from main_bot.utils.exchange_rates import (
     get_update_of_exchange_rates,
     get_exchange_rates_from_json,
 )
+from main_bot.utils.media_manager import MediaManager
+from main_bot.utils.reactions import flush_reactions
 from utils.error_handler import safe_handler
 
 logger = logging.getLogger(__name__)
@@ -25,7 +29,7 @@ async def update_exchange_rates_in_db() -> None:
     Периодическая задача: обновление курсов валют в БД.
 
     Получает актуальные курсы валют из внешнего API и обновляет их в базе данных.
-    Если курсы отсутствуют в БД (нет записей), инициализирует их из локального JSON файла.
+    Справочник курсов берется из локального JSON файла, отсутствующие записи создаются.
     """
     # Получение текущего времени по МСК
     last_update = datetime.now(timezone(timedelta(hours=3))).replace(tzinfo=None)
@@ -48,25 +52,47 @@ async def update_exchange_rates_in_db() -> None:
 
     logger.info(f"Получены курсы валют: {new_update}")
 
-    # Проверка наличия курсов в БД
-    all_exchange_rate = await db.exchange_rate.get_all_exchange_rate()
-    if len(all_exchange_rate) == 0:
-        # Инициализация курсов из JSON файла
-        json_format_exchange_rate = get_exchange_rates_from_json()
-        for exchange_rate in json_format_exchange_rate:
-            ed_id = int(exchange_rate["id"])
-            await db.exchange_rate.add_exchange_rate(
-                id=ed_id,
-                name=exchange_rate["name"],
-                rate=new_update.get(ed_id, 0.0),
-                last_update=last_update,
-            )
-    else:
-        # Обновление существующих курсов
-        for er_id in new_update.keys():
-            if new_update[er_id] != 0:
-                await db.exchange_rate.update_exchange_rate(
-                    exchange_rate_id=er_id,
-                    rate=new_update[er_id],
-                    last_update=last_update,
-                )
+    # Все курсы из справочника записываются одним upsert-запросом:
+    # отсутствующие создаются, нулевые значения не затирают сохраненные
+    rows = [
+        {
+            "id": int(exchange_rate["id"]),
+            "name": exchange_rate["name"],
+            "rate": new_update.get(int(exchange_rate["id"]), 0.0),
+            "last_update": last_update,
+        }
+        for exchange_rate in get_exchange_rates_from_json()
+    ]
+    await db.exchange_rate.upsert_exchange_rates(rows)
+
+
+@safe_handler("Аналитика: пересчет сводки (Background)", log_start=False)
+async def refresh_admin_stats_rollup() -> None:
+    """
+    Периодическая задача: пересчет сводки админ-аналитики (stats_rollup).
+
+    Считает отток, среднюю длительность подписок и топы пользователей,
+    чтобы админ-панель не агрегировала таблицы на каждое открытие.
+    """
+    rollup = await db.stats.refresh_rollup()
+    if rollup:
+        logger.debug(
+            f"Сводка аналитики обновлена: churn={rollup.churn_rate}%, "
+            f"активных подписок={rollup.active_subscriptions}"
+        )
+
+
+@safe_handler("Реакции: сброс счетчиков в БД (Background)", log_start=False)
+async def flush_reaction_counters() -> None:
+    """
+    Периодическая задача: сброс голосов реакций из Redis в Postgres.
+    """
+    await flush_reactions()
+
+
+@safe_handler("Медиа: сборка мусора (Background)", log_start=False)
+async def collect_media_garbage() -> None:
+    """
+    Периодическая задача: удаление локальных медиафайлов без ссылок из постов.
+    """
+    await MediaManager.collect_garbage()
@@ -29,6 +29,7 @@ from main_bot.keyboards import keyboards
 from main_bot.keyboards.common import Reply
 from main_bot.utils.tg_utils import set_channel_session
 from main_bot.utils.lang.language import text
+from main_bot.utils.message_utils import delete_messages_bulk
 from main_bot.utils.cpm_utils import generate_cpm_report
 from main_bot.utils.report_signature import get_report_signatures
 from main_bot.utils.schemas import MessageOptions
@@ -594,6 +595,9 @@ async def delete_posts():
         chat_groups[post.chat_id].append(post)
 
     row_ids = []
+    views_updates = []
+    # chat_id -> Channel (уже загружены вместе с просмотрами, для CPM отчетов)
+    channels = {}
     # post_id -> [message_stats] для формирования отчетов админам
     post_reports = {}
 
@@ -601,6 +605,10 @@ async def delete_posts():
         try:
             message_ids = [p.message_id for p in group_posts]
             views_map, channel = await get_views_for_batch(chat_id, message_ids)
+            channels[chat_id] = channel
+
+            # Удаление из Telegram пачками (deleteMessages)
+            failed_ids = set(await delete_messages_bulk(bot, chat_id, message_ids))
 
             for post in group_posts:
                 views = views_map.get(post.message_id, 0)
@@ -632,12 +640,9 @@ async def delete_posts():
                     }
                 )
 
-                # Удаление из Telegram
-                try:
-                    await bot.delete_message(post.chat_id, post.message_id)
-                except Exception as e:
+                if post.message_id in failed_ids:
                     logger.error(
-                        f"Ошибка удаления сообщения {post.message_id} в {post.chat_id}: {e}"
+                        f"Ошибка удаления сообщения {post.message_id} в {post.chat_id}"
                     )
                     try:
                         await bot.send_message(
@@ -670,14 +675,7 @@ async def delete_posts():
                         db_updates["views_72h"] = views
 
                 if db_updates:
-                    from sqlalchemy import update as sqlalchemy_update
-
-                    upd_stmt = (
-                        sqlalchemy_update(PublishedPost)
-                        .where(PublishedPost.id == post.id)
-                        .values(**db_updates)
-                    )
-                    await db.execute(upd_stmt)
+                    views_updates.append({"id": post.id, **db_updates})
 
                     # Обновляем объект в памяти для отчета
                     for k, v in db_updates.items():
@@ -687,6 +685,9 @@ async def delete_posts():
         except Exception as e:
             logger.error(f"Ошибка при пакетном удалении в канале {chat_id}: {e}")
 
+    # Финальные просмотры всех постов одной транзакцией
+    await db.published_post.update_published_posts_batch(views_updates)
+
     # Отправка сводных отчетов по каждому post_id (если есть CPM)
     for post_id, message_objects in post_reports.items():
         if not message_objects:
@@ -705,7 +706,8 @@ async def delete_posts():
                 user=user,
                 post_id=post_id,
                 related_posts=[obj["post_obj"] for obj in message_objects],
-                bot=bot
+                bot=bot,
+                channels=channels,
             )
 
             if not report_text:
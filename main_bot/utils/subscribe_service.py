@@ -4,7 +4,6 @@
 Содержит функции для выдачи и продления подписок на доступ к каналам и ботам.
 """
 
-import time
 import logging
 from typing import List
 
@@ -15,57 +14,41 @@ logger = logging.getLogger(__name__)
 
 async def grant_subscription(
     user_id: int, chosen: List[int], total_days: int, service: str, object_type: str
-):
+) -> List[int]:
     """
     Выдача подписки на указанные объекты (каналы или боты).
 
+    Все объекты продлеваются одним UPDATE ... RETURNING, поэтому заказ
+    выдается целиком или не выдается вовсе.
+
     Args:
         user_id: ID пользователя
         chosen: Список chat_id (для каналов) или id (для ботов)
         total_days: Количество дней подписки
         service: Тип сервиса (например, 'subscribe' или 'stories')
         object_type: Тип объекта ('channels' или 'bots')
+
+    Returns:
+        Список ID объектов, которые не найдены (подписка им не выдана)
     """
     added_seconds = 86400 * int(total_days)
-    now = int(time.time())
+    # Принудительное приведение для JSON-данных
+    object_ids = list({int(obj_id) for obj_id in chosen})
 
     logger.info(
-        f"Выдача подписки: user_id={user_id}, объектов={len(chosen)}, тип={object_type}, дней={total_days}"
+        f"Выдача подписки: user_id={user_id}, объектов={len(object_ids)}, тип={object_type}, дней={total_days}"
     )
 
-    for obj_id in chosen:
-        obj_id = int(obj_id)  # Принудительное приведение для JSON-данных
-        try:
-            if object_type == "channels":
-                channel = await db.channel.get_channel_by_chat_id(chat_id=obj_id)
-                if not channel:
-                    logger.warning(f"Канал {obj_id} не найден при выдаче подписки")
-                    continue
-
-                current_sub = channel.subscribe or 0
-                new_sub = (max(current_sub, now)) + added_seconds
-
-                await db.channel.update_channel_by_chat_id(
-                    chat_id=obj_id, subscribe=new_sub
-                )
-                logger.info(f"Подписка канала {obj_id} ({channel.title}) продлена до {new_sub}")
-
-            else:  # bots
-                user_bot = await db.user_bot.get_bot_by_id(row_id=obj_id)
-                if not user_bot:
-                    logger.warning(f"Бот ID {obj_id} не найден при выдаче подписки")
-                    continue
-
-                current_sub = user_bot.subscribe or 0
-                new_sub = (max(current_sub, now)) + added_seconds
+    if object_type == "channels":
+        granted = await db.channel.extend_subscriptions(object_ids, added_seconds)
+    else:  # bots
+        granted = await db.user_bot.extend_subscriptions(object_ids, added_seconds)
 
-                await db.user_bot.update_bot_by_id(
-                    row_id=obj_id, subscribe=new_sub
-                )
-                logger.info(f"Подписка бота {obj_id} ({user_bot.title}) продлена до {new_sub}")
+    missing = sorted(set(object_ids) - set(granted))
+    if missing:
+        logger.warning(
+            f"Подписка не выдана: {object_type} не найдены: {missing} (user_id={user_id})"
+        )
 
-        except Exception as e:
-            logger.error(
-                f"Ошибка выдачи подписки объекту {obj_id} ({object_type}): {e}",
-                exc_info=True,
-            )
+    logger.info(f"Подписка продлена на {total_days} дн. для {len(granted)} объектов ({object_type})")
+    return missing
@@ -0,0 +1,176 @@
+"""
+Потоковый импорт и экспорт базы пользователей ботов-помощников.
+
+Разбор загруженных файлов и запись выгрузок выполняются в отдельном потоке
+(executor) порциями, поэтому event loop не блокируется, а потребление памяти
+не зависит от размера базы:
+- импорт читает txt/csv построчно, xlsx — openpyxl в режиме read_only;
+- экспорт читает ID из БД keyset-страницами и пишет txt/csv построчно,
+  xlsx — openpyxl в режиме write_only.
+"""
+
+import asyncio
+import csv
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterator
+
+from openpyxl import Workbook, load_workbook
+
+from hello_bot.database.db import Database
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 5000  # ID в одной порции вставки
+EXPORT_PAGE_SIZE = 5000  # ID в одной странице выгрузки
+
+# Пул потоков для разбора и записи файлов
+_executor = ThreadPoolExecutor(max_workers=2)
+
+
+def _parse_id(value) -> int | None:
+    """Приводит значение ячейки/строки к ID пользователя."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+
+def _iter_values(filepath: str, extension: str) -> Iterator:
+    """Построчно отдает значения первой колонки файла."""
+    if extension == "txt":
+        with open(filepath, "r", encoding="utf-8-sig") as file:
+            for line in file:
+                yield line
+    elif extension == "csv":
+        with open(filepath, "r", encoding="utf-8-sig", newline="") as file:
+            for row in csv.reader(file):
+                if row:
+                    yield row[0]
+    else:
+        workbook = load_workbook(filepath, read_only=True)
+        try:
+            for row in workbook.active.iter_rows(max_col=1, values_only=True):
+                yield row[0]
+        finally:
+            workbook.close()
+
+
+def _iter_id_chunks(filepath: str, extension: str) -> Iterator[list[int]]:
+    """Группирует ID из файла в порции по IMPORT_CHUNK_SIZE."""
+    chunk = []
+    for value in _iter_values(filepath, extension):
+        user_id = _parse_id(value)
+        if user_id is None:
+            continue
+
+        chunk.append(user_id)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+async def iter_import_chunks(filepath: str, extension: str) -> AsyncIterator[list[int]]:
+    """
+    Асинхронно отдает ID пользователей из файла порциями.
+
+    Чтение и разбор каждой порции выполняются в executor.
+
+    Аргументы:
+        filepath (str): Путь к файлу.
+        extension (str): Расширение (txt, csv, xlsx).
+    """
+    loop = asyncio.get_running_loop()
+    chunks = _iter_id_chunks(filepath, extension)
+
+    try:
+        while True:
+            chunk = await loop.run_in_executor(_executor, next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        chunks.close()
+
+
+class _ExportWriter:
+    """Построчная запись выгрузки в txt, csv или xlsx (write_only)."""
+
+    def __init__(self, filepath: str, export_format: str) -> None:
+        self.filepath = filepath
+        self.export_format = export_format
+        self._file = None
+        self._writer = None
+        self._workbook = None
+        self._sheet = None
+
+        if export_format == "xlsx":
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet()
+            self._sheet.append(["id"])
+        elif export_format == "csv":
+            self._file = open(filepath, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(["id"])
+        else:
+            self._file = open(filepath, "w", encoding="utf-8")
+
+    def write(self, user_ids: list[int]) -> None:
+        """Дописывает порцию ID."""
+        if self._sheet is not None:
+            for user_id in user_ids:
+                self._sheet.append([user_id])
+        elif self._writer is not None:
+            self._writer.writerows([user_id] for user_id in user_ids)
+        else:
+            self._file.writelines(f"{user_id}\n" for user_id in user_ids)
+
+    def close(self) -> None:
+        """Завершает запись файла."""
+        if self._workbook is not None:
+            self._workbook.save(self.filepath)
+        if self._file is not None:
+            self._file.close()
+
+
+async def export_user_ids(db_obj: Database, filepath: str, export_format: str) -> int:
+    """
+    Выгружает ID пользователей бота в файл.
+
+    Аргументы:
+        db_obj (Database): БД бота (со схемой).
+        filepath (str): Путь к файлу выгрузки.
+        export_format (str): Формат (txt, csv, xlsx).
+
+    Возвращает:
+        int: Количество выгруженных пользователей.
+    """
+    loop = asyncio.get_running_loop()
+    writer = await loop.run_in_executor(_executor, _ExportWriter, filepath, export_format)
+
+    total = 0
+    try:
+        after_id = 0
+        while True:
+            user_ids = await db_obj.get_user_ids_page(
+                after_id=after_id, limit=EXPORT_PAGE_SIZE
+            )
+            if not user_ids:
+                break
+
+            await loop.run_in_executor(_executor, writer.write, list(user_ids))
+            after_id = user_ids[-1]
+            total += len(user_ids)
+    finally:
+        await loop.run_in_executor(_executor, writer.close)
+
+    logger.debug(f"Экспорт {filepath}: {total} пользователей")
+    return total
@@ -226,8 +226,8 @@ async def set_channel_session(chat_id: int):
         logger.error(f"Канал {chat_id} не найден в базе данных")
         return {"error": "Channel Not Found"}
 
-    # 2. Получить следующего внутреннего клиента используя round-robin
-    client = await db.mt_client.get_next_internal_client(chat_id)
+    # 2. Зарезервировать наименее загруженного внутреннего клиента
+    client = await db.mt_client.reserve_internal_client()
 
     if not client:
         logger.error("Нет активных внутренних клиентов")
@@ -237,6 +237,25 @@ async def set_channel_session(chat_id: int):
         f"🔄 Выбран клиент {client.id} ({client.alias}) для канала {chat_id} используя Least Used (min load)"
     )
 
+    # Резерв снимается в любом случае: при успехе нагрузку учитывает созданная связь
+    try:
+        return await _join_internal_client(client, chat_id, invite_link)
+    finally:
+        await db.mt_client.release_internal_client(client.id)
+
+
+async def _join_internal_client(client, chat_id: int, invite_link: str | None) -> dict:
+    """
+    Вступление зарезервированного клиента в канал и привязка в БД.
+
+    Аргументы:
+        client (MtClient): Зарезервированный internal клиент.
+        chat_id (int): ID канала.
+        invite_link (str | None): Инвайт-ссылка для вступления.
+
+    Возвращает:
+        dict: Результат назначения (success или error).
+    """
     session_path = Path(client.session_path)
     if not session_path.exists():
         logger.error(f"Файл сессии не найден для клиента {client.id}: {session_path}")
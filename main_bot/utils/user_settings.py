@@ -3,6 +3,21 @@ from main_bot.utils.redis_client import redis_client
 # Префикс ключа Redis
 VIEW_MODE_KEY = "view_mode:{}"
 
+# Атомарное переключение режима за один запрос.
+# KEYS: view_mode. Возвращает новый режим.
+_TOGGLE_VIEW_MODE_SCRIPT = """
+local mode = redis.call('GET', KEYS[1])
+if mode == 'channels' then
+    mode = 'folders'
+else
+    mode = 'channels'
+end
+redis.call('SET', KEYS[1], mode)
+return mode
+"""
+
+_toggle_view_mode_script = redis_client.register_script(_TOGGLE_VIEW_MODE_SCRIPT)
+
 
 async def get_user_view_mode(user_id: int) -> str:
     """
@@ -24,3 +39,15 @@ async def set_user_view_mode(user_id: int, mode: str):
     """
     if redis_client:
         await redis_client.set(VIEW_MODE_KEY.format(user_id), mode)
+
+
+async def toggle_user_view_mode(user_id: int) -> str:
+    """
+    Переключает режим просмотра (folders <-> channels) одним запросом к Redis.
+    Returns: новый режим 'folders' или 'channels'
+    """
+    if not redis_client:
+        return "folders"
+
+    mode = await _toggle_view_mode_script(keys=[VIEW_MODE_KEY.format(user_id)])
+    return mode.decode() if isinstance(mode, bytes) else mode
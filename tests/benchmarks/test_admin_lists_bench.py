@@ -0,0 +1,89 @@
+"""
+Замер: латентность страницы списка каналов и оценки количества не растет
+с размером таблицы (1k → 500k строк).
+
+Запуск: RUN_BENCHMARKS=1 TEST_DATABASE_URL=... pytest tests/benchmarks -s
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from main_bot.database.db import db
+
+pytestmark = [pytest.mark.postgres, pytest.mark.benchmark]
+
+SIZES = (1_000, 10_000, 100_000, 500_000)
+REPEATS = 20
+PAGE_LIMIT = 11
+MIGRATION = (
+    Path(__file__).parents[2]
+    / "main_bot/database/migrations/add_admin_lists_indexes.sql"
+)
+
+
+async def _fill_channels(engine, total: int) -> None:
+    """Добиваем таблицу до total строк (каждый десятый канал — дубль chat_id)."""
+    async with engine.begin() as conn:
+        current = (await conn.execute(text("SELECT count(*) FROM channels"))).scalar()
+        await conn.execute(
+            text(
+                """
+                INSERT INTO channels (chat_id, title, admin_id, emoji_id, created_timestamp,
+                                      subscribers_count, novastat_24h, novastat_48h, novastat_72h)
+                SELECT -(g - (g % 10 = 0)::int), md5(g::text), g % 7, '0', 0, 0, 0, 0, 0
+                FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g
+                """
+            ),
+            {"start": current + 1, "stop": total},
+        )
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE channels"))
+
+
+async def _timed(coro_factory) -> float:
+    """Медиана времени выполнения (мс)."""
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+async def test_channels_page_latency_is_flat(pg, pooled):
+    # Индексы keyset из миграции (pg_trgm для поиска в замере не нужен)
+    async with pg.begin() as conn:
+        for statement in MIGRATION.read_text().split(";"):
+            if "CREATE" in statement and "trgm" not in statement:
+                await conn.execute(text(statement))
+
+    results = {}
+    for size in SIZES:
+        await _fill_channels(pg, size)
+        async with pg.connect() as conn:
+            # Курсор в последней четверти списка (по названию)
+            deep_id = (
+                await conn.execute(
+                    text("SELECT id FROM channels ORDER BY title, id OFFSET :n LIMIT 1"),
+                    {"n": size * 3 // 4},
+                )
+            ).scalar()
+
+        first = await _timed(lambda: db.channel.get_channels_page(None, False, PAGE_LIMIT))
+        deep = await _timed(lambda: db.channel.get_channels_page(deep_id, False, PAGE_LIMIT))
+        back = await _timed(lambda: db.channel.get_channels_page(deep_id, True, PAGE_LIMIT))
+        results[size] = (first, deep, back)
+        print(
+            f"\n{size:>7} строк: первая {first:6.2f} мс, "
+            f"глубокая {deep:6.2f} мс, назад {back:6.2f} мс"
+        )
+
+    # Без OFFSET и полного COUNT(*) время страницы почти не зависит от размера
+    for column in range(3):
+        small = results[SIZES[0]][column]
+        large = results[SIZES[-1]][column]
+        assert large <= small * 5 + 20
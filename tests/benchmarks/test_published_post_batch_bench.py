@@ -0,0 +1,81 @@
+"""
+Замер: массовое обновление 10k опубликованных постов (executemany по группам
+полей) против прежнего пути (отдельный UPDATE на каждую строку в одной транзакции).
+
+Запуск: RUN_BENCHMARKS=1 TEST_DATABASE_URL=... pytest tests/benchmarks -s
+"""
+
+import time
+
+import pytest
+from sqlalchemy import text, update
+
+from main_bot.database.db import db
+from main_bot.database.published_post.model import PublishedPost
+
+pytestmark = [pytest.mark.postgres, pytest.mark.benchmark]
+
+ROWS = 10_000
+REPEATS = 3
+
+
+async def _per_row(updates: list[dict]) -> None:
+    """Прежняя реализация update_published_posts_batch."""
+    await db.execute_many(
+        [
+            update(PublishedPost)
+            .where(PublishedPost.id == u["id"])
+            .values(**{k: v for k, v in u.items() if k != "id"})
+            for u in updates
+        ]
+    )
+
+
+async def _timed(coro_factory) -> float:
+    """Медиана времени выполнения (мс)."""
+    samples = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+async def test_batch_update_beats_per_row(pg, pooled):
+    async with pg.begin() as conn:
+        await conn.execute(
+            text(
+                """
+                INSERT INTO published_posts (id, post_id, message_id, chat_id, admin_id,
+                                             message_options, report, created_timestamp,
+                                             status, report_24h_sent, report_48h_sent,
+                                             report_72h_sent)
+                SELECT g, g, g, -100, 1, '{}', false, 0, 'active', false, false, false
+                FROM generate_series(1, CAST(:rows AS int)) AS g
+                """
+            ),
+            {"rows": ROWS},
+        )
+
+    # Как в сборе статистики: просмотры 24/48/72ч и реакции у части постов
+    updates = [
+        {"id": i, "views_24h": i, "views_48h": i * 2, "views_72h": i * 3}
+        for i in range(1, ROWS + 1)
+    ]
+    updates[::10] = [
+        {"id": u["id"], "views_24h": u["views_24h"], "reaction": {"rows": []}}
+        for u in updates[::10]
+    ]
+
+    per_row = await _timed(lambda: _per_row(updates))
+    batch = await _timed(lambda: db.published_post.update_published_posts_batch(updates))
+    print(f"\n{ROWS} строк: по строке {per_row:8.1f} мс, пакетно {batch:8.1f} мс")
+
+    async with pg.connect() as conn:
+        total = (
+            await conn.execute(
+                text("SELECT sum(views_24h) FROM published_posts WHERE views_24h = id")
+            )
+        ).scalar()
+    assert total == ROWS * (ROWS + 1) // 2
+    assert batch * 5 < per_row
@@ -0,0 +1,101 @@
+"""
+Общие фикстуры тестов.
+
+Redis подменяется на fakeredis. Тесты с маркером postgres выполняются
+только при заданной TEST_DATABASE_URL, например:
+
+    TEST_DATABASE_URL=postgresql+asyncpg://postgres@localhost/nova_test pytest
+
+Таблицы создаются из моделей перед каждым таким тестом и удаляются после.
+Замеры производительности (маркер benchmark) запускаются с RUN_BENCHMARKS=1.
+"""
+
+import os
+
+# Минимальное окружение, чтобы config.Config импортировался без .env
+for _name, _value in {
+    "BOT_TOKEN": "123456:TEST",
+    "ADMIN_SUPPORT": "0",
+    "ADMINS": "1",
+    "API_ID": "1",
+    "API_HASH": "test",
+    "PG_USER": "test",
+    "PG_PASS": "test",
+    "PG_HOST": "localhost",
+    "PG_DATABASE": "test",
+    "CRYPTO_BOT_TOKEN": "test",
+    "PLATEGA_MERCHANT": "test",
+    "PLATEGA_SECRET": "test",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+import fakeredis
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Пропускает тесты, для которых не задано окружение."""
+    skip_pg = pytest.mark.skip(reason="TEST_DATABASE_URL не задана")
+    skip_bench = pytest.mark.skip(reason="RUN_BENCHMARKS не задана")
+    for item in items:
+        if "postgres" in item.keywords and not TEST_DATABASE_URL:
+            item.add_marker(skip_pg)
+        if "benchmark" in item.keywords and not os.getenv("RUN_BENCHMARKS"):
+            item.add_marker(skip_bench)
+
+
+@pytest.fixture
+def fake_redis():
+    """Клиент fakeredis (с поддержкой Lua-скриптов)."""
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.fixture
+async def pg():
+    """
+    Подключает DatabaseMixin к тестовой базе с чистыми таблицами.
+
+    Возвращает:
+        AsyncEngine: Движок тестовой базы.
+    """
+    from main_bot.database import Base, async_session
+    import main_bot.database.db  # noqa: F401 — регистрирует все модели
+
+    # NullPool: соединения не переживают цикл событий теста
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    previous_bind = async_session.kw.get("bind")
+    async_session.configure(bind=engine)
+    try:
+        yield engine
+    finally:
+        async_session.configure(bind=previous_bind)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+@pytest.fixture
+async def pooled(pg):
+    """
+    Пул соединений, как в приложении, поверх базы из фикстуры pg.
+
+    Подключение не попадает в замеры, а одновременные запросы ждут
+    свободного соединения вместо превышения max_connections сервера.
+    """
+    from main_bot.database import async_session
+
+    engine = create_async_engine(pg.url, pool_size=10, max_overflow=0)
+    async_session.configure(bind=engine)
+    try:
+        yield engine
+    finally:
+        async_session.configure(bind=pg)
+        await engine.dispose()
@@ -0,0 +1,143 @@
+"""
+Тесты повторов и circuit breaker для запросов к платежным провайдерам.
+
+Клиент Platega работает с локальным stub-сервером, которому задаются
+задержка и код ответа для каждого запроса.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from main_bot.utils import http_client
+from main_bot.utils.http_client import ProviderServerError, ProviderUnavailableError
+from main_bot.utils.payments import platega
+from main_bot.utils.payments.platega import Platega
+
+READ_TIMEOUT = 0.2
+
+
+class StubProvider:
+    """Stub-сервер провайдера: ответы по сценарию, журнал запросов."""
+
+    def __init__(self):
+        self.script: list[tuple[float, int]] = []
+        self.hits: list[str] = []
+
+    def respond(self, *steps: tuple[float, int]) -> None:
+        """Задает (задержка, код) для следующих запросов; последний шаг повторяется."""
+        self.script = list(steps)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.hits.append(f"{request.method} {request.path}")
+        delay, status = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        await asyncio.sleep(delay)
+        return web.json_response({"qr": "qr-data", "transactionId": "tx-1"}, status=status)
+
+
+@pytest.fixture
+async def provider(monkeypatch):
+    """Stub-сервер и клиент Platega к нему (без пауз между повторами)."""
+    monkeypatch.setattr(http_client, "RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(
+        platega, "PLATEGA_TIMEOUT", httpx.Timeout(5.0, read=READ_TIMEOUT)
+    )
+
+    stub = StubProvider()
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", stub.handle)
+    server = TestServer(app)
+    await server.start_server()
+
+    client = Platega("merchant", "secret", base_url=str(server.make_url("")))
+    try:
+        yield stub, client
+    finally:
+        await client.close()
+        await server.close()
+
+
+async def test_idempotent_get_retries_5xx_until_success(provider):
+    stub, client = provider
+    stub.respond((0, 503), (0, 502), (0, 200))
+
+    assert await client.h2h_invoice("inv-1") == "qr-data"
+    assert stub.hits == ["GET /h2h/inv-1"] * 3
+    assert client.breaker._failures == 0
+
+
+async def test_retries_are_bounded(provider):
+    stub, client = provider
+    stub.respond((0, 503))
+
+    with pytest.raises(ProviderServerError):
+        await client.h2h_invoice("inv-1")
+    assert len(stub.hits) == http_client.RETRY_ATTEMPTS
+
+
+async def test_latency_over_read_timeout_is_retried_for_get(provider):
+    stub, client = provider
+    stub.respond((READ_TIMEOUT * 3, 200), (0, 200))
+
+    assert await client.h2h_invoice("inv-1") == "qr-data"
+    assert len(stub.hits) == 2
+
+
+async def test_post_is_not_retried_after_request_was_sent(provider):
+    stub, client = provider
+
+    # 5xx: запрос дошел до провайдера, повтор мог бы создать второй платеж
+    stub.respond((0, 503))
+    assert await client.create_invoice("order-1", 100, "test") == {}
+    assert stub.hits == ["POST /transaction/process"]
+
+    # Таймаут чтения: ответ потерян, но запрос уже отправлен
+    stub.hits.clear()
+    stub.respond((READ_TIMEOUT * 3, 200))
+    assert await client.create_invoice("order-2", 100, "test") == {}
+    assert stub.hits == ["POST /transaction/process"]
+
+
+async def test_post_is_retried_when_connection_fails(unused_tcp_port):
+    # Порт никто не слушает: соединение не установлено, запрос не отправлен
+    client = Platega("merchant", "secret", base_url=f"http://127.0.0.1:{unused_tcp_port}")
+    attempts = []
+
+    async def request(*args, **kwargs):
+        attempts.append(args)
+        return await original(*args, **kwargs)
+
+    original = client.client.request
+    client.client.request = request
+    try:
+        with pytest.raises(httpx.ConnectError):
+            await client._request("POST", "/transaction/process", idempotent=False)
+    finally:
+        await client.close()
+    assert len(attempts) == http_client.RETRY_ATTEMPTS
+
+
+async def test_breaker_opens_and_stops_requests(provider):
+    stub, client = provider
+    stub.respond((0, 500))
+
+    # Порог breaker — 5 ошибок подряд: две серии по 3 попытки размыкают его
+    for _ in range(2):
+        with pytest.raises((ProviderServerError, ProviderUnavailableError)):
+            await client.h2h_invoice("inv-1")
+    assert len(stub.hits) == client.breaker.failure_threshold
+    assert client.breaker.is_open
+
+    # Пока breaker разомкнут, запросы к провайдеру не уходят
+    stub.respond((0, 200))
+    with pytest.raises(ProviderUnavailableError):
+        await client.h2h_invoice("inv-1")
+    assert len(stub.hits) == client.breaker.failure_threshold
+
+    # После reset_timeout — пробный запрос (half-open) и замыкание
+    client.breaker.reset_timeout = 0
+    assert await client.h2h_invoice("inv-1") == "qr-data"
+    assert not client.breaker.is_open
@@ -0,0 +1,102 @@
+"""
+Тесты резервирования internal MTProto клиентов на локальном Postgres.
+
+Одновременные назначения каналов должны распределяться по клиентам
+равномерно, а потерянные резервы — исправляться сверкой со связями.
+"""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from main_bot.database.db import db
+from main_bot.database.mt_client.crud import RESERVATION_TTL
+from main_bot.database.mt_client.model import MtClient
+from main_bot.database.mt_client_channel.model import MtClientChannel
+
+pytestmark = pytest.mark.postgres
+
+CLIENTS = 5
+ASSIGNMENTS = 100
+
+
+async def _create_clients(count: int) -> list[int]:
+    clients = await db.mt_client.create_mt_clients(
+        [
+            {
+                "alias": f"internal-{i}",
+                "pool_type": "internal",
+                "session_path": f"/tmp/internal-{i}.session",
+                "status": "ACTIVE",
+                "is_active": True,
+            }
+            for i in range(count)
+        ]
+    )
+    return [client.id for client in clients]
+
+
+async def _load(engine) -> dict[int, tuple[int, int]]:
+    """Счетчик assigned_channels и фактическое число связей по клиентам."""
+    links = (
+        select(func.count(MtClientChannel.id))
+        .where(MtClientChannel.client_id == MtClient.id)
+        .scalar_subquery()
+    )
+    async with AsyncSession(engine) as session:
+        rows = await session.execute(select(MtClient.id, MtClient.assigned_channels, links))
+        return {client_id: (assigned, linked) for client_id, assigned, linked in rows}
+
+
+async def _assign(channel_id: int) -> None:
+    """Назначение канала как в set_channel_session: reserve, вступление, release."""
+    client = await db.mt_client.reserve_internal_client()
+    try:
+        # Вступление в канал занимает время: параллельные назначения видят резерв
+        await asyncio.sleep(0.01)
+        await db.mt_client_channel.get_or_create_mt_client_channel(client.id, channel_id)
+    finally:
+        await db.mt_client.release_internal_client(client.id)
+
+
+async def test_concurrent_assignments_spread_evenly(pg, pooled):
+    await _create_clients(CLIENTS)
+
+    await asyncio.gather(*(_assign(-1000 - i) for i in range(ASSIGNMENTS)))
+
+    load = await _load(pg)
+    linked = [linked for _, linked in load.values()]
+    assert sum(linked) == ASSIGNMENTS
+    # SKIP LOCKED может пропустить наименее загруженного, пока его строка занята
+    # соседним резервом, поэтому равенство не точное: ±20% от среднего
+    mean = ASSIGNMENTS / CLIENTS
+    assert all(abs(count - mean) <= mean * 0.2 for count in linked)
+    # После снятия всех резервов счетчик равен числу связей
+    assert all(assigned == linked for assigned, linked in load.values())
+    assert await db.mt_client.reconcile_assigned_channels() == []
+
+
+async def test_reconcile_fixes_leaked_reservation(pg):
+    leaked_id, fresh_id = await _create_clients(2)
+    await db.mt_client_channel.get_or_create_mt_client_channel(leaked_id, -1)
+
+    # Процесс упал между reserve и release: резерв остается в счетчике
+    assert (await db.mt_client.reserve_internal_client()).id == fresh_id
+    assert (await db.mt_client.reserve_internal_client()).id == leaked_id
+    async with AsyncSession(pg) as session:
+        await session.execute(
+            update(MtClient)
+            .where(MtClient.id == leaked_id)
+            .values(last_reserved_at=int(time.time()) - RESERVATION_TTL - 1)
+        )
+        await session.commit()
+
+    assert await db.mt_client.reconcile_assigned_channels() == [leaked_id]
+
+    load = await _load(pg)
+    assert load[leaked_id] == (1, 1)
+    # Свежий резерв может принадлежать идущему назначению: не трогаем
+    assert load[fresh_id] == (1, 0)
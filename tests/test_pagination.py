@@ -0,0 +1,184 @@
+"""
+Тесты keyset-пагинации списков админ-панели.
+
+split_page проверяется без базы, keyset_page и страницы CRUD — на локальном
+Postgres (маркер postgres).
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import Config
+from main_bot.database.channel.model import Channel
+from main_bot.database.db import db
+from main_bot.database.user.model import User
+from main_bot.database.user_bot.model import UserBot
+from main_bot.handlers.admin import admin_bots
+from main_bot.utils.pagination import parse_cursor, split_page
+
+PER_PAGE = 10
+
+
+def _rows(*ids: int) -> list:
+    return [SimpleNamespace(id=row_id) for row_id in ids]
+
+
+def _ids(rows) -> list[int]:
+    return [row.id for row in rows]
+
+
+def test_parse_cursor():
+    assert parse_cursor("0") == (None, False)
+    assert parse_cursor(None) == (None, False)
+    assert parse_cursor("n15") == (15, False)
+    assert parse_cursor("p7") == (7, True)
+
+
+def test_split_page_first_page_with_more():
+    page, prev_cursor, next_cursor = split_page(_rows(*range(1, 12)), PER_PAGE, None, False)
+    assert _ids(page) == list(range(1, 11))
+    assert (prev_cursor, next_cursor) == (None, "n10")
+
+
+def test_split_page_last_page_forward():
+    page, prev_cursor, next_cursor = split_page(_rows(21, 22, 23), PER_PAGE, 20, False)
+    assert _ids(page) == [21, 22, 23]
+    assert (prev_cursor, next_cursor) == ("p21", None)
+
+
+def test_split_page_backward_restores_order():
+    # keyset_page при backward возвращает строки в обратном порядке
+    rows = _rows(*range(20, 9, -1))
+    page, prev_cursor, next_cursor = split_page(rows, PER_PAGE, 21, True)
+    assert _ids(page) == list(range(11, 21))
+    assert (prev_cursor, next_cursor) == ("p11", "n20")
+
+
+def test_split_page_backward_to_first_page():
+    page, prev_cursor, next_cursor = split_page(_rows(*range(10, 0, -1)), PER_PAGE, 11, True)
+    assert _ids(page) == list(range(1, 11))
+    assert (prev_cursor, next_cursor) == (None, "n10")
+
+
+def test_split_page_empty():
+    assert split_page([], PER_PAGE, 5, False) == ([], None, None)
+
+
+async def _add(engine, *objects) -> None:
+    async with AsyncSession(engine) as session:
+        session.add_all(objects)
+        await session.commit()
+
+
+def _bot(bot_id: int, title: str) -> UserBot:
+    return UserBot(
+        id=bot_id,
+        admin_id=1,
+        schema="bot",
+        token=f"{bot_id}:x",
+        username=f"bot{bot_id}",
+        title=title,
+        emoji_id="0",
+    )
+
+
+async def _walk(cursor: str | None = None) -> list[tuple[list[int], str | None, str | None]]:
+    """Листает список ботов от курсора, пока есть следующая страница."""
+    pages = []
+    while True:
+        cursor_id, backward = parse_cursor(cursor)
+        rows, _ = await db.user_bot.get_bots_page(cursor_id, backward, PER_PAGE + 1)
+        page, prev_cursor, next_cursor = split_page(rows, PER_PAGE, cursor_id, backward)
+        pages.append((_ids(page), prev_cursor, next_cursor))
+        if not next_cursor:
+            return pages
+        cursor = next_cursor
+
+
+@pytest.fixture
+async def bots(pg):
+    # Повторяющиеся названия: порядок внутри них задает id
+    titles = [f"bot {i // 2:02d}" for i in range(25)]
+    await _add(pg, *(_bot(bot_id, title) for bot_id, title in enumerate(titles, start=1)))
+    return list(range(1, 26))
+
+
+@pytest.mark.postgres
+async def test_keyset_forward_and_backward(bots):
+    pages = await _walk()
+
+    assert [ids for ids, _, _ in pages] == [bots[:10], bots[10:20], bots[20:]]
+    assert pages[0][1] is None
+    # Последняя страница: есть «назад», нет «вперед»
+    assert pages[-1][1:] == ("p21", None)
+
+    cursor_id, backward = parse_cursor(pages[-1][1])
+    rows, _ = await db.user_bot.get_bots_page(cursor_id, backward, PER_PAGE + 1)
+    page, prev_cursor, next_cursor = split_page(rows, PER_PAGE, cursor_id, backward)
+    assert _ids(page) == bots[10:20]
+    assert (prev_cursor, next_cursor) == ("p11", "n20")
+
+
+@pytest.mark.postgres
+async def test_keyset_descending_users(pg):
+    now = int(time.time())
+    await _add(pg, *(User(id=i, created_timestamp=now + i % 3) for i in range(1, 16)))
+
+    rows, total = await db.user.get_users_page(None, False, PER_PAGE + 1)
+    page, _, next_cursor = split_page(rows, PER_PAGE, None, False)
+    expected = sorted(range(1, 16), key=lambda i: (now + i % 3, i), reverse=True)
+    assert _ids(page) == expected[:10]
+    assert total == 15
+
+    cursor_id, backward = parse_cursor(next_cursor)
+    rows, _ = await db.user.get_users_page(cursor_id, backward, PER_PAGE + 1)
+    assert _ids(split_page(rows, PER_PAGE, cursor_id, backward)[0]) == expected[10:]
+
+
+@pytest.mark.postgres
+async def test_deleted_cursor_row_opens_first_page(pg, bots):
+    async with AsyncSession(pg) as session:
+        await session.execute(delete(UserBot).where(UserBot.id == 10))
+        await session.commit()
+
+    # Подзапрос курсора возвращает NULL: сама выборка пуста
+    rows, _ = await db.user_bot.get_bots_page(10, False, PER_PAGE + 1)
+    assert rows == []
+
+    edits = []
+
+    async def edit_text(text, reply_markup=None, parse_mode=None):
+        edits.append((text, reply_markup))
+
+    async def answer(*args, **kwargs):
+        pass
+
+    call = SimpleNamespace(message=SimpleNamespace(edit_text=edit_text), answer=answer)
+    await admin_bots.show_bots_list(call, "n10", 2)
+
+    text, markup = edits[-1]
+    assert "Страница: 1" in text
+    callbacks = [button.callback_data for row in markup.inline_keyboard for button in row]
+    assert "AdminBots|list|n11|2" in callbacks
+
+
+@pytest.mark.postgres
+async def test_channels_page_count_excludes_deleted_and_duplicates(pg):
+    channels = [
+        Channel(chat_id=-1, title="a", admin_id=1, emoji_id="0"),
+        # Тот же канал у второго админа: в списке одна строка
+        Channel(chat_id=-1, title="a", admin_id=2, emoji_id="0"),
+        Channel(chat_id=-2, title="b", admin_id=1, emoji_id="0"),
+        Channel(chat_id=-3, title="c", admin_id=1, emoji_id="0",
+                subscribe=Config.SOFT_DELETE_TIMESTAMP),
+    ]
+    await _add(pg, *channels)
+
+    rows, total = await db.channel.get_channels_page(None, False, PER_PAGE + 1)
+
+    assert [row.chat_id for row in rows] == [-1, -2]
+    assert total == 2
@@ -0,0 +1,189 @@
+"""
+Тесты идемпотентной обработки платежных вебхуков на локальном Postgres.
+
+Одинаковые вебхуки CryptoBot отправляются в приложение одновременно:
+событие должно быть обработано ровно один раз.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import Config
+from main_bot.database.channel.model import Channel
+from main_bot.database.db import db
+from main_bot.database.db_types import PaymentMethod, Service
+from main_bot.database.payment.model import Payment
+from main_bot.database.payment_event.model import PaymentEvent
+from main_bot.database.purchase.model import Purchase
+from main_bot.database.user.model import User
+
+pytestmark = pytest.mark.postgres
+
+DUPLICATES = 50
+USER_ID = 1001
+REFERRER_ID = 1002
+CHAT_IDS = [-1001, -1002]
+
+
+@pytest.fixture
+async def api(pg, monkeypatch):
+    """HTTP-клиент приложения; сообщения бота складываются в список."""
+    import main_api
+
+    sent = []
+
+    async def send_message(chat_id, text, **kwargs):
+        sent.append(chat_id)
+
+    monkeypatch.setattr(main_api.bot, "send_message", send_message)
+
+    transport = httpx.ASGITransport(app=main_api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client, sent
+
+
+async def _add(engine, *objects) -> None:
+    async with AsyncSession(engine) as session:
+        session.add_all(objects)
+        await session.commit()
+
+
+async def _scalar(engine, stmt):
+    async with AsyncSession(engine) as session:
+        return (await session.execute(stmt)).scalar()
+
+
+def _invoice_paid(invoice_id: int, payload: dict, amount: float) -> tuple[bytes, dict]:
+    """Тело и подписанные заголовки вебхука CryptoBot."""
+    body = json.dumps(
+        {
+            "update_type": "invoice_paid",
+            "payload": {
+                "invoice_id": invoice_id,
+                "amount": str(amount),
+                "payload": json.dumps(payload),
+            },
+        }
+    ).encode()
+    secret = hashlib.sha256(Config.CRYPTO_BOT_TOKEN.encode()).digest()
+    signature = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    return body, {
+        "crypto-pay-api-signature": signature,
+        "content-type": "application/json",
+    }
+
+
+async def _fire(client: httpx.AsyncClient, body: bytes, headers: dict) -> None:
+    responses = await asyncio.gather(
+        *(
+            client.post("/webhook/cryptobot", content=body, headers=headers)
+            for _ in range(DUPLICATES)
+        )
+    )
+    assert all(response.status_code == 200 for response in responses)
+
+
+async def test_duplicate_balance_webhooks_credit_once(api, pg):
+    client, sent = api
+    await _add(pg, User(id=USER_ID, balance=0))
+
+    body, headers = _invoice_paid(
+        501, {"type": "balance", "user_id": USER_ID, "method": "CRYPTO_BOT"}, 100
+    )
+    await _fire(client, body, headers)
+
+    assert await _scalar(pg, select(User.balance).where(User.id == USER_ID)) == 100
+    assert await _scalar(pg, select(func.count()).select_from(Payment)) == 1
+    assert await _scalar(pg, select(func.count()).select_from(PaymentEvent)) == 1
+    assert sent == [USER_ID]
+
+
+async def test_duplicate_subscribe_webhooks_grant_once(api, pg):
+    client, sent = api
+    now = int(time.time())
+    await _add(
+        pg,
+        User(id=REFERRER_ID, balance=0),
+        User(id=USER_ID, balance=0, referral_id=REFERRER_ID),
+        *(
+            Channel(chat_id=chat_id, title="test", admin_id=USER_ID, emoji_id="0", subscribe=now)
+            for chat_id in CHAT_IDS
+        ),
+    )
+
+    payload = {
+        "type": "subscribe",
+        "user_id": USER_ID,
+        "method": "CRYPTO_BOT",
+        "chosen": CHAT_IDS + [-1999],  # последнего канала нет в базе
+        "total_days": 30,
+        "service": "subscribe",
+        "object_type": "channels",
+        "total_price": 1000,
+        "referral_id": REFERRER_ID,
+    }
+    body, headers = _invoice_paid(502, payload, 1000)
+    await _fire(client, body, headers)
+
+    subscriptions = await _scalar(
+        pg, select(func.array_agg(Channel.subscribe)).where(Channel.chat_id.in_(CHAT_IDS))
+    )
+    assert all(now + 30 * 86400 <= value <= now + 30 * 86400 + 60 for value in subscriptions)
+    assert await _scalar(pg, select(func.count()).select_from(Purchase)) == 1
+    # Первая покупка: 60% реферальный бонус
+    assert await _scalar(pg, select(User.balance).where(User.id == REFERRER_ID)) == 600
+    assert sent == [USER_ID]
+
+
+async def test_subscribe_grant_rolls_back_with_claim(pg):
+    await _add(pg, User(id=USER_ID, balance=0))
+
+    kwargs = dict(
+        provider="crypto_bot",
+        event_id="503",
+        user_id=USER_ID,
+        total_price=1000,
+        method=PaymentMethod.CRYPTO_BOT,
+        service=Service.POSTING,
+        object_type="channels",
+        object_ids=CHAT_IDS,
+        seconds=86400,
+    )
+    # Ошибка в цепочке (здесь — неверный тип срока) откатывает и регистрацию события
+    with pytest.raises(Exception):
+        await db.payment_event.record_subscription_purchase(**{**kwargs, "seconds": "x"})
+    assert await _scalar(pg, select(func.count()).select_from(PaymentEvent)) == 0
+
+    # Повтор вебхука после сбоя обрабатывает платеж заново
+    assert await db.payment_event.record_subscription_purchase(**kwargs) == []
+    assert await _scalar(pg, select(func.count()).select_from(PaymentEvent)) == 1
+    assert await _scalar(pg, select(func.count()).select_from(Purchase)) == 1
+
+
+async def test_credit_balance_reports_missing_user(pg):
+    claimed, balance = await db.payment_event.credit_balance(
+        provider="crypto_bot",
+        event_id="504",
+        user_id=USER_ID,
+        amount=100,
+        method=PaymentMethod.CRYPTO_BOT,
+    )
+    assert (claimed, balance) == (True, None)
+
+    claimed, balance = await db.payment_event.credit_balance(
+        provider="crypto_bot",
+        event_id="504",
+        user_id=USER_ID,
+        amount=100,
+        method=PaymentMethod.CRYPTO_BOT,
+    )
+    assert (claimed, balance) == (False, None)
+    assert await _scalar(pg, select(func.count()).select_from(Payment)) == 0
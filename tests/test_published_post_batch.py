@@ -0,0 +1,91 @@
+"""
+Тесты массового обновления опубликованных постов (executemany по группам полей)
+на локальном Postgres.
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from main_bot.database.db import db
+from main_bot.database.published_post.model import PublishedPost
+
+pytestmark = pytest.mark.postgres
+
+
+def _post(post_id: int) -> PublishedPost:
+    return PublishedPost(
+        id=post_id,
+        post_id=1,
+        message_id=post_id,
+        chat_id=-100,
+        admin_id=1,
+        message_options={"text": "test"},
+        reaction={"rows": []},
+        buttons="button|https://example.com",
+        delete_time=1000,
+        views_24h=5,
+    )
+
+
+async def _add_posts(engine, ids) -> None:
+    async with AsyncSession(engine) as session:
+        session.add_all(_post(post_id) for post_id in ids)
+        await session.commit()
+
+
+async def _rows(engine, *columns) -> dict[int, tuple]:
+    async with AsyncSession(engine) as session:
+        result = await session.execute(
+            select(PublishedPost.id, *columns).order_by(PublishedPost.id)
+        )
+        return {row[0]: tuple(row[1:]) for row in result}
+
+
+async def test_all_null_column_type_checks(pg):
+    await _add_posts(pg, range(1, 4))
+
+    # Колонки целиком NULL: тип параметра должен браться из колонки, а не из значения
+    await db.published_post.update_published_posts_batch(
+        [
+            {
+                "id": post_id,
+                "views_24h": None,
+                "delete_time": None,
+                "buttons": None,
+                "hide": None,
+            }
+            for post_id in range(1, 4)
+        ]
+    )
+
+    rows = await _rows(
+        pg,
+        PublishedPost.views_24h,
+        PublishedPost.delete_time,
+        PublishedPost.buttons,
+        PublishedPost.hide,
+    )
+    assert rows == {post_id: (None, None, None, None) for post_id in range(1, 4)}
+
+
+async def test_groups_match_per_row_values(pg):
+    await _add_posts(pg, range(1, 11))
+
+    updates = [{"id": post_id, "views_24h": post_id * 10} for post_id in range(1, 8)]
+    # Другой набор полей — отдельная группа; NULL смешан со значениями
+    updates += [
+        {"id": 8, "views_48h": 80, "reaction": {"rows": [{"id": 1}]}},
+        {"id": 9, "views_48h": None, "reaction": {"rows": []}},
+        {"id": 10},
+    ]
+    await db.published_post.update_published_posts_batch(updates)
+
+    rows = await _rows(
+        pg, PublishedPost.views_24h, PublishedPost.views_48h, PublishedPost.reaction
+    )
+    for post_id in range(1, 8):
+        assert rows[post_id] == (post_id * 10, 0, {"rows": []})
+    assert rows[8] == (5, 80, {"rows": [{"id": 1}]})
+    assert rows[9] == (5, None, {"rows": []})
+    assert rows[10] == (5, 0, {"rows": []})
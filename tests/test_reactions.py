@@ -0,0 +1,187 @@
+"""
+Тесты счетчиков реакций: одновременные клики и debounce редактирования.
+
+Redis — fakeredis (Lua-скрипты выполняются как в настоящем Redis),
+Bot API — заглушка, которая запоминает каждое редактирование клавиатуры.
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import EditMessageReplyMarkup
+
+from main_bot.keyboards import keyboards
+from main_bot.utils import background, reactions
+
+CHAT_ID = -100500
+MESSAGE_ID = 42
+POST_ID = 7
+REACTION_IDS = (1, 2, 3)
+EDIT_INTERVAL = 0.05
+
+LAYOUT = {
+    "rows": [
+        {
+            "id": 1,
+            "reactions": [
+                {"id": reaction_id, "react": str(reaction_id), "users": []}
+                for reaction_id in REACTION_IDS
+            ],
+        }
+    ]
+}
+
+
+class FakeBot:
+    """Заглушка Bot API: считает редактирования и хранит последние счетчики."""
+
+    def __init__(self, retry_after_first: int = 0):
+        self.edits: list[dict[int, int]] = []
+        self.retry_after_first = retry_after_first
+
+    async def edit_message_reply_markup(self, chat_id, message_id, reply_markup):
+        # Имитация сетевой задержки: клики продолжают приходить во время запроса
+        await asyncio.sleep(0.01)
+        if self.retry_after_first:
+            retry_after, self.retry_after_first = self.retry_after_first, 0
+            raise TelegramRetryAfter(
+                method=EditMessageReplyMarkup(chat_id=chat_id, message_id=message_id),
+                message="Too Many Requests",
+                retry_after=retry_after,
+            )
+
+        self.edits.append(
+            {
+                react["id"]: len(react["users"])
+                for row in reply_markup["rows"]
+                for react in row["reactions"]
+            }
+        )
+
+
+@pytest.fixture
+def reacts(monkeypatch, fake_redis):
+    """Модуль reactions, подключенный к fakeredis и заглушке БД."""
+    monkeypatch.setattr(reactions, "redis_client", fake_redis)
+    monkeypatch.setattr(
+        reactions, "_vote_script", fake_redis.register_script(reactions._VOTE_SCRIPT)
+    )
+    monkeypatch.setattr(
+        reactions, "_seed_script", fake_redis.register_script(reactions._SEED_SCRIPT)
+    )
+    monkeypatch.setattr(reactions, "REACTION_EDIT_INTERVAL", EDIT_INTERVAL)
+
+    async def get_published_post_by_id(post_id):
+        return SimpleNamespace(id=post_id, reaction=LAYOUT)
+
+    monkeypatch.setattr(
+        reactions.db.published_post,
+        "get_published_post_by_id",
+        get_published_post_by_id,
+    )
+    # Клавиатура подменяется JSON-ом реакций, чтобы заглушка бота видела счетчики
+    monkeypatch.setattr(keyboards, "post_kb", lambda post: post.reaction, raising=False)
+    return reactions
+
+
+async def _click(bot: FakeBot, user_id: int, reaction_id: int) -> None:
+    """Клик пользователя по реакции (как в обработчике links_step)."""
+    await asyncio.sleep(random.uniform(0, 0.3))
+    changed = await reactions.vote(
+        post_id=POST_ID,
+        chat_id=CHAT_ID,
+        message_id=MESSAGE_ID,
+        reaction=LAYOUT,
+        user_id=user_id,
+        reaction_id=reaction_id,
+    )
+    if changed:
+        await reactions.schedule_markup_refresh(
+            bot, POST_ID, CHAT_ID, MESSAGE_ID, delay=EDIT_INTERVAL
+        )
+
+
+async def _wait_refreshes() -> None:
+    """Ждет завершения всех отложенных обновлений клавиатуры."""
+    while True:
+        pending = [
+            task
+            for task in background._background_tasks
+            if task.get_name().startswith("react_refresh_")
+        ]
+        if not pending:
+            return
+        await asyncio.gather(*pending)
+
+
+async def test_concurrent_clicks_exact_counts_and_bounded_edits(reacts):
+    bot = FakeBot()
+    random.seed(1)
+    clicks = [(user_id, random.choice(REACTION_IDS)) for user_id in range(1, 1001)]
+    # Часть пользователей меняет выбор: учитывается последний голос
+    clicks += [(user_id, REACTION_IDS[user_id % 3]) for user_id in range(1, 201)]
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.gather(*(_click(bot, user_id, rid) for user_id, rid in clicks[:1000]))
+    await asyncio.gather(*(_click(bot, user_id, rid) for user_id, rid in clicks[1000:]))
+    await _wait_refreshes()
+    elapsed = loop.time() - started
+
+    final_choice = dict(clicks)
+    expected = {
+        rid: sum(1 for choice in final_choice.values() if choice == rid)
+        for rid in REACTION_IDS
+    }
+    assert bot.edits, "клавиатура ни разу не обновлена"
+    assert bot.edits[-1] == expected
+    assert sum(bot.edits[-1].values()) == 1000
+
+    # Не больше одного редактирования на окно debounce (+ хвостовое)
+    max_edits = int(elapsed / EDIT_INTERVAL) + 2
+    assert len(bot.edits) <= max_edits
+    assert len(bot.edits) < len(clicks) / 10
+
+
+async def test_click_during_edit_triggers_trailing_refresh(reacts, fake_redis):
+    bot = FakeBot()
+    original_edit = bot.edit_message_reply_markup
+
+    async def edit_with_late_vote(chat_id, message_id, reply_markup):
+        await original_edit(chat_id, message_id, reply_markup)
+        if len(bot.edits) == 1:
+            # Голос после чтения счетчиков: окно еще занято, новое обновление не планируется
+            await _click(bot, 2, 2)
+
+    bot.edit_message_reply_markup = edit_with_late_vote
+
+    await _click(bot, 1, 1)
+    await _wait_refreshes()
+
+    assert bot.edits[0] == {1: 1, 2: 0, 3: 0}
+    assert bot.edits[-1] == {1: 1, 2: 1, 3: 0}
+    assert len(bot.edits) == 2
+
+
+async def test_retry_after_reschedules_edit(reacts):
+    # RetryAfter на первом редактировании: обновление повторяется после паузы
+    bot = FakeBot(retry_after_first=1)
+
+    await _click(bot, 1, 3)
+    await _wait_refreshes()
+
+    assert bot.edits == [{1: 0, 2: 0, 3: 1}]
+
+
+async def test_reset_reactions_clears_state(reacts, fake_redis):
+    bot = FakeBot()
+    await _click(bot, 1, 1)
+    await _wait_refreshes()
+
+    await reactions.reset_reactions(CHAT_ID, MESSAGE_ID)
+
+    assert await reactions.get_votes(CHAT_ID, MESSAGE_ID) == {}
+    assert await fake_redis.smembers(reactions.REACTION_DIRTY_KEY) == set()
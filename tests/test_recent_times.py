@@ -0,0 +1,123 @@
+"""
+Тесты пользовательских настроек в Redis: число запросов на отрисовку
+календаря и переключение режима просмотра.
+
+Redis — fakeredis; каждый запрос к серверу (одиночная команда или
+пайплайн целиком) засчитывается как один round-trip.
+"""
+
+import pytest
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from main_bot.keyboards.calendar import InlineCalendar
+from main_bot.utils import recent_times, user_settings
+
+USER_ID = 777
+
+
+class RoundTrips:
+    """Счетчик запросов к Redis: имена команд каждого round-trip."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def reset(self) -> None:
+        self.calls.clear()
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+
+@pytest.fixture
+def round_trips(monkeypatch, fake_redis):
+    """Подключает recent_times и user_settings к fakeredis со счетчиком запросов."""
+    counter = RoundTrips()
+
+    execute_command = fake_redis.execute_command
+
+    async def counted_execute_command(*args, **kwargs):
+        counter.calls.append([str(args[0]).upper()])
+        return await execute_command(*args, **kwargs)
+
+    pipeline_execute = Pipeline.execute
+
+    async def counted_pipeline_execute(pipe, *args, **kwargs):
+        counter.calls.append([str(command[0][0]) for command in pipe.command_stack])
+        return await pipeline_execute(pipe, *args, **kwargs)
+
+    monkeypatch.setattr(fake_redis, "execute_command", counted_execute_command)
+    monkeypatch.setattr(Pipeline, "execute", counted_pipeline_execute)
+    monkeypatch.setattr(recent_times, "redis_client", fake_redis)
+    monkeypatch.setattr(user_settings, "redis_client", fake_redis)
+    monkeypatch.setattr(
+        user_settings,
+        "_toggle_view_mode_script",
+        fake_redis.register_script(user_settings._TOGGLE_VIEW_MODE_SCRIPT),
+    )
+    return counter
+
+
+def _recent_row(markup) -> list[str]:
+    """Кнопки последних времен (строка перед кнопкой «Назад»)."""
+    row = markup.inline_keyboard[-2]
+    return [
+        button.callback_data.split("|", 1)[1]
+        for button in row
+        if button.callback_data.startswith("ChoicePublicationTime|")
+    ]
+
+
+async def test_save_recent_time_is_one_round_trip(round_trips):
+    for time_str in ("10:00", "11:00", "12:00", "13:00"):
+        await recent_times.save_recent_time(USER_ID, time_str)
+    round_trips.reset()
+
+    # Повторный выбор поднимает время в начало без дубля
+    times = await recent_times.save_recent_time(USER_ID, "11:00")
+
+    assert times == ["11:00", "13:00", "12:00"]
+    assert round_trips.calls == [["LREM", "LPUSH", "LTRIM", "LRANGE"]]
+
+
+async def test_calendar_render_commands(round_trips):
+    times = await recent_times.save_recent_time(USER_ID, "09:30")
+    round_trips.reset()
+
+    # Открытие календаря: одно чтение Redis, дальше — список из FSM
+    opened = await InlineCalendar.create(user_id=USER_ID, recent_times=None)
+    assert len(round_trips) == 1
+    assert _recent_row(opened) == ["09:30"]
+
+    round_trips.reset()
+    for month in (1, 2, 3):
+        flipped = await InlineCalendar.create(
+            year=2026, month=month, user_id=USER_ID, recent_times=times
+        )
+        assert _recent_row(flipped) == ["09:30"]
+    assert len(round_trips) == 0
+
+
+async def test_redis_error_is_not_cached(round_trips, fake_redis, monkeypatch):
+    async def broken(*args, **kwargs):
+        raise RedisConnectionError("down")
+
+    monkeypatch.setattr(Pipeline, "execute", broken)
+    monkeypatch.setattr(fake_redis, "execute_command", broken)
+
+    # None (а не []) — обработчик не перезаписывает список в FSM
+    assert await recent_times.save_recent_time(USER_ID, "10:00") is None
+    assert await recent_times.get_recent_times(USER_ID) is None
+
+
+async def test_toggle_view_mode_is_one_round_trip(round_trips):
+    assert await user_settings.get_user_view_mode(USER_ID) == "folders"
+    # Первый вызов загружает скрипт в Redis (SCRIPT LOAD) — разовая цена
+    assert await user_settings.toggle_user_view_mode(USER_ID) == "channels"
+    round_trips.reset()
+
+    assert await user_settings.toggle_user_view_mode(USER_ID) == "folders"
+    assert await user_settings.toggle_user_view_mode(USER_ID) == "channels"
+    assert await user_settings.get_user_view_mode(USER_ID) == "channels"
+
+    assert round_trips.calls == [["EVALSHA"], ["EVALSHA"], ["GET"]]
@@ -0,0 +1,180 @@
+"""
+Тесты фонового сканирования неучтенных сессий на локальном Postgres.
+
+Проверка сессии (_probe_session) подменяется заглушкой с заданной
+задержкой и результатом; Bot API — заглушкой, которая запоминает сообщения.
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from tenacity import wait_none
+
+from main_bot.database import DatabaseMixin
+from main_bot.database.db import db
+from main_bot.database.mt_client.model import MtClient
+from main_bot.handlers.admin import session
+
+pytestmark = pytest.mark.postgres
+
+USER_ID = 1
+CONCURRENCY = 3
+SESSION_TIMEOUT = 0.3
+
+
+class FakeBot:
+    """Заглушка Bot API: отправленные и отредактированные тексты."""
+
+    def __init__(self):
+        self.sent: list[str] = []
+        self.edits: list[str] = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent.append(text)
+        return SimpleNamespace(message_id=len(self.sent))
+
+    async def edit_message_text(self, text, chat_id, message_id, **kwargs):
+        self.edits.append(text)
+
+
+class ProbeStub:
+    """Заглушка _probe_session: задержка и результат по имени файла сессии."""
+
+    def __init__(self):
+        self.behaviour: dict[str, tuple[float, object]] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.probed: list[str] = []
+
+    def add(self, name: str, latency: float, result) -> None:
+        self.behaviour[f"{name}.session"] = (latency, result)
+
+    async def __call__(self, session_path):
+        self.probed.append(session_path.name)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            latency, result = self.behaviour[session_path.name]
+            await asyncio.sleep(latency)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        finally:
+            self.in_flight -= 1
+
+
+def _working(username: str, ok: bool = True) -> dict:
+    me = SimpleNamespace(username=username, first_name=username.title(), last_name=None)
+    health = {"ok": True} if ok else {"ok": False, "error_code": "SPAM_BLOCK"}
+    return {"me": me, "health": health}
+
+
+@pytest.fixture
+def scan(pg, monkeypatch, tmp_path):
+    """Каталог сессий во временной папке, заглушки бота и проверки, без пауз."""
+    monkeypatch.chdir(tmp_path)
+    sessions_dir = tmp_path / "main_bot/utils/sessions"
+    sessions_dir.mkdir(parents=True)
+
+    bot = FakeBot()
+    probe = ProbeStub()
+    monkeypatch.setattr(session, "main_bot_obj", bot)
+    monkeypatch.setattr(session, "_probe_session", probe)
+    monkeypatch.setattr(session, "SCAN_CONCURRENCY", CONCURRENCY)
+    monkeypatch.setattr(session, "SCAN_SESSION_TIMEOUT", SESSION_TIMEOUT)
+    monkeypatch.setattr(session, "SCAN_DELAY_MIN", 0)
+    monkeypatch.setattr(session, "SCAN_DELAY_MAX", 0.01)
+    monkeypatch.setattr(session, "SCAN_PROGRESS_INTERVAL", 0)
+
+    def add_session(name: str, latency: float, result) -> None:
+        (sessions_dir / f"{name}.session").touch()
+        probe.add(name, latency, result)
+
+    return SimpleNamespace(bot=bot, probe=probe, add=add_session, dir=sessions_dir)
+
+
+async def _clients(engine) -> dict[str, MtClient]:
+    async with AsyncSession(engine) as s:
+        rows = (await s.execute(select(MtClient))).scalars().all()
+    return {row.session_path.rsplit("/", 1)[-1]: row for row in rows}
+
+
+async def test_scan_bounds_pool_and_times_out_hung_probes(scan, pg, monkeypatch):
+    random.seed(3)
+    for i in range(8):
+        scan.add(f"good{i}", random.uniform(0.01, 0.1), _working(f"super{i}"))
+    scan.add("spam", 0.02, _working("ultra", ok=False))
+    scan.add("hung1", 10, _working("never1"))
+    scan.add("hung2", 10, _working("never2"))
+    scan.add("noauth", 0.01, {"error": "не удалось подключиться"})
+    scan.add("crash", 0.01, RuntimeError("broken session file"))
+
+    # Уже учтенная сессия не проверяется повторно
+    (scan.dir / "known.session").touch()
+    await db.mt_client.create_mt_client(
+        alias="known", pool_type="internal", session_path="sessions/known.session"
+    )
+
+    batches = []
+    create_mt_clients = db.mt_client.create_mt_clients
+
+    async def counted_create(rows):
+        batches.append(len(rows))
+        return await create_mt_clients(rows)
+
+    monkeypatch.setattr(db.mt_client, "create_mt_clients", counted_create)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await session.scan_orphaned_sessions_task(USER_ID)
+    elapsed = loop.time() - started
+
+    assert "known.session" not in scan.probe.probed
+    assert len(scan.probe.probed) == 13
+    assert scan.probe.max_in_flight == CONCURRENCY
+    # Зависшие проверки обрываются по таймауту, а не ждут 10с
+    assert elapsed < 3
+
+    assert batches == [9]
+    clients = await _clients(pg)
+    assert {name for name in clients} == {"known.session", "spam.session"} | {
+        f"good{i}.session" for i in range(8)
+    }
+    assert clients["good0.session"].status == "ACTIVE"
+    assert clients["good0.session"].pool_type == "internal"
+    spam = clients["spam.session"]
+    assert (spam.status, spam.is_active, spam.pool_type) == ("DISABLED", False, "external")
+    assert spam.last_error_code == "SPAM_BLOCK"
+
+    report = scan.bot.sent[-1]
+    assert "✅ Добавлено: 9" in report
+    assert "❌ Ошибки: 4" in report
+    assert f"hung1.session: таймаут {SESSION_TIMEOUT}с" in report
+    assert "crash.session: broken session file" in report
+    assert scan.bot.edits[-1].startswith("🔍 Сканирование сессий: 13/13")
+
+
+async def test_batch_insert_failure_falls_back_to_single_rows(scan, pg, monkeypatch):
+    # Ошибка данных не лечится повтором: без пауз tenacity между попытками
+    monkeypatch.setattr(DatabaseMixin.fetch.retry, "wait", wait_none())
+    monkeypatch.setattr(DatabaseMixin.fetchrow.retry, "wait", wait_none())
+
+    scan.add("good1", 0.01, _working("super1"))
+    scan.add("good2", 0.01, _working("super2"))
+    # Путь длиннее session_path (255): пачка падает, строка — отдельно
+    long_name = "x" * 240
+    scan.add(long_name, 0.01, _working("super3"))
+
+    await session.scan_orphaned_sessions_task(USER_ID)
+
+    clients = await _clients(pg)
+    assert set(clients) == {"good1.session", "good2.session"}
+
+    report = scan.bot.sent[-1]
+    assert "✅ Добавлено: 2" in report
+    assert "❌ Ошибки: 1" in report
+    assert f"{long_name}.session" in report
@@ -0,0 +1,89 @@
+"""
+Тесты продления подписок каналов и ботов одним UPDATE на локальном Postgres.
+"""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from main_bot.database.channel.model import Channel
+from main_bot.database.db import db
+from main_bot.database.user_bot.model import UserBot
+from main_bot.utils.subscribe_service import grant_subscription
+
+pytestmark = pytest.mark.postgres
+
+DAY = 86400
+
+
+async def _add(engine, *objects) -> None:
+    async with AsyncSession(engine) as session:
+        session.add_all(objects)
+        await session.commit()
+
+
+async def _subscriptions(engine, column, ids) -> dict[int, int]:
+    model = column.class_
+    async with AsyncSession(engine) as session:
+        rows = await session.execute(
+            select(column, model.subscribe).where(column.in_(ids))
+        )
+        return dict(rows.all())
+
+
+def _channel(chat_id: int, subscribe: int | None, admin_id: int = 1) -> Channel:
+    return Channel(
+        chat_id=chat_id, title="test", admin_id=admin_id, emoji_id="0", subscribe=subscribe
+    )
+
+
+async def test_partial_miss_extends_found_channels(pg):
+    now = int(time.time())
+    await _add(pg, _channel(-1, now + 10 * DAY), _channel(-2, None), _channel(-3, now - DAY))
+
+    granted = await db.channel.extend_subscriptions([-1, -2, -3, -404], DAY)
+
+    assert sorted(granted) == [-3, -2, -1]
+    subscriptions = await _subscriptions(pg, Channel.chat_id, [-1, -2, -3])
+    # Активная подписка продлевается от даты окончания, истекшая — от текущего времени
+    assert subscriptions[-1] == now + 11 * DAY
+    assert now + DAY <= subscriptions[-2] <= now + DAY + 60
+    assert now + DAY <= subscriptions[-3] <= now + DAY + 60
+
+
+async def test_grant_subscription_reports_missing_bots(pg):
+    now = int(time.time())
+    await _add(
+        pg,
+        UserBot(
+            id=11, admin_id=1, schema="bot", token="11:x", username="a", title="a", emoji_id="0"
+        ),
+    )
+
+    missing = await grant_subscription(1, ["11", 404], 7, "subscribe", "bots")
+
+    assert missing == [404]
+    subscriptions = await _subscriptions(pg, UserBot.id, [11])
+    assert now + 7 * DAY <= subscriptions[11] <= now + 7 * DAY + 60
+
+
+async def test_concurrent_grants_to_same_channel_add_up(pg):
+    now = int(time.time())
+    # Один канал у двух админов: строки с одинаковым chat_id продлеваются вместе
+    await _add(pg, _channel(-1, now + DAY, admin_id=1), _channel(-1, now + DAY, admin_id=2))
+
+    await asyncio.gather(*(db.channel.extend_subscriptions([-1], DAY) for _ in range(20)))
+
+    async with AsyncSession(pg) as session:
+        values = (
+            await session.execute(select(Channel.subscribe).where(Channel.chat_id == -1))
+        ).scalars().all()
+    assert values == [now + 21 * DAY, now + 21 * DAY]
+
+
+async def test_empty_id_list_skips_query(pg):
+    assert await db.channel.extend_subscriptions([], DAY) == []
+    assert await db.user_bot.extend_subscriptions([], DAY) == []
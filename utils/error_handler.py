@@ -2,14 +2,161 @@
 Модуль обработки ошибок (декораторы).
 """
 
+import asyncio
 import logging
 import html
+import time
 from functools import wraps
 from typing import Any, Callable
 
 # Настройка логгера
 logger = logging.getLogger(__name__)
 
+# Параметры очереди алертов
+ALERT_QUEUE_MAXSIZE = 1000  # При переполнении новые алерты отбрасываются
+ALERT_DEDUP_WINDOW = 300  # Повторы (этап + тип ошибки) в этом окне сводятся в один
+ALERT_FLUSH_INTERVAL = 5  # Как часто воркер проверяет накопленные алерты
+ALERT_MIN_SEND_INTERVAL = 3  # Минимальная пауза между сообщениями в поддержку
+ALERT_MAX_LINES = 20  # Максимум строк в сводном сообщении
+
+_alert_queue: asyncio.Queue | None = None
+_alert_worker: asyncio.Task | None = None
+
+# Накопленные алерты: {(stage, error_type): {"count": int, "message": str}}
+_pending_alerts: dict[tuple[str, str], dict] = {}
+# Время последней отправки по ключу: {(stage, error_type): monotonic}
+_last_sent: dict[tuple[str, str], float] = {}
+
+
+def _enqueue_alert(stage_info: str, error: Exception) -> None:
+    """
+    Ставит алерт в очередь без ожидания.
+
+    Отправкой занимается фоновый воркер, поэтому путь ошибки
+    не ждет ответа Telegram API.
+    """
+    global _alert_queue, _alert_worker
+
+    if (
+        _alert_worker is None
+        or _alert_worker.done()
+        or _alert_worker.get_loop() is not asyncio.get_running_loop()
+    ):
+        _alert_queue = asyncio.Queue(maxsize=ALERT_QUEUE_MAXSIZE)
+        _alert_worker = asyncio.create_task(
+            _alert_worker_loop(), name="support_alerts"
+        )
+
+    try:
+        _alert_queue.put_nowait((stage_info, type(error).__name__, str(error)))
+    except asyncio.QueueFull:
+        logger.warning(f"Очередь алертов переполнена, алерт отброшен: {stage_info}")
+
+
+def _register_alert(item: tuple[str, str, str]) -> None:
+    """Добавляет алерт в накопитель, объединяя повторы по ключу."""
+    stage_info, error_type, message = item
+    pending = _pending_alerts.setdefault(
+        (stage_info, error_type), {"count": 0, "message": message}
+    )
+    pending["count"] += 1
+    pending["message"] = message
+
+
+def _format_alert(key: tuple[str, str], pending: dict) -> str:
+    """Форматирует одиночный алерт."""
+    stage_info, error_type = key
+    repeats = (
+        f"<b>🔁 Повторов:</b> {pending['count']} за {ALERT_DEDUP_WINDOW // 60} мин.\n"
+        if pending["count"] > 1
+        else ""
+    )
+    return (
+        f"🚨 <b>Ошибка в NOVA</b>\n\n"
+        f"<b>📍 Этап:</b> {html.escape(stage_info)}\n"
+        f"<b>⚠️ Тип:</b> {error_type}\n"
+        f"{repeats}"
+        f"<b>💬 Сообщение:</b> <code>{html.escape(pending['message'][:500])}</code>\n\n"
+        f"<i>Проверьте логи сервера для деталей.</i>"
+    )
+
+
+def _format_summary(due: list[tuple[tuple[str, str], dict]]) -> str:
+    """Форматирует сводку из нескольких разных алертов."""
+    lines = [
+        f"• {html.escape(stage_info)} — <b>{error_type}</b> ×{pending['count']}"
+        for (stage_info, error_type), pending in due[:ALERT_MAX_LINES]
+    ]
+    if len(due) > ALERT_MAX_LINES:
+        lines.append(f"… и ещё {len(due) - ALERT_MAX_LINES}")
+    return (
+        f"🚨 <b>Ошибки в NOVA ({len(due)})</b>\n\n"
+        + "\n".join(lines)
+        + "\n\n<i>Проверьте логи сервера для деталей.</i>"
+    )
+
+
+async def _flush_due_alerts() -> None:
+    """Отправляет алерты, для которых истекло окно дедупликации."""
+    from config import Config
+    from instance_bot import bot
+
+    now = time.monotonic()
+    due = [
+        (key, pending)
+        for key, pending in _pending_alerts.items()
+        # monotonic() отсчитывается от произвольной точки (на Linux — от загрузки),
+        # поэтому отсутствие ключа проверяется явно, а не через значение 0
+        if key not in _last_sent or now - _last_sent[key] >= ALERT_DEDUP_WINDOW
+    ]
+    if not due:
+        return
+
+    for key, _ in due:
+        del _pending_alerts[key]
+        _last_sent[key] = now
+
+    if not Config.ADMIN_SUPPORT:
+        return
+
+    alert_text = _format_alert(*due[0]) if len(due) == 1 else _format_summary(due)
+    try:
+        await bot.send_message(
+            chat_id=Config.ADMIN_SUPPORT,
+            text=alert_text,
+            parse_mode="HTML",
+        )
+    except Exception as alert_err:
+        logger.error(f"Не удалось отправить алерт в поддержку: {alert_err}")
+
+
+async def _alert_worker_loop() -> None:
+    """
+    Фоновый воркер очереди алертов.
+
+    Собирает алерты, сводит повторы одного этапа и типа ошибки в окне
+    ALERT_DEDUP_WINDOW в одно сообщение и отправляет не чаще,
+    чем раз в ALERT_MIN_SEND_INTERVAL секунд.
+    """
+    while True:
+        try:
+            item = await asyncio.wait_for(
+                _alert_queue.get(), timeout=ALERT_FLUSH_INTERVAL
+            )
+            _register_alert(item)
+            while not _alert_queue.empty():
+                _register_alert(_alert_queue.get_nowait())
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            await _flush_due_alerts()
+        except Exception as e:
+            logger.error(f"Ошибка воркера алертов: {e}", exc_info=True)
+
+        # Ограничение частоты: между отправками не меньше паузы
+        await asyncio.sleep(ALERT_MIN_SEND_INTERVAL)
+
 
 def safe_handler(stage_info: str, log_start: bool = False) -> Callable:
     """
@@ -28,9 +175,6 @@ def safe_handler(stage_info: str, log_start: bool = False) -> Callable:
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            from config import Config
-            from instance_bot import bot
-
             # Логируем начало выполнения этапа, если включено
             if log_start:
                 logger.info(f"Старт этапа: {stage_info}")
@@ -40,24 +184,11 @@ def safe_handler(stage_info: str, log_start: bool = False) -> Callable:
                 # Логируем ошибку с трейсбэком
                 logger.error(f"Ошибка в {stage_info}: {e}", exc_info=True)
 
-                # Отправка алерта в канал поддержки
+                # Алерт в канал поддержки отправляется фоновым воркером
                 try:
-                    if Config.ADMIN_SUPPORT:
-                        error_type = type(e).__name__
-                        alert_text = (
-                            f"🚨 <b>Ошибка в NOVA</b>\n\n"
-                            f"<b>📍 Этап:</b> {stage_info}\n"
-                            f"<b>⚠️ Тип:</b> {error_type}\n"
-                            f"<b>💬 Сообщение:</b> <code>{html.escape(str(e))}</code>\n\n"
-                            f"<i>Проверьте логи сервера для деталей.</i>"
-                        )
-                        await bot.send_message(
-                            chat_id=Config.ADMIN_SUPPORT,
-                            text=alert_text,
-                            parse_mode="HTML",
-                        )
+                    _enqueue_alert(stage_info, e)
                 except Exception as alert_err:
-                    logger.error(f"Не удалось отправить алерт в поддержку: {alert_err}")
+                    logger.error(f"Не удалось поставить алерт в очередь: {alert_err}")
 
                 # Исключение подавляется, чтобы не поломать внешний поток
                 return None